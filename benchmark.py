@@ -0,0 +1,578 @@
+"""Benchmark suite for the Student Management System
+
+Runs headless against generated databases of several sizes (see
+generate_data.py) and times every public Database method, the exam
+results PDF export, thumbnail creation and preview decoding of large
+scans. Results are written as JSON with p50/p95/p99 per case and can be
+compared against a stored baseline.
+
+Command line usage:
+    python benchmark.py --output bench.json
+    python benchmark.py --sizes 1000,50000 --save-baseline bench_baseline.json
+    python benchmark.py --sizes 1000,50000 --baseline bench_baseline.json --tolerance 0.25
+
+Generated databases are kept in --workdir and reused by later runs. The
+exit status is 1 when any case is slower than the baseline p50 by more
+than the tolerance.
+"""
+import argparse
+import inspect
+import json
+import os
+import platform
+import random
+import sqlite3
+import statistics
+import sys
+import tempfile
+import time
+from datetime import datetime
+from database import Database
+from generate_data import DataGenerator, _drop_derived_structures, _make_templates, PHOTO_SIZE, CERTIFICATE_SIZE
+from validators import EXAM_NAMES
+
+
+DEFAULT_SIZES = "1000,50000,500000"
+DEFAULT_REPEAT = 20
+DEFAULT_TOLERANCE = 0.25
+DEFAULT_SEED = 1
+MIN_REGRESSION_MS = 1.0   # Ignore slowdowns smaller than this (timer noise)
+MAX_CASE_SECONDS = 10.0   # Stop repeating a case once it has run this long
+SCAN_SIZE = (4000, 3000)  # Large certificate scan / phone photo for the preview cases
+PREVIEW_SIZE = (350, 300)
+
+# Public methods that are not benchmarked, and why
+NOT_BENCHMARKED = {
+    "authenticate_user": "single indexed lookup on a one-row table",
+    "close": "connection shutdown",
+    "connect": "connection accessor",
+    "dump_query_stats": "instrumentation",
+    "exam_result_page_key": "pure function",
+    "get_active_settings": "PRAGMA reads",
+    "get_cache_stats": "instrumentation",
+    "get_query_stats": "instrumentation",
+    "has_search_index": "schema check",
+    "hash_password": "pure function",
+    "initialize_database": "one-off setup",
+    "run_migrations": "one-off setup (index build times are printed by the generator)",
+    "student_page_key": "pure function",
+    "build_match_query": "pure function",
+}
+
+
+def _percentile(sorted_values, fraction):
+    """Nearest-rank percentile of an already sorted list"""
+    index = min(len(sorted_values) - 1, max(0, round(fraction * len(sorted_values)) - 1))
+    return sorted_values[index]
+
+
+def summarise(durations_ms):
+    """Summary statistics of a list of durations in milliseconds"""
+    ordered = sorted(durations_ms)
+    return {
+        "runs": len(ordered),
+        "min_ms": round(ordered[0], 3),
+        "mean_ms": round(statistics.fmean(ordered), 3),
+        "p50_ms": round(_percentile(ordered, 0.50), 3),
+        "p95_ms": round(_percentile(ordered, 0.95), 3),
+        "p99_ms": round(_percentile(ordered, 0.99), 3),
+        "max_ms": round(ordered[-1], 3),
+    }
+
+
+def prepare_database(workdir, size, seed):
+    """
+    Get a generated database with `size` students, creating it if needed
+    
+    Returns:
+        Path to the database file
+    """
+    db_path = os.path.join(workdir, f"bench_{size}_seed{seed}.db")
+    if os.path.exists(db_path):
+        return db_path
+    
+    print(f"Generating {size} students into {db_path}...", file=sys.stderr)
+    db = Database(db_path)
+    db.initialize_database()
+    _drop_derived_structures(db)
+    try:
+        DataGenerator(db, seed=seed, images=False).generate(size)
+        db.run_migrations()
+        # A few certificate rows so the certificate queries have work to do
+        with db.manager.transaction() as cursor:
+            cursor.execute(
+                """INSERT INTO certificates (student_id, certificate_image_path, note)
+                   SELECT id, 'missing.png', 'Benchmark' FROM students WHERE id % 3 = 0"""
+            )
+    finally:
+        db.close()
+    return db_path
+
+
+class BenchmarkContext:
+    """Deterministic inputs for the benchmark cases"""
+    
+    def __init__(self, db, seed):
+        self.db = db
+        self.rng = random.Random(seed)
+        with db.manager.cursor() as cursor:
+            cursor.execute("SELECT id, student_name FROM students ORDER BY id")
+            self.students = cursor.fetchall()
+            cursor.execute("SELECT DISTINCT exam_year FROM exam_results ORDER BY exam_year DESC")
+            self.years = [row[0] for row in cursor.fetchall()]
+        if not self.students:
+            raise RuntimeError("Benchmark database has no students")
+    
+    def student_id(self):
+        return self.rng.choice(self.students)[0]
+    
+    def student_name(self):
+        return self.rng.choice(self.students)[1]
+    
+    def name_fragment(self):
+        """First three letters of a random first name"""
+        return self.student_name()[:3]
+    
+    def last_name(self):
+        return self.student_name().split()[-1]
+    
+    def year(self):
+        return str(self.rng.choice(self.years)) if self.years else "2025"
+    
+    def new_student(self):
+        return (
+            "Bench Student", "2012-05-05", "Male", "1 Bench Road, Colombo", "Bench Guardian",
+            "198512345678", "0771234567", None, "2024-01-10", "Grade 6"
+        )
+
+
+def _exam_filter_combinations(ctx):
+    """Every combination of the three exam result filters"""
+    combos = []
+    for use_name in (False, True):
+        for use_exam in (False, True):
+            for use_year in (False, True):
+                label = "+".join(
+                    part for part, used in (("name", use_name), ("exam", use_exam), ("year", use_year)) if used
+                ) or "none"
+                combos.append((label, use_name, use_exam, use_year))
+    return combos
+
+
+def build_cases(ctx):
+    """
+    Build the benchmark cases
+    
+    Each case is (name, method_name, setup, run). setup() runs untimed
+    before each run and returns the arguments passed to run(*args).
+    """
+    db = ctx.db
+    cases = []
+    
+    def case(name, method_name, run, setup=None):
+        cases.append((name, method_name, setup or (lambda: ()), run))
+    
+    # Students
+    case("get_all_students", "get_all_students", db.get_all_students)
+    case("get_student_by_id", "get_student_by_id", lambda: db.get_student_by_id(ctx.student_id()))
+    case("search_students", "search_students", lambda: db.search_students(ctx.name_fragment()))
+    case("search", "search", lambda: db.search(ctx.last_name()))
+    case("get_students_page:first", "get_students_page", lambda: db.get_students_page(limit=20, offset=0))
+    case("get_students_page:deep_offset", "get_students_page",
+         lambda: db.get_students_page(limit=20, offset=max(0, len(ctx.students) - 40)))
+    case("get_students_page:keyset", "get_students_page",
+         lambda: db.get_students_page(limit=20, after_key=(ctx.student_id(),)))
+    case("get_students_page:search", "get_students_page",
+         lambda: db.get_students_page(search=ctx.last_name(), sort="name", limit=20, offset=0))
+    case("count_students", "count_students", db.count_students)
+    case("count_students:search", "count_students", lambda: db.count_students(ctx.last_name()))
+    case("get_student_counts_by_grade", "get_student_counts_by_grade", db.get_student_counts_by_grade)
+    case("get_student_counts_by_gender", "get_student_counts_by_gender", db.get_student_counts_by_gender)
+    case("get_latest_registrations", "get_latest_registrations", db.get_latest_registrations)
+    case("get_dashboard_stats", "get_dashboard_stats", db.get_dashboard_stats)
+    case("get_student_names", "get_student_names", lambda: sum(1 for _ in db.get_student_names()))
+    case("iter_students", "iter_students", lambda: sum(1 for _ in db.iter_students()))
+    
+    # Student writes (each run adds and removes its own rows)
+    def add_then_cleanup():
+        success, student_id = db.add_student(ctx.new_student())
+        db.delete_student(student_id)
+    case("add_student", "add_student", add_then_cleanup)
+    
+    case("add_students_bulk:100", "add_students_bulk",
+         lambda: [db.delete_student(student_id) for student_id in db.add_students_bulk([ctx.new_student()] * 100)[1]])
+    
+    def fresh_student():
+        return (db.add_student(ctx.new_student())[1],)
+    case("update_student", "update_student",
+         lambda student_id: (db.update_student(student_id, ctx.new_student()), db.delete_student(student_id)),
+         fresh_student)
+    case("set_student_image_paths", "set_student_image_paths",
+         lambda student_id: (db.set_student_image_paths([(student_id, "x.png")]), db.delete_student(student_id)),
+         fresh_student)
+    case("delete_student", "delete_student", db.delete_student, fresh_student)
+    
+    # Exam results
+    for label, use_name, use_exam, use_year in _exam_filter_combinations(ctx):
+        def run(use_name=use_name, use_exam=use_exam, use_year=use_year):
+            return db.get_all_exam_results(
+                student_name=ctx.name_fragment() if use_name else None,
+                exam_name=ctx.rng.choice(EXAM_NAMES) if use_exam else None,
+                exam_year=ctx.year() if use_year else None
+            )
+        case(f"get_all_exam_results:{label}", "get_all_exam_results", run)
+        
+        def run_page(use_name=use_name, use_exam=use_exam, use_year=use_year):
+            filters = {
+                "student_name": ctx.name_fragment() if use_name else None,
+                "exam_name": ctx.rng.choice(EXAM_NAMES) if use_exam else None,
+                "exam_year": ctx.year() if use_year else None,
+            }
+            db.count_exam_results(filters)
+            return db.get_exam_results_page(filters, 20, offset=0)
+        case(f"get_exam_results_page:{label}", "get_exam_results_page", run_page)
+    
+    case("count_exam_results", "count_exam_results", db.count_exam_results)
+    case("get_exam_years", "get_exam_years", db.get_exam_years)
+    case("get_student_results", "get_student_results", lambda: db.get_student_results(ctx.student_id()))
+    case("iter_exam_results", "iter_exam_results", lambda: sum(1 for _ in db.iter_exam_results()))
+    
+    def exam_result():
+        return (ctx.student_id(), "First Term", 2025, 70.0, "B")
+    
+    def add_result_then_cleanup():
+        db.add_exam_result(exam_result())
+        with db.manager.transaction() as cursor:
+            cursor.execute("DELETE FROM exam_results WHERE id = (SELECT MAX(id) FROM exam_results)")
+    case("add_exam_result", "add_exam_result", add_result_then_cleanup)
+    
+    def add_bulk_then_cleanup():
+        db.add_exam_results_bulk([exam_result() for _ in range(1000)])
+        with db.manager.transaction() as cursor:
+            cursor.execute(
+                "DELETE FROM exam_results WHERE id > (SELECT MAX(id) FROM exam_results) - 1000"
+            )
+    case("add_exam_results_bulk:1000", "add_exam_results_bulk", add_bulk_then_cleanup)
+    
+    def fresh_result():
+        db.add_exam_result(exam_result())
+        with db.manager.cursor() as cursor:
+            cursor.execute("SELECT MAX(id) FROM exam_results")
+            return (cursor.fetchone()[0],)
+    case("get_exam_result_by_id", "get_exam_result_by_id",
+         lambda result_id: (db.get_exam_result_by_id(result_id), db.delete_exam_result(result_id)),
+         fresh_result)
+    case("update_exam_result", "update_exam_result",
+         lambda result_id: (db.update_exam_result(result_id, exam_result()), db.delete_exam_result(result_id)),
+         fresh_result)
+    case("delete_exam_result", "delete_exam_result", db.delete_exam_result, fresh_result)
+    
+    # Notes
+    case("get_student_notes", "get_student_notes", lambda: db.get_student_notes(ctx.student_id()))
+    case("save_student_notes", "save_student_notes",
+         lambda: db.save_student_notes(ctx.student_id(), "Benchmark note about mathematics."))
+    
+    # Certificates
+    case("get_all_certificates", "get_all_certificates", db.get_all_certificates)
+    case("get_all_certificates:filter", "get_all_certificates",
+         lambda: db.get_all_certificates(ctx.name_fragment()))
+    case("get_certificates_by_student", "get_certificates_by_student",
+         lambda: db.get_certificates_by_student(ctx.student_id()))
+    case("count_certificates", "count_certificates", db.count_certificates)
+    case("iter_certificates", "iter_certificates", lambda: sum(1 for _ in db.iter_certificates()))
+    
+    def add_certificate_then_cleanup():
+        db.add_certificate(ctx.student_id(), "bench.png", "Benchmark")
+        with db.manager.cursor() as cursor:
+            cursor.execute("SELECT MAX(id) FROM certificates")
+            certificate_id = cursor.fetchone()[0]
+        db.delete_certificate(certificate_id)
+    case("add_certificate", "add_certificate", add_certificate_then_cleanup)
+    
+    def fresh_certificate():
+        db.add_certificate(ctx.student_id(), "bench.png", "Benchmark")
+        with db.manager.cursor() as cursor:
+            cursor.execute("SELECT MAX(id) FROM certificates")
+            return (cursor.fetchone()[0],)
+    case("delete_certificate", "delete_certificate", db.delete_certificate, fresh_certificate)
+    
+    return cases
+
+
+def build_file_cases(ctx, workdir):
+    """
+    Cases that need the optional GUI/PDF/image libraries
+    
+    Returns:
+        (cases, skipped) where skipped maps case name -> reason
+    """
+    cases = []
+    skipped = {}
+    
+    # PDF export, through the view's own _generate_pdf
+    try:
+        from views.student_exam_results_view import StudentExamResultsView
+    except ImportError as e:
+        skipped["generate_pdf"] = f"view not importable: {e}"
+    else:
+        pdf_dir = tempfile.mkdtemp(prefix="bench_pdf_", dir=workdir)
+        
+        def setup_pdf():
+            student = ctx.db.get_student_by_id(ctx.student_id())
+            return student, ctx.db.get_student_results(student[0])
+        
+        def generate_pdf(student, results):
+            # Same shortcut the app uses to call view helpers without a window
+            view = StudentExamResultsView.__new__(StudentExamResultsView)
+            view.student = student
+            view.db = ctx.db
+            view.filters = {}
+            path = os.path.join(pdf_dir, "bench.pdf")
+            view._generate_pdf(path, results)
+        
+        cases.append(("generate_pdf", None, setup_pdf, generate_pdf))
+    
+    # Thumbnails, through the functions the app uses to make and show them
+    try:
+        import thumbnail_store
+        from image_cache import ImageCache
+    except ImportError as e:
+        skipped["thumbnail"] = f"Pillow not available: {e}"
+    else:
+        image_dir = os.path.join(workdir, "bench_images")
+        os.makedirs(image_dir, exist_ok=True)
+        
+        # Stored thumbnails are only used for files in the student folders,
+        # so point the store at a student folder of the benchmark's own
+        thumbnail_store.STUDENTS_ROOT = os.path.join(workdir, "students")
+        student_folder = os.path.join(thumbnail_store.STUDENTS_ROOT, "Bench_Student_1")
+        rng = random.Random(DEFAULT_SEED)
+        paths = []
+        for kind, size in (("photo", PHOTO_SIZE), ("certificate", CERTIFICATE_SIZE)):
+            paths += _make_templates(rng, size, student_folder, kind)
+        
+        def pick_image():
+            return (ctx.rng.choice(paths),)
+        
+        def generate(path):
+            thumbnail_store.generate_thumbnails(path, force=True)
+        
+        def thumbnail(size):
+            def setup():
+                # A new cache every run: the first display of an image
+                return (ImageCache(), ctx.rng.choice(paths))
+            
+            def run(cache, path):
+                cache.get_thumbnail(path, size)
+            return setup, run
+        
+        cases.append(("generate_thumbnails", None, pick_image, generate))
+        cases.append(("thumbnail:60", None, *thumbnail((60, 60))))
+        cases.append(("thumbnail:150", None, *thumbnail((150, 150))))
+        
+        cases += _preview_cases(image_dir)
+    
+    return cases, skipped
+
+
+def _make_scan(path):
+    """Write a large photo-like test image (a sideways phone photo for JPEG)"""
+    from PIL import Image
+    
+    width, height = SCAN_SIZE
+    # Blotchy texture rather than per-pixel noise, which no real scan looks like
+    noise = Image.effect_noise((width // 8, height // 8), 40).resize((width, height), Image.Resampling.BICUBIC)
+    gradient = Image.linear_gradient("L").resize((width, height))
+    img = Image.merge("RGB", (noise, gradient, gradient.transpose(Image.Transpose.FLIP_LEFT_RIGHT)))
+    if path.endswith(".jpg"):
+        exif = Image.Exif()
+        exif[0x0112] = 6  # Rotated 90 degrees clockwise
+        img.save(path, "JPEG", quality=90, exif=exif)
+    else:
+        img.save(path, "PNG")
+
+
+def _preview_cases(image_dir):
+    """
+    Micro-benchmark of preview decoding on large scans
+    
+    Compares a decode at full resolution, Image.open + thumbnail (what the
+    views did before the preview loader) and preview_loader.load_preview.
+    """
+    from PIL import Image
+    from preview_loader import load_preview
+    
+    cases = []
+    for extension in ("jpg", "png"):
+        path = os.path.join(image_dir, f"scan_{SCAN_SIZE[0]}x{SCAN_SIZE[1]}.{extension}")
+        if not os.path.exists(path):
+            _make_scan(path)
+        
+        def full_decode(path=path):
+            with Image.open(path) as img:
+                img.load()
+                img.thumbnail(PREVIEW_SIZE)
+        
+        def open_thumbnail(path=path):
+            with Image.open(path) as img:
+                img.thumbnail(PREVIEW_SIZE)
+        
+        def preview(path=path):
+            load_preview(path, PREVIEW_SIZE)
+        
+        cases.append((f"preview:{extension}:full_decode", None, None, full_decode))
+        cases.append((f"preview:{extension}:open_thumbnail", None, None, open_thumbnail))
+        cases.append((f"preview:{extension}:load_preview", None, None, preview))
+    return cases
+
+
+def run_case(setup, run, repeat):
+    """Time one case: one untimed warm-up, then up to `repeat` timed runs"""
+    setup = setup or (lambda: ())
+    run(*setup())
+    
+    durations = []
+    started = time.perf_counter()
+    for _ in range(repeat):
+        args = setup()
+        start = time.perf_counter()
+        run(*args)
+        durations.append((time.perf_counter() - start) * 1000)
+        if time.perf_counter() - started > MAX_CASE_SECONDS and len(durations) >= 3:
+            break
+    return summarise(durations)
+
+
+def benchmark_size(db_path, workdir, seed, repeat, use_cache, only=None):
+    """
+    Run every case against one database
+    
+    Returns:
+        (results, skipped, not_covered)
+    """
+    db = Database(db_path)
+    if not use_cache:
+        # Measure the queries themselves, not cache hits
+        db.query_cache.max_bytes = 0
+    
+    try:
+        ctx = BenchmarkContext(db, seed)
+        cases = build_cases(ctx)
+        file_cases, skipped = build_file_cases(ctx, workdir)
+        cases += file_cases
+        
+        covered = {method_name for _, method_name, _, _ in cases if method_name}
+        public = {
+            name for name, attr in vars(Database).items()
+            if not name.startswith("_") and (inspect.isfunction(attr) or isinstance(attr, (staticmethod, classmethod)))
+        }
+        not_covered = sorted(public - covered - set(NOT_BENCHMARKED))
+        
+        results = {}
+        for name, _, setup, run in cases:
+            if only and not any(part in name for part in only):
+                continue
+            results[name] = run_case(setup, run, repeat)
+            print(f"  {name:45s} p50 {results[name]['p50_ms']:9.3f} ms  p95 {results[name]['p95_ms']:9.3f} ms",
+                  file=sys.stderr)
+        return results, skipped, not_covered
+    finally:
+        db.close()
+
+
+def compare(current, baseline, tolerance):
+    """
+    Compare results against a baseline
+    
+    A case regresses when its p50 exceeds the baseline p50 by more than
+    the tolerance (a fraction) and by at least MIN_REGRESSION_MS.
+    
+    Returns:
+        List of (size, case, baseline_p50, current_p50) regressions
+    """
+    regressions = []
+    for size, cases in current.get("results", {}).items():
+        base_cases = baseline.get("results", {}).get(size, {})
+        for name, stats in cases.items():
+            base = base_cases.get(name)
+            if not base:
+                continue
+            limit = base["p50_ms"] * (1 + tolerance)
+            if stats["p50_ms"] > limit and stats["p50_ms"] - base["p50_ms"] >= MIN_REGRESSION_MS:
+                regressions.append((size, name, base["p50_ms"], stats["p50_ms"]))
+    return regressions
+
+
+def main(argv=None):
+    """Command line entry point"""
+    parser = argparse.ArgumentParser(description="Benchmark the Student Management System database layer")
+    parser.add_argument("--sizes", default=DEFAULT_SIZES,
+                        help=f"Comma-separated student counts (default: {DEFAULT_SIZES})")
+    parser.add_argument("--workdir", default="bench_data", help="Folder for generated databases")
+    parser.add_argument("--seed", type=int, default=DEFAULT_SEED)
+    parser.add_argument("--repeat", type=int, default=DEFAULT_REPEAT, help="Timed runs per case")
+    parser.add_argument("--only", help="Comma-separated substrings; run only matching cases")
+    parser.add_argument("--with-cache", action="store_true", help="Leave the query cache enabled")
+    parser.add_argument("--output", help="Write results JSON to this file")
+    parser.add_argument("--baseline", help="Compare against this results JSON")
+    parser.add_argument("--save-baseline", help="Write results JSON as a new baseline")
+    parser.add_argument("--tolerance", type=float, default=DEFAULT_TOLERANCE,
+                        help=f"Allowed p50 slowdown as a fraction (default: {DEFAULT_TOLERANCE})")
+    args = parser.parse_args(argv)
+    
+    os.makedirs(args.workdir, exist_ok=True)
+    sizes = [int(size) for size in args.sizes.split(",") if size.strip()]
+    only = [part.strip() for part in args.only.split(",")] if args.only else None
+    
+    report = {
+        "meta": {
+            "created_at": datetime.now().isoformat(timespec="seconds"),
+            "python": platform.python_version(),
+            "sqlite": sqlite3.sqlite_version,
+            "platform": platform.platform(),
+            "seed": args.seed,
+            "repeat": args.repeat,
+            "query_cache": args.with_cache,
+        },
+        "results": {},
+        "skipped": {},
+        "not_covered": [],
+    }
+    
+    for size in sizes:
+        db_path = prepare_database(args.workdir, size, args.seed)
+        print(f"Benchmarking {size} students", file=sys.stderr)
+        results, skipped, not_covered = benchmark_size(
+            db_path, args.workdir, args.seed, args.repeat, args.with_cache, only
+        )
+        report["results"][str(size)] = results
+        report["skipped"].update(skipped)
+        report["not_covered"] = not_covered
+    
+    for name, reason in report["skipped"].items():
+        print(f"Skipped {name}: {reason}", file=sys.stderr)
+    if report["not_covered"]:
+        print(f"Public methods without a benchmark: {', '.join(report['not_covered'])}", file=sys.stderr)
+    
+    for path in (args.output, args.save_baseline):
+        if path:
+            with open(path, "w", encoding="utf-8") as f:
+                json.dump(report, f, indent=2)
+    if not args.output and not args.save_baseline:
+        print(json.dumps(report, indent=2))
+    
+    if args.baseline:
+        with open(args.baseline, "r", encoding="utf-8") as f:
+            baseline = json.load(f)
+        regressions = compare(report, baseline, args.tolerance)
+        for size, name, before, after in regressions:
+            print(f"REGRESSION {size} students {name}: p50 {before:.3f} ms -> {after:.3f} ms")
+        if regressions:
+            return 1
+        print(f"No regressions beyond {args.tolerance:.0%} against {args.baseline}")
+    
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,253 @@
+"""Content-addressed storage for student photos and certificates
+
+The same certificate scan is often uploaded twice, and siblings often
+share a photo. Each distinct file content is therefore stored once, as a
+blob named after its SHA-256:
+
+    students/.blobs/3f/3fa4...e1
+
+and every file in a student folder is a hard link to its blob. The link
+count of a blob tells how many student files still use it: a blob whose
+only remaining link is itself is deleted together with the last file that
+used it.
+
+Because linked files share their content, files in the student folders
+must be replaced (a new file saved), never modified in place. On file
+systems without hard links, files are copied instead and not deduplicated.
+
+Existing student folders are deduplicated with a one-off migration:
+
+    python blob_store.py [--root students] [--dry-run]
+"""
+import argparse
+import hashlib
+import os
+import shutil
+import sys
+import threading
+
+
+STUDENTS_ROOT = "students"
+BLOBS_DIR = ".blobs"
+HASH_CHUNK_SIZE = 1024 * 1024
+
+_blob_lock = threading.Lock()
+
+
+def file_sha256(path):
+    """
+    Hash a file's content without reading it into memory at once
+    
+    Args:
+        path: File path
+    
+    Returns:
+        Hex SHA-256 digest
+    """
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(HASH_CHUNK_SIZE), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def get_blob_path(digest, root=STUDENTS_ROOT):
+    """
+    Get the path of the blob holding some content
+    
+    Args:
+        digest: Hex SHA-256 of the content
+        root: Student folders root
+    
+    Returns:
+        Path under <root>/.blobs/
+    """
+    return os.path.join(root, BLOBS_DIR, digest[:2], digest)
+
+
+def _link(blob_path, dest_path):
+    """
+    Make dest_path a hard link to a blob, replacing any file already there
+    
+    Returns:
+        True if linked, False if the content had to be copied instead
+    """
+    temp_path = f"{dest_path}.{threading.get_ident()}.tmp"
+    try:
+        os.link(blob_path, temp_path)
+        linked = True
+    except OSError:
+        # No hard links on this file system (or across devices)
+        shutil.copy2(blob_path, temp_path)
+        linked = False
+    os.replace(temp_path, dest_path)
+    return linked
+
+
+def store_file(source_path, dest_path, root=STUDENTS_ROOT):
+    """
+    Save a copy of a file into a student folder
+    
+    If a blob with the same content exists the new file is linked to it,
+    otherwise the content becomes a new blob.
+    
+    Args:
+        source_path: File to copy
+        dest_path: Path of the new file in a student folder
+        root: Student folders root
+    
+    Returns:
+        Hex SHA-256 of the content
+    """
+    digest = file_sha256(source_path)
+    blob_path = get_blob_path(digest, root)
+    
+    with _blob_lock:
+        if not os.path.exists(blob_path):
+            os.makedirs(os.path.dirname(blob_path), exist_ok=True)
+            temp_path = f"{blob_path}.{threading.get_ident()}.tmp"
+            shutil.copy2(source_path, temp_path)
+            os.replace(temp_path, blob_path)
+        _link(blob_path, dest_path)
+    return digest
+
+
+def adopt_file(path, root=STUDENTS_ROOT):
+    """
+    Move a file that was written into a student folder into the store
+    
+    The file is replaced by a link to an existing blob with the same
+    content, or becomes the blob itself.
+    
+    Args:
+        path: File in a student folder
+        root: Student folders root
+    
+    Returns:
+        (hex SHA-256, bytes freed because the content was already stored)
+    """
+    digest = file_sha256(path)
+    blob_path = get_blob_path(digest, root)
+    
+    with _blob_lock:
+        if not os.path.exists(blob_path):
+            os.makedirs(os.path.dirname(blob_path), exist_ok=True)
+            try:
+                os.link(path, blob_path)
+            except OSError:
+                shutil.copy2(path, blob_path)
+            return digest, 0
+        
+        if os.path.samefile(path, blob_path):
+            return digest, 0
+        stat = os.stat(path)
+        linked = _link(blob_path, path)
+        # The old copy is gone unless something else still links to it
+        return digest, stat.st_size if linked and stat.st_nlink == 1 else 0
+
+
+def remove_file(path, root=STUDENTS_ROOT):
+    """
+    Delete a file from a student folder
+    
+    Its blob is deleted too once no other student file links to it.
+    
+    Args:
+        path: File in a student folder
+        root: Student folders root
+    """
+    stat = os.stat(path)
+    # A file with a single link is not in the store; no need to hash it
+    blob_path = get_blob_path(file_sha256(path), root) if stat.st_nlink > 1 else None
+    
+    with _blob_lock:
+        os.remove(path)
+        if blob_path is None or not os.path.exists(blob_path):
+            return
+        blob_stat = os.stat(blob_path)
+        if blob_stat.st_ino == stat.st_ino and blob_stat.st_nlink == 1:
+            os.remove(blob_path)
+
+
+def _student_files(root):
+    """Yield every file in the student folders (not blobs or thumbnails)"""
+    if not os.path.isdir(root):
+        return
+    for folder_name in sorted(os.listdir(root)):
+        folder = os.path.join(root, folder_name)
+        if folder_name.startswith(".") or not os.path.isdir(folder):
+            continue
+        for name in sorted(os.listdir(folder)):
+            path = os.path.join(folder, name)
+            if os.path.isfile(path) and not name.endswith(".tmp"):
+                yield path
+
+
+def deduplicate(root=STUDENTS_ROOT, dry_run=False, progress_callback=None):
+    """
+    Move every existing student file into the store
+    
+    Files with identical content end up as links to a single blob.
+    
+    Args:
+        root: Student folders root
+        dry_run: Only report what would be reclaimed
+        progress_callback: Optional callable(files_done)
+    
+    Returns:
+        Dict with files, blobs, duplicates, bytes_reclaimed and failed
+    """
+    report = {"files": 0, "blobs": 0, "duplicates": 0, "bytes_reclaimed": 0, "failed": []}
+    seen = {}  # digest -> inode of the first file found with that content
+    
+    for path in _student_files(root):
+        report["files"] += 1
+        try:
+            if dry_run:
+                stat = os.stat(path)
+                digest = file_sha256(path)
+                blob_path = get_blob_path(digest, root)
+                stored = os.path.exists(blob_path)
+                inode = os.stat(blob_path).st_ino if stored else seen.setdefault(digest, stat.st_ino)
+                freed = stat.st_size if inode != stat.st_ino and stat.st_nlink == 1 else 0
+            else:
+                digest, freed = adopt_file(path, root)
+        except OSError as e:
+            report["failed"].append(f"{path}: {e}")
+            continue
+        
+        seen.setdefault(digest, None)
+        if freed:
+            report["duplicates"] += 1
+            report["bytes_reclaimed"] += freed
+        if progress_callback and report["files"] % 100 == 0:
+            progress_callback(report["files"])
+    
+    report["blobs"] = len(seen)
+    return report
+
+
+def main(argv=None):
+    """Command line entry point"""
+    parser = argparse.ArgumentParser(description="Deduplicate the files in the student folders")
+    parser.add_argument("--root", default=STUDENTS_ROOT, help=f"Student folders root (default: {STUDENTS_ROOT})")
+    parser.add_argument("--dry-run", action="store_true", help="Only report what would be reclaimed")
+    args = parser.parse_args(argv)
+    
+    def show_progress(files_done):
+        """Report progress on stderr so stdout only carries the summary"""
+        print(f"  {files_done} file(s) processed", file=sys.stderr)
+    
+    report = deduplicate(args.root, args.dry_run, show_progress)
+    
+    action = "would be reclaimed" if args.dry_run else "reclaimed"
+    print(f"{report['files']} file(s), {report['blobs']} distinct: {report['duplicates']} duplicate(s), "
+          f"{report['bytes_reclaimed'] / (1024 * 1024):.1f} MB {action}, {len(report['failed'])} failed")
+    for message in report["failed"][:20]:
+        print(f"  {message}")
+    
+    return 0 if not report["failed"] else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
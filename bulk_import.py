@@ -0,0 +1,470 @@
+"""Bulk CSV import for the Student Management System
+
+Students and exam results can be imported from a CSV file instead of being
+entered one at a time. Rows are validated with the same Validators used by
+the forms and inserted in chunked transactions.
+
+Command line usage:
+    python bulk_import.py students students.csv [--photos DIR] [--dry-run] [--errors errors.csv]
+    python bulk_import.py exam-results marks.csv [--dry-run] [--errors errors.csv]
+"""
+import argparse
+import csv
+import os
+import sys
+from datetime import datetime
+from concurrent.futures import ThreadPoolExecutor
+from validators import Validators
+from student_folder_utils import save_student_profile_image
+
+
+# Accepted header names for each exam result column (after normalising to
+# lower case with underscores)
+EXAM_RESULT_COLUMNS = {
+    "student_id": ["student_id", "id"],
+    "student_name": ["student_name", "student", "name"],
+    "exam_name": ["exam_name", "exam", "term"],
+    "exam_year": ["exam_year", "year"],
+    "marks": ["marks", "marks_obtained", "mark"],
+}
+
+# Accepted header names for each student column
+STUDENT_COLUMNS = {
+    "student_name": ["student_name", "name", "student"],
+    "date_of_birth": ["date_of_birth", "dob", "birth_date"],
+    "gender": ["gender", "sex"],
+    "address": ["address"],
+    "guardian_name": ["guardian_name", "guardian"],
+    "guardian_nic": ["guardian_nic", "nic"],
+    "guardian_contact": ["guardian_contact", "contact", "phone"],
+    "registration_date": ["registration_date", "reg_date", "registered"],
+    "grade": ["grade", "grade_level", "class"],
+}
+
+DEFAULT_CHUNK_SIZE = 500
+DEFAULT_PHOTO_KEY = "photo"
+DEFAULT_PHOTO_MAX_SIZE = 600  # Longest side of stored profile photos, in pixels
+DEFAULT_PHOTO_WORKERS = 4
+
+PHOTO_EXTENSIONS = (".jpg", ".jpeg", ".png", ".gif", ".bmp")
+
+
+class ImportReport:
+    """Outcome of a bulk import: counts plus a per-row error list"""
+    
+    def __init__(self, dry_run=False):
+        self.dry_run = dry_run
+        self.total_rows = 0
+        self.imported = 0
+        self.errors = []  # List of (line_number, message)
+    
+    @property
+    def rejected(self):
+        """Number of rows that were rejected"""
+        return len(self.errors)
+    
+    def add_error(self, line_number, message):
+        """Record a rejected row"""
+        self.errors.append((line_number, message))
+    
+    def summary(self):
+        """Get a one-line summary of the import"""
+        action = "would be imported" if self.dry_run else "imported"
+        return f"{self.imported} of {self.total_rows} row(s) {action}, {self.rejected} rejected"
+    
+    def write_errors_csv(self, path):
+        """
+        Write the per-row error report to a CSV file
+        
+        Args:
+            path: Destination file path
+        """
+        with open(path, "w", newline="", encoding="utf-8") as f:
+            writer = csv.writer(f)
+            writer.writerow(["line", "error"])
+            writer.writerows(self.errors)
+
+
+def _normalise_header(name):
+    """Normalise a CSV header: 'Exam Year ' -> 'exam_year'"""
+    return "_".join((name or "").strip().lower().split())
+
+
+def _map_columns(fieldnames, aliases):
+    """Map canonical column names to the actual CSV headers"""
+    normalised = {_normalise_header(name): name for name in fieldnames or []}
+    mapping = {}
+    for column, names in aliases.items():
+        for alias in names:
+            if alias in normalised:
+                mapping[column] = normalised[alias]
+                break
+    return mapping
+
+
+def _name_key(name):
+    """Case and whitespace insensitive key for matching student names"""
+    return " ".join((name or "").lower().split())
+
+
+class _StudentResolver:
+    """Resolves the student column of an import row to a student ID"""
+    
+    def __init__(self, db):
+        self.ids = set()
+        self.by_name = {}
+        for student_id, student_name in db.get_student_names():
+            self.ids.add(student_id)
+            self.by_name.setdefault(_name_key(student_name), []).append(student_id)
+    
+    def resolve(self, student_id, student_name):
+        """
+        Find the student for a row
+        
+        Returns:
+            (student_id, None) on success or (None, error message)
+        """
+        student_id = (student_id or "").strip()
+        student_name = (student_name or "").strip()
+        
+        # A purely numeric value in the name column is treated as an ID
+        if not student_id and student_name.isdigit():
+            student_id = student_name
+        
+        if student_id:
+            if not student_id.isdigit() or int(student_id) not in self.ids:
+                return None, f"Unknown student ID '{student_id}'"
+            return int(student_id), None
+        
+        if not student_name:
+            return None, "Student ID or name is required"
+        
+        matches = self.by_name.get(_name_key(student_name), [])
+        if not matches:
+            return None, f"No student named '{student_name}'"
+        if len(matches) > 1:
+            return None, f"{len(matches)} students are named '{student_name}' - use the student ID"
+        return matches[0], None
+
+
+def import_exam_results_csv(db, csv_path, dry_run=False, chunk_size=DEFAULT_CHUNK_SIZE,
+                            progress_callback=None):
+    """
+    Import exam results from a CSV file
+    
+    Expected columns (header names are case-insensitive): student_id or
+    student_name, exam_name, exam_year, marks. The grade is calculated from
+    the marks. The file is streamed, and valid rows are inserted in chunks of
+    chunk_size, each in its own transaction.
+    
+    Args:
+        db: Database instance
+        csv_path: Path to the CSV file
+        dry_run: Validate every row but insert nothing
+        chunk_size: Number of rows per insert transaction
+        progress_callback: Optional callable(rows_processed) called per chunk
+    
+    Returns:
+        ImportReport
+    """
+    report = ImportReport(dry_run)
+    
+    with open(csv_path, newline="", encoding="utf-8-sig") as f:
+        reader = csv.DictReader(f)
+        columns = _map_columns(reader.fieldnames, EXAM_RESULT_COLUMNS)
+        
+        missing = [c for c in ("exam_name", "exam_year", "marks") if c not in columns]
+        if "student_id" not in columns and "student_name" not in columns:
+            missing.insert(0, "student_id or student_name")
+        if missing:
+            report.add_error(1, f"Missing column(s): {', '.join(missing)}")
+            return report
+        
+        resolver = _StudentResolver(db)
+        chunk = []
+        
+        def flush():
+            """Insert the pending chunk"""
+            if chunk and not dry_run:
+                success, result = db.add_exam_results_bulk([row for _, row in chunk], chunk_size)
+                if success:
+                    report.imported += result
+                else:
+                    for line_number, _ in chunk:
+                        report.add_error(line_number, f"Database error: {result}")
+            elif chunk:
+                report.imported += len(chunk)
+            chunk.clear()
+            if progress_callback:
+                progress_callback(report.total_rows)
+        
+        for row in reader:
+            report.total_rows += 1
+            line_number = reader.line_num
+            
+            student_id, error = resolver.resolve(
+                row.get(columns.get("student_id")) if "student_id" in columns else "",
+                row.get(columns.get("student_name")) if "student_name" in columns else ""
+            )
+            if error:
+                report.add_error(line_number, error)
+                continue
+            
+            exam_name = (row.get(columns["exam_name"]) or "").strip()
+            exam_year = (row.get(columns["exam_year"]) or "").strip()
+            marks = (row.get(columns["marks"]) or "").strip()
+            
+            # Validate with the same rules as the Add Exam Results form
+            errors = [
+                result.error_message for result in (
+                    Validators.validate_exam_name(exam_name),
+                    Validators.validate_exam_year(exam_year),
+                    Validators.validate_marks_obtained(marks),
+                ) if not result.is_valid
+            ]
+            if errors:
+                report.add_error(line_number, "; ".join(errors))
+                continue
+            
+            grade = Validators.calculate_grade(marks)
+            chunk.append((line_number, (student_id, exam_name, int(exam_year), float(marks), grade)))
+            
+            if len(chunk) >= chunk_size:
+                flush()
+        
+        flush()
+    
+    return report
+
+
+class _PhotoIndex:
+    """Looks up photos in a folder by file name, with or without extension"""
+    
+    def __init__(self, photo_dir):
+        self.paths = {}
+        if not photo_dir:
+            return
+        for entry in os.scandir(photo_dir):
+            stem, ext = os.path.splitext(entry.name)
+            if entry.is_file() and ext.lower() in PHOTO_EXTENSIONS:
+                self.paths[entry.name.lower()] = entry.path
+                self.paths.setdefault(stem.lower(), entry.path)
+    
+    def find(self, key):
+        """Get the photo path for a key value, or None"""
+        return self.paths.get((key or "").strip().lower())
+
+
+def _normalise_grade(grade):
+    """Accept both '5' and 'Grade 5' and store the form's 'Grade 5' format"""
+    grade = (grade or "").strip()
+    if grade.isdigit():
+        return f"Grade {int(grade)}"
+    return grade
+
+
+def _validate_student(values):
+    """Validate a student row and return the list of error messages"""
+    checks = (
+        Validators.validate_student_name(values["student_name"]),
+        Validators.validate_date_of_birth(values["date_of_birth"]),
+        Validators.validate_gender(values["gender"]),
+        Validators.validate_address(values["address"]),
+        Validators.validate_guardian_name(values["guardian_name"]),
+        Validators.validate_guardian_nic(values["guardian_nic"]),
+        Validators.validate_guardian_contact(values["guardian_contact"]),
+        Validators.validate_registration_date(values["registration_date"]),
+        Validators.validate_grade_level(values["grade"]),
+    )
+    return [result.error_message for result in checks if not result.is_valid]
+
+
+def import_students_csv(db, csv_path, photo_dir=None, photo_key=DEFAULT_PHOTO_KEY, dry_run=False,
+                        chunk_size=DEFAULT_CHUNK_SIZE, photo_max_size=DEFAULT_PHOTO_MAX_SIZE,
+                        photo_workers=DEFAULT_PHOTO_WORKERS, progress_callback=None):
+    """
+    Register students from a CSV file, with photos from a folder
+    
+    Expected columns (header names are case-insensitive): student_name,
+    date_of_birth, gender, address, guardian_name, guardian_nic,
+    guardian_contact, registration_date (defaults to today when blank) and
+    grade ("5" or "Grade 5"). The photo_key column names the student's photo
+    in photo_dir, with or without its extension. Each chunk of students is
+    inserted in one transaction, then its photos are copied and resized in a
+    thread pool and the image paths are saved in one more transaction.
+    
+    Args:
+        db: Database instance
+        csv_path: Path to the CSV file
+        photo_dir: Optional folder containing the photos
+        photo_key: CSV column that holds the photo file name
+        dry_run: Validate every row (and check photos exist) but change nothing
+        chunk_size: Number of students per insert transaction
+        photo_max_size: Longest side of the stored photos in pixels (None to copy as-is)
+        photo_workers: Number of threads copying photos
+        progress_callback: Optional callable(rows_processed) called per chunk
+    
+    Returns:
+        ImportReport
+    """
+    report = ImportReport(dry_run)
+    
+    with open(csv_path, newline="", encoding="utf-8-sig") as f:
+        reader = csv.DictReader(f)
+        columns = _map_columns(reader.fieldnames, STUDENT_COLUMNS)
+        photo_column = _map_columns(reader.fieldnames, {"photo": [_normalise_header(photo_key)]}).get("photo")
+        
+        missing = [c for c in STUDENT_COLUMNS if c not in columns and c != "registration_date"]
+        if missing:
+            report.add_error(1, f"Missing column(s): {', '.join(missing)}")
+            return report
+        
+        photos = _PhotoIndex(photo_dir)
+        today = datetime.now().strftime("%Y-%m-%d")
+        chunk = []  # (line_number, student_data, photo_path)
+        
+        with ThreadPoolExecutor(max_workers=photo_workers) as executor:
+            
+            def flush():
+                """Insert the pending chunk and ingest its photos"""
+                if chunk and not dry_run:
+                    success, result = db.add_students_bulk([data for _, data, _ in chunk])
+                    if success:
+                        report.imported += len(result)
+                        _save_photos(db, executor, chunk, result, photo_max_size, report)
+                    else:
+                        for line_number, _, _ in chunk:
+                            report.add_error(line_number, f"Database error: {result}")
+                elif chunk:
+                    report.imported += len(chunk)
+                chunk.clear()
+                if progress_callback:
+                    progress_callback(report.total_rows)
+            
+            for row in reader:
+                report.total_rows += 1
+                line_number = reader.line_num
+                
+                values = {
+                    column: (row.get(columns[column]) or "").strip() if column in columns else ""
+                    for column in STUDENT_COLUMNS
+                }
+                values["registration_date"] = values["registration_date"] or today
+                values["grade"] = _normalise_grade(values["grade"])
+                values["gender"] = values["gender"].capitalize()
+                
+                errors = _validate_student(values)
+                
+                photo_path = None
+                photo_name = (row.get(photo_column) or "").strip() if photo_column else ""
+                if photo_name:
+                    photo_path = photos.find(photo_name)
+                    if not photo_path:
+                        errors.append(f"Photo '{photo_name}' not found")
+                
+                if errors:
+                    report.add_error(line_number, "; ".join(errors))
+                    continue
+                
+                student_data = (
+                    values["student_name"], values["date_of_birth"], values["gender"],
+                    values["address"], values["guardian_name"], values["guardian_nic"],
+                    values["guardian_contact"], None, values["registration_date"], values["grade"]
+                )
+                chunk.append((line_number, student_data, photo_path))
+                
+                if len(chunk) >= chunk_size:
+                    flush()
+            
+            flush()
+    
+    return report
+
+
+def _save_photos(db, executor, chunk, student_ids, max_size, report):
+    """Copy the photos of a freshly inserted chunk and record their paths"""
+    jobs = []
+    for (line_number, student_data, photo_path), student_id in zip(chunk, student_ids):
+        if photo_path:
+            future = executor.submit(save_student_profile_image, photo_path, student_data[0], student_id, max_size)
+            jobs.append((line_number, student_id, future))
+    
+    image_paths = []
+    for line_number, student_id, future in jobs:
+        saved_path = future.result()
+        if saved_path:
+            image_paths.append((student_id, saved_path))
+        else:
+            report.add_error(line_number, f"Registered as ID {student_id} but the photo could not be saved")
+    
+    if image_paths:
+        success, message = db.set_student_image_paths(image_paths)
+        if not success:
+            print(f"Error saving image paths: {message}")
+
+
+def _print_report(report, errors_path=None):
+    """Print an import report and optionally save the error CSV"""
+    print(report.summary())
+    for line_number, message in report.errors[:20]:
+        print(f"  line {line_number}: {message}")
+    if report.rejected > 20:
+        print(f"  ... and {report.rejected - 20} more")
+    if errors_path and report.errors:
+        report.write_errors_csv(errors_path)
+        print(f"Error report written to {errors_path}")
+
+
+def main(argv=None):
+    """Command line entry point"""
+    from database import Database
+    
+    parser = argparse.ArgumentParser(description="Bulk import data into the Student Management System")
+    parser.add_argument("--db", default="app_database.db", help="Database file (default: app_database.db)")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    
+    student_parser = subparsers.add_parser("students", help="Register students from CSV")
+    student_parser.add_argument("csv_path", help="CSV with one row of registration form fields per student")
+    student_parser.add_argument("--photos", help="Folder containing the student photos")
+    student_parser.add_argument("--photo-key", default=DEFAULT_PHOTO_KEY,
+                                help=f"CSV column naming each student's photo file (default: {DEFAULT_PHOTO_KEY})")
+    student_parser.add_argument("--photo-size", type=int, default=DEFAULT_PHOTO_MAX_SIZE,
+                                help="Longest side of stored photos in pixels, 0 to copy unchanged")
+    student_parser.add_argument("--workers", type=int, default=DEFAULT_PHOTO_WORKERS,
+                                help="Number of threads copying photos")
+    student_parser.add_argument("--dry-run", action="store_true", help="Validate only, do not insert")
+    student_parser.add_argument("--errors", help="Write rejected rows to this CSV file")
+    student_parser.add_argument("--chunk-size", type=int, default=DEFAULT_CHUNK_SIZE)
+    
+    exam_parser = subparsers.add_parser("exam-results", help="Import exam results from CSV")
+    exam_parser.add_argument("csv_path", help="CSV with student_id/student_name, exam_name, exam_year, marks")
+    exam_parser.add_argument("--dry-run", action="store_true", help="Validate only, do not insert")
+    exam_parser.add_argument("--errors", help="Write rejected rows to this CSV file")
+    exam_parser.add_argument("--chunk-size", type=int, default=DEFAULT_CHUNK_SIZE)
+    
+    args = parser.parse_args(argv)
+    
+    db = Database(args.db)
+    db.initialize_database()
+    
+    def show_progress(rows):
+        """Report progress on stderr so stdout only carries the summary"""
+        print(f"  {rows} row(s) processed", file=sys.stderr)
+    
+    try:
+        if args.command == "students":
+            report = import_students_csv(
+                db, args.csv_path, args.photos, args.photo_key, args.dry_run, args.chunk_size,
+                args.photo_size or None, args.workers, show_progress
+            )
+        else:
+            report = import_exam_results_csv(db, args.csv_path, args.dry_run, args.chunk_size, show_progress)
+        _print_report(report, args.errors)
+    finally:
+        db.close()
+    
+    return 0 if not report.errors else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
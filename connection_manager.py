@@ -0,0 +1,187 @@
+"""Connection management for the SQLite database
+
+Keeps one long-lived connection per thread instead of opening and closing
+a connection for every query, plus a small pool of connections that can be
+lent to background workers.
+"""
+import sqlite3
+import threading
+import queue
+from contextlib import contextmanager
+from db_config import PerformanceProfile
+from query_stats import trace_statement
+
+
+class ConnectionManager:
+    """Owns every SQLite connection opened against a single database file"""
+    
+    _managers = {}
+    _managers_lock = threading.Lock()
+    
+    def __init__(self, db_name, pool_size=3, profile=None):
+        self.db_name = db_name
+        self.pool_size = pool_size
+        # PRAGMA profile applied to every new connection
+        self.profile = profile or PerformanceProfile.load(db_name)
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._thread_connections = []  # Every per-thread connection, for shutdown
+        self._pool = queue.LifoQueue()
+        self._pool_created = 0
+        self._closed = False
+        # Whether the FTS5 search index exists (None until checked); schema
+        # state shared by every Database on this file
+        self.search_index = None
+    
+    @classmethod
+    def for_database(cls, db_name):
+        """
+        Get the shared manager for a database file
+        
+        All Database instances pointing at the same file share one manager,
+        so the login page, main menu and views reuse the same connections.
+        
+        Args:
+            db_name: Path to the SQLite database file
+        
+        Returns:
+            ConnectionManager instance
+        """
+        with cls._managers_lock:
+            manager = cls._managers.get(db_name)
+            if manager is None or manager._closed:
+                manager = cls(db_name)
+                cls._managers[db_name] = manager
+            return manager
+    
+    @classmethod
+    def close_all_managers(cls):
+        """Close every manager (used on application shutdown)"""
+        with cls._managers_lock:
+            managers = list(cls._managers.values())
+            cls._managers.clear()
+        for manager in managers:
+            manager.close_all()
+    
+    def _open_connection(self):
+        """Open and configure a new connection"""
+        # Connections are only ever used by one thread at a time, but
+        # close_all() must be able to close them from the shutdown thread
+        conn = sqlite3.connect(self.db_name, check_same_thread=False)
+        self.profile.apply(conn)
+        # Lets query_stats capture the SQL run by each Database method
+        conn.set_trace_callback(trace_statement)
+        return conn
+    
+    def get_connection(self):
+        """
+        Get the long-lived connection for the calling thread
+        
+        Returns:
+            sqlite3.Connection owned by the current thread
+        """
+        if self._closed:
+            raise sqlite3.ProgrammingError("Connection manager has been closed")
+        
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = self._open_connection()
+            self._local.conn = conn
+            with self._lock:
+                self._thread_connections.append(conn)
+        return conn
+    
+    @contextmanager
+    def cursor(self):
+        """
+        Yield a cursor on the calling thread's connection
+        
+        Read-only helper - nothing is committed.
+        """
+        cursor = self.get_connection().cursor()
+        try:
+            yield cursor
+        finally:
+            cursor.close()
+    
+    @contextmanager
+    def transaction(self):
+        """
+        Yield a cursor inside a transaction
+        
+        Commits when the block finishes and rolls back if it raises.
+        """
+        conn = self.get_connection()
+        cursor = conn.cursor()
+        try:
+            yield cursor
+            conn.commit()
+        except BaseException:
+            conn.rollback()
+            raise
+        finally:
+            cursor.close()
+    
+    @contextmanager
+    def pooled(self):
+        """
+        Borrow a connection from the worker pool
+        
+        Pool connections are not tied to a thread, so a background worker
+        can use one for the duration of a job and hand it back afterwards.
+        When every pooled connection is busy the caller waits for one.
+        """
+        if self._closed:
+            raise sqlite3.ProgrammingError("Connection manager has been closed")
+        
+        conn = None
+        try:
+            conn = self._pool.get_nowait()
+        except queue.Empty:
+            with self._lock:
+                if self._pool_created < self.pool_size:
+                    self._pool_created += 1
+                    conn = self._open_connection()
+            if conn is None:
+                conn = self._pool.get()
+        
+        try:
+            yield conn
+            if conn.in_transaction:
+                conn.commit()
+        except BaseException:
+            conn.rollback()
+            raise
+        finally:
+            if self._closed:
+                conn.close()
+            else:
+                self._pool.put(conn)
+    
+    def close_thread_connection(self):
+        """Close the calling thread's connection, if it has one"""
+        conn = getattr(self._local, "conn", None)
+        if conn is not None:
+            self._local.conn = None
+            with self._lock:
+                if conn in self._thread_connections:
+                    self._thread_connections.remove(conn)
+            conn.close()
+    
+    def close_all(self):
+        """Close every connection owned by this manager"""
+        self._closed = True
+        
+        with self._lock:
+            connections = list(self._thread_connections)
+            self._thread_connections.clear()
+        
+        for conn in connections:
+            conn.close()
+        
+        while True:
+            try:
+                self._pool.get_nowait().close()
+            except queue.Empty:
+                break
+        self._local = threading.local()
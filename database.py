@@ -1,316 +1,851 @@
 import sqlite3
 import hashlib
 import os
+import re
+import time
+from connection_manager import ConnectionManager
+from query_cache import QueryCache, cached, invalidates
+from db_worker import DatabaseWorker
+from event_bus import EventBus, DataChanged, ADDED, UPDATED, DELETED
+from query_stats import QueryStats, instrument, untimed
 
+# Secondary indexes for the hot queries: (index name, table, columns)
+INDEXES = [
+    # get_student_results, delete_student cascade, exam_results JOIN students
+    ("idx_exam_results_student", "exam_results", "student_id, exam_year, exam_name"),
+    # get_certificates_by_student, delete_student cascade
+    ("idx_certificates_student", "certificates", "student_id, created_at"),
+    # search_students / name ordering
+    ("idx_students_name", "students", "student_name"),
+    # Year filter in get_all_exam_results
+    ("idx_exam_results_year", "exam_results", "exam_year"),
+    # Dashboard: latest registrations
+    ("idx_students_registration", "students", "registration_date, id"),
+    # Dashboard: counts by grade and gender (covering index)
+    ("idx_students_grade_gender", "students", "grade, gender"),
+]
+
+# Rows fetched per round trip by the iter_* methods
+ITER_CHUNK_SIZE = 500
+
+# Full-text search index over students and their notes (rowid = student id)
+SEARCH_TABLE = "student_search"
+SEARCH_COLUMNS = ["student_name", "guardian_name", "guardian_nic", "address", "notes"]
+# bm25 column weights, in SEARCH_COLUMNS order - a name hit ranks highest
+SEARCH_WEIGHTS = "10.0, 4.0, 4.0, 1.0, 1.0"
+
+# Triggers that keep the search index in sync with students and student_notes
+SEARCH_TRIGGERS = [
+    '''CREATE TRIGGER IF NOT EXISTS student_search_ai AFTER INSERT ON students BEGIN
+        INSERT INTO student_search (rowid, student_name, guardian_name, guardian_nic, address, notes)
+        VALUES (new.id, new.student_name, new.guardian_name, new.guardian_nic, new.address,
+                (SELECT notes FROM student_notes WHERE student_id = new.id));
+    END''',
+    '''CREATE TRIGGER IF NOT EXISTS student_search_au AFTER UPDATE ON students BEGIN
+        UPDATE student_search
+        SET student_name = new.student_name, guardian_name = new.guardian_name,
+            guardian_nic = new.guardian_nic, address = new.address
+        WHERE rowid = new.id;
+    END''',
+    '''CREATE TRIGGER IF NOT EXISTS student_search_ad AFTER DELETE ON students BEGIN
+        DELETE FROM student_search WHERE rowid = old.id;
+    END''',
+    '''CREATE TRIGGER IF NOT EXISTS student_search_notes_ai AFTER INSERT ON student_notes BEGIN
+        UPDATE student_search SET notes = new.notes WHERE rowid = new.student_id;
+    END''',
+    '''CREATE TRIGGER IF NOT EXISTS student_search_notes_au AFTER UPDATE ON student_notes BEGIN
+        UPDATE student_search SET notes = new.notes WHERE rowid = new.student_id;
+    END''',
+    '''CREATE TRIGGER IF NOT EXISTS student_search_notes_ad AFTER DELETE ON student_notes BEGIN
+        UPDATE student_search SET notes = NULL WHERE rowid = old.student_id;
+    END''',
+]
+
+@instrument
 class Database:
     def __init__(self, db_name="app_database.db"):
         self.db_name = db_name
-        self.conn = None
-        self.cursor = None
-        
+    
+    @property
+    def manager(self):
+        """Shared connection manager for this database file"""
+        return ConnectionManager.for_database(self.db_name)
+    
+    @property
+    def query_stats(self):
+        """Shared timing statistics for this database file"""
+        return QueryStats.for_database(self.db_name)
+    
+    @untimed
     def connect(self):
-        """Connect to the database"""
-        self.conn = sqlite3.connect(self.db_name)
-        self.cursor = self.conn.cursor()
+        """Get the long-lived connection for the calling thread"""
+        return self.manager.get_connection()
+    
+    @property
+    def query_cache(self):
+        """Shared query result cache for this database file"""
+        return QueryCache.for_database(self.db_name)
+    
+    @property
+    def events(self):
+        """Shared change-notification bus for this database file"""
+        return EventBus.for_database(self.db_name)
+    
+    def _publish(self, table, action, ids=(), student_ids=()):
+        """
+        Announce a committed write
         
+        The table's cached results are invalidated first, so subscribers
+        that query straight away never see stale data.
+        """
+        self.query_cache.invalidate(table)
+        self.events.publish(DataChanged(table, action, ids, student_ids))
+    
+    @untimed
     def close(self):
-        """Close database connection"""
-        if self.conn:
-            self.conn.close()
-            
+        """Close all database connections (call on logout / window close)"""
+        # Let the background worker finish its current job first
+        DatabaseWorker.shutdown_for(self.db_name)
+        self.manager.close_all()
+        self.query_cache.clear()
+    
+    @untimed
+    def get_query_stats(self):
+        """
+        Get per-method timing statistics
+        
+        Returns:
+            Dict of method name -> calls, rows, mean/max/p50/p95/p99 ms and
+            a histogram of recent call durations
+        """
+        return self.query_stats.snapshot()
+    
+    @untimed
+    def dump_query_stats(self, path):
+        """
+        Write the timing statistics to a JSON file
+        
+        Args:
+            path: Destination file path
+        """
+        self.query_stats.dump(path)
+    
+    @untimed
+    def get_cache_stats(self):
+        """
+        Get query cache statistics
+        
+        Returns:
+            Dict with hits, misses, hit_rate, evictions, entries, bytes and max_bytes
+        """
+        return self.query_cache.stats()
+    
+    @untimed
+    def get_active_settings(self):
+        """
+        Get the performance settings in effect on this thread's connection
+        
+        Returns:
+            Dict with the profile name and the live PRAGMA values
+        """
+        conn = self.connect()
+        settings = {"profile": self.manager.profile.name}
+        for key in self.manager.profile.settings:
+            row = conn.execute(f"PRAGMA {key}").fetchone()
+            settings[key] = row[0] if row else None
+        return settings
+    
+    def _iter_rows(self, query, params=(), chunk_size=ITER_CHUNK_SIZE):
+        """
+        Run a query and yield its rows without loading them all into memory
+        
+        Rows are fetched chunk_size at a time with fetchmany on a connection
+        borrowed from the worker pool, so a long export does not tie up the
+        calling thread's connection. The connection is returned to the pool
+        when the generator is exhausted or closed.
+        
+        Args:
+            query: SQL query
+            params: Query parameters
+            chunk_size: Rows fetched per round trip
+        
+        Yields:
+            Row tuples
+        """
+        with self.manager.pooled() as conn:
+            cursor = conn.execute(query, params)
+            try:
+                while True:
+                    rows = cursor.fetchmany(chunk_size)
+                    if not rows:
+                        break
+                    yield from rows
+            finally:
+                cursor.close()
+    
+    @untimed
     def hash_password(self, password):
         """Hash password using SHA256"""
         return hashlib.sha256(password.encode()).hexdigest()
     
+    @invalidates("students", "exam_results", "certificates", "student_notes", "users")
     def initialize_database(self):
         """Create tables and seed initial data"""
-        self.connect()
-        
-        # Create users table
-        self.cursor.execute('''
-            CREATE TABLE IF NOT EXISTS users (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                username TEXT UNIQUE NOT NULL,
-                password TEXT NOT NULL,
-                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-            )
-        ''')
-        
-        # Create students table
-        self.cursor.execute('''
-            CREATE TABLE IF NOT EXISTS students (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                student_name TEXT NOT NULL,
-                date_of_birth DATE NOT NULL,
-                gender TEXT NOT NULL,
-                address TEXT NOT NULL,
-                guardian_name TEXT NOT NULL,
-                guardian_nic TEXT NOT NULL,
-                guardian_contact TEXT NOT NULL,
-                image_path TEXT,
-                registration_date DATE,
-                grade TEXT,
-                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-            )
-        ''')
-        
-        # Create exam_results table
-        self.cursor.execute('''
-            CREATE TABLE IF NOT EXISTS exam_results (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                student_id INTEGER NOT NULL,
-                exam_name TEXT NOT NULL,
-                exam_year INTEGER NOT NULL,
-                marks_obtained REAL NOT NULL,
-                grade TEXT NOT NULL,
-                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                FOREIGN KEY (student_id) REFERENCES students (id)
-            )
-        ''')
-        
-        # Create student_notes table
-        self.cursor.execute('''
-            CREATE TABLE IF NOT EXISTS student_notes (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                student_id INTEGER UNIQUE NOT NULL,
-                notes TEXT,
-                updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                FOREIGN KEY (student_id) REFERENCES students (id)
-            )
-        ''')
-        
-        # Create certificates table
-        self.cursor.execute('''
-            CREATE TABLE IF NOT EXISTS certificates (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                student_id INTEGER NOT NULL,
-                certificate_image_path TEXT NOT NULL,
-                note TEXT,
-                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                FOREIGN KEY (student_id) REFERENCES students (id)
-            )
-        ''')
-        
-        # Check if admin user exists
-        self.cursor.execute("SELECT * FROM users WHERE username = 'admin'")
-        if not self.cursor.fetchone():
-            # Seed admin user with password '1234'
-            hashed_password = self.hash_password('1234')
-            self.cursor.execute(
-                "INSERT INTO users (username, password) VALUES (?, ?)",
-                ('admin', hashed_password)
+        with self.manager.transaction() as cursor:
+            # Create users table
+            cursor.execute('''
+                CREATE TABLE IF NOT EXISTS users (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    username TEXT UNIQUE NOT NULL,
+                    password TEXT NOT NULL,
+                    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+                )
+            ''')
+            
+            # Create students table
+            cursor.execute('''
+                CREATE TABLE IF NOT EXISTS students (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    student_name TEXT NOT NULL,
+                    date_of_birth DATE NOT NULL,
+                    gender TEXT NOT NULL,
+                    address TEXT NOT NULL,
+                    guardian_name TEXT NOT NULL,
+                    guardian_nic TEXT NOT NULL,
+                    guardian_contact TEXT NOT NULL,
+                    image_path TEXT,
+                    registration_date DATE,
+                    grade TEXT,
+                    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+                )
+            ''')
+            
+            # Create exam_results table
+            cursor.execute('''
+                CREATE TABLE IF NOT EXISTS exam_results (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    student_id INTEGER NOT NULL,
+                    exam_name TEXT NOT NULL,
+                    exam_year INTEGER NOT NULL,
+                    marks_obtained REAL NOT NULL,
+                    grade TEXT NOT NULL,
+                    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                    FOREIGN KEY (student_id) REFERENCES students (id)
+                )
+            ''')
+            
+            # Create student_notes table
+            cursor.execute('''
+                CREATE TABLE IF NOT EXISTS student_notes (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    student_id INTEGER UNIQUE NOT NULL,
+                    notes TEXT,
+                    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                    FOREIGN KEY (student_id) REFERENCES students (id)
+                )
+            ''')
+            
+            # Create certificates table
+            cursor.execute('''
+                CREATE TABLE IF NOT EXISTS certificates (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    student_id INTEGER NOT NULL,
+                    certificate_image_path TEXT NOT NULL,
+                    note TEXT,
+                    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                    FOREIGN KEY (student_id) REFERENCES students (id)
+                )
+            ''')
+            
+            # Check if admin user exists
+            cursor.execute("SELECT * FROM users WHERE username = 'admin'")
+            if not cursor.fetchone():
+                # Seed admin user with password '1234'
+                hashed_password = self.hash_password('1234')
+                cursor.execute(
+                    "INSERT INTO users (username, password) VALUES (?, ?)",
+                    ('admin', hashed_password)
+                )
+                print("Admin user created successfully!")
+        
+        self.run_migrations()
+    
+    @invalidates("students", "exam_results", "certificates", "student_notes", "users")
+    def run_migrations(self):
+        """
+        Bring an existing database up to the current schema
+        
+        Creates any missing secondary indexes and the full-text search
+        index. Safe to run on every startup: anything that already exists
+        is skipped.
+        
+        Returns:
+            List of (index_name, seconds) for each index that was built
+        """
+        report = []
+        
+        with self.manager.transaction() as cursor:
+            cursor.execute("SELECT name FROM sqlite_master WHERE type = 'index'")
+            existing = {row[0] for row in cursor.fetchall()}
+            
+            for index_name, table, columns in INDEXES:
+                if index_name in existing:
+                    continue
+                
+                start = time.perf_counter()
+                cursor.execute(f"CREATE INDEX IF NOT EXISTS {index_name} ON {table} ({columns})")
+                elapsed = time.perf_counter() - start
+                
+                report.append((index_name, elapsed))
+                print(f"Created index {index_name} on {table}({columns}) in {elapsed:.3f}s")
+        
+            search_index = self._migrate_search_index(cursor, report)
+        
+        # Searches check this instead of querying sqlite_master every time
+        self.manager.search_index = search_index
+        
+        if report:
+            # Refresh planner statistics so the new indexes get used
+            self.connect().execute("PRAGMA optimize")
+        
+        return report
+    
+    def _migrate_search_index(self, cursor, report):
+        """
+        Create, backfill and attach triggers to the FTS5 search index
+        
+        Returns:
+            True if the search index exists, False if FTS5 is unavailable
+        """
+        cursor.execute(
+            "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = ?",
+            (SEARCH_TABLE,)
+        )
+        if not cursor.fetchone():
+            start = time.perf_counter()
+            try:
+                cursor.execute(
+                    f"""CREATE VIRTUAL TABLE {SEARCH_TABLE} USING fts5(
+                        {', '.join(SEARCH_COLUMNS)},
+                        tokenize = 'unicode61',
+                        prefix = '2 3'
+                    )"""
+                )
+            except sqlite3.OperationalError as e:
+                # SQLite built without FTS5 - searches fall back to LIKE
+                print(f"Full-text search unavailable: {e}")
+                return False
+            
+            cursor.execute(
+                f"""INSERT INTO {SEARCH_TABLE} (rowid, {', '.join(SEARCH_COLUMNS)})
+                    SELECT s.id, s.student_name, s.guardian_name, s.guardian_nic, s.address, n.notes
+                    FROM students s
+                    LEFT JOIN student_notes n ON n.student_id = s.id"""
             )
-            self.conn.commit()
-            print("Admin user created successfully!")
+            elapsed = time.perf_counter() - start
+            
+            report.append((SEARCH_TABLE, elapsed))
+            print(f"Created full-text index {SEARCH_TABLE} in {elapsed:.3f}s")
+        
+        for trigger_sql in SEARCH_TRIGGERS:
+            cursor.execute(trigger_sql)
+        return True
+    
+    def has_search_index(self):
+        """
+        Check whether the FTS5 search index exists
+        
+        The schema is only looked up once per database file; run_migrations()
+        records the answer whenever it runs.
+        """
+        manager = self.manager
+        if manager.search_index is None:
+            with manager.cursor() as cursor:
+                cursor.execute(
+                    "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = ?",
+                    (SEARCH_TABLE,)
+                )
+                manager.search_index = cursor.fetchone() is not None
+        return manager.search_index
+    
+    @staticmethod
+    def build_match_query(search_term):
+        """
+        Turn free text into an FTS5 prefix query
+        
+        "ann per" becomes '"ann"* "per"*' - every word must match the start
+        of a word in one of the indexed columns.
         
-        self.close()
+        Args:
+            search_term: Text typed by the user
         
+        Returns:
+            FTS5 MATCH expression, or None if the text has no searchable words
+        """
+        words = re.findall(r"\w+", search_term or "")
+        if not words:
+            return None
+        return " ".join(f'"{word}"*' for word in words)
+    
+    @untimed
     def authenticate_user(self, username, password):
         """Authenticate user credentials"""
-        self.connect()
         hashed_password = self.hash_password(password)
         
-        self.cursor.execute(
-            "SELECT * FROM users WHERE username = ? AND password = ?",
-            (username, hashed_password)
-        )
-        
-        user = self.cursor.fetchone()
-        self.close()
+        with self.manager.cursor() as cursor:
+            cursor.execute(
+                "SELECT * FROM users WHERE username = ? AND password = ?",
+                (username, hashed_password)
+            )
+            user = cursor.fetchone()
         
         return user is not None
     
+    @invalidates("students", "certificates")
     def add_student(self, student_data, certificates_data=None):
         """Add a new student to the database with optional certificates"""
-        self.connect()
         try:
-            self.cursor.execute(
-                '''INSERT INTO students 
-                   (student_name, date_of_birth, gender, address, 
-                    guardian_name, guardian_nic, guardian_contact, image_path,
-                    registration_date, grade) 
-                   VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)''',
-                student_data
-            )
-            self.conn.commit()
-            student_id = self.cursor.lastrowid
-            
-            # Add certificates if provided
-            if certificates_data:
-                for cert_path, cert_note in certificates_data:
-                    self.cursor.execute(
+            with self.manager.transaction() as cursor:
+                cursor.execute(
+                    '''INSERT INTO students 
+                       (student_name, date_of_birth, gender, address, 
+                        guardian_name, guardian_nic, guardian_contact, image_path,
+                        registration_date, grade) 
+                       VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)''',
+                    student_data
+                )
+                student_id = cursor.lastrowid
+                
+                # Add certificates if provided
+                if certificates_data:
+                    cursor.executemany(
                         '''INSERT INTO certificates 
                            (student_id, certificate_image_path, note) 
                            VALUES (?, ?, ?)''',
-                        (student_id, cert_path, cert_note)
+                        [(student_id, cert_path, cert_note) for cert_path, cert_note in certificates_data]
                     )
-                self.conn.commit()
             
-            self.close()
+            self._publish("students", ADDED, [student_id])
+            if certificates_data:
+                self._publish("certificates", ADDED, student_ids=[student_id])
             return True, student_id
         except Exception as e:
-            self.close()
             return False, str(e)
     
+    @invalidates("students")
+    def add_students_bulk(self, students):
+        """
+        Add a batch of students in a single transaction
+        
+        Either every student in the batch is added or, if any insert fails,
+        none of them are.
+        
+        Args:
+            students: List of student_data tuples as accepted by add_student
+        
+        Returns:
+            (True, list of new student IDs in input order) or (False, error message)
+        """
+        try:
+            student_ids = []
+            with self.manager.transaction() as cursor:
+                for student_data in students:
+                    cursor.execute(
+                        '''INSERT INTO students 
+                           (student_name, date_of_birth, gender, address, 
+                            guardian_name, guardian_nic, guardian_contact, image_path,
+                            registration_date, grade) 
+                           VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)''',
+                        student_data
+                    )
+                    student_ids.append(cursor.lastrowid)
+            self._publish("students", ADDED, student_ids)
+            return True, student_ids
+        except Exception as e:
+            return False, str(e)
+    
+    @invalidates("students")
+    def set_student_image_paths(self, image_paths):
+        """
+        Set the profile image path of many students in one transaction
+        
+        Args:
+            image_paths: List of (student_id, image_path)
+        
+        Returns:
+            (success, message)
+        """
+        try:
+            with self.manager.transaction() as cursor:
+                cursor.executemany(
+                    "UPDATE students SET image_path = ? WHERE id = ?",
+                    [(image_path, student_id) for student_id, image_path in image_paths]
+                )
+            self._publish("students", UPDATED, [student_id for student_id, _ in image_paths])
+            return True, "Image paths updated"
+        except Exception as e:
+            return False, str(e)
+    
+    @cached("students")
     def get_all_students(self):
         """Retrieve all students from database"""
-        self.connect()
-        self.cursor.execute("SELECT * FROM students ORDER BY id")
-        students = self.cursor.fetchall()
-        self.close()
-        return students
+        with self.manager.cursor() as cursor:
+            cursor.execute("SELECT * FROM students ORDER BY id")
+            return cursor.fetchall()
+    
+    def iter_students(self, chunk_size=ITER_CHUNK_SIZE):
+        """
+        Iterate over all students in ID order in constant memory
+        
+        Yields the same rows as get_all_students.
+        """
+        return self._iter_rows("SELECT * FROM students ORDER BY id", (), chunk_size)
     
+    @cached("students")
     def get_student_by_id(self, student_id):
         """Get student details by ID"""
-        self.connect()
-        self.cursor.execute("SELECT * FROM students WHERE id = ?", (student_id,))
-        student = self.cursor.fetchone()
-        self.close()
-        return student
+        with self.manager.cursor() as cursor:
+            cursor.execute("SELECT * FROM students WHERE id = ?", (student_id,))
+            return cursor.fetchone()
     
+    @invalidates("exam_results")
     def add_exam_result(self, result_data):
         """Add exam result for a student"""
-        self.connect()
         try:
-            self.cursor.execute(
-                '''INSERT INTO exam_results 
-                   (student_id, exam_name, exam_year, marks_obtained, grade) 
-                   VALUES (?, ?, ?, ?, ?)''',
-                result_data
-            )
-            self.conn.commit()
-            self.close()
+            with self.manager.transaction() as cursor:
+                cursor.execute(
+                    '''INSERT INTO exam_results 
+                       (student_id, exam_name, exam_year, marks_obtained, grade) 
+                       VALUES (?, ?, ?, ?, ?)''',
+                    result_data
+                )
+                result_id = cursor.lastrowid
+            self._publish("exam_results", ADDED, [result_id], [result_data[0]])
             return True, "Result added successfully"
         except Exception as e:
-            self.close()
             return False, str(e)
     
+    @invalidates("exam_results")
+    def add_exam_results_bulk(self, results, chunk_size=500):
+        """
+        Add many exam results using executemany
+        
+        Each chunk is inserted in its own transaction, so a failure only
+        rolls back the chunk that failed.
+        
+        Args:
+            results: List of (student_id, exam_name, exam_year, marks_obtained, grade)
+            chunk_size: Number of rows per transaction
+        
+        Returns:
+            (True, number of rows inserted) or (False, error message)
+        """
+        inserted = 0
+        try:
+            for start in range(0, len(results), chunk_size):
+                chunk = results[start:start + chunk_size]
+                with self.manager.transaction() as cursor:
+                    cursor.executemany(
+                        '''INSERT INTO exam_results 
+                           (student_id, exam_name, exam_year, marks_obtained, grade) 
+                           VALUES (?, ?, ?, ?, ?)''',
+                        chunk
+                    )
+                inserted += len(chunk)
+            self._publish("exam_results", ADDED, student_ids=sorted({result[0] for result in results}))
+            return True, inserted
+        except Exception as e:
+            return False, str(e)
+    
+    def get_student_names(self):
+        """Iterate over (id, student_name) for every student, for resolving imports"""
+        return self._iter_rows("SELECT id, student_name FROM students")
+    
+    @invalidates("exam_results")
     def update_exam_result(self, result_id, result_data):
         """Update exam result"""
-        self.connect()
         try:
-            self.cursor.execute(
-                '''UPDATE exam_results 
-                   SET student_id=?, exam_name=?, exam_year=?, marks_obtained=?, grade=?
-                   WHERE id=?''',
-                (*result_data, result_id)
-            )
-            self.conn.commit()
-            self.close()
+            with self.manager.transaction() as cursor:
+                cursor.execute(
+                    '''UPDATE exam_results 
+                       SET student_id=?, exam_name=?, exam_year=?, marks_obtained=?, grade=?
+                       WHERE id=?''',
+                    (*result_data, result_id)
+                )
+            self._publish("exam_results", UPDATED, [result_id], [result_data[0]])
             return True, "Result updated successfully"
         except Exception as e:
-            self.close()
             return False, str(e)
     
+    @invalidates("exam_results")
     def delete_exam_result(self, result_id):
         """Delete exam result"""
-        self.connect()
         try:
-            self.cursor.execute("DELETE FROM exam_results WHERE id = ?", (result_id,))
-            self.conn.commit()
-            self.close()
+            with self.manager.transaction() as cursor:
+                cursor.execute("DELETE FROM exam_results WHERE id = ?", (result_id,))
+            self._publish("exam_results", DELETED, [result_id])
             return True, "Result deleted successfully"
         except Exception as e:
-            self.close()
             return False, str(e)
     
+    @cached("exam_results", "students")
     def get_exam_result_by_id(self, result_id):
         """Get a specific exam result by ID"""
-        self.connect()
-        self.cursor.execute(
-            '''SELECT 
-                exam_results.id,
-                students.id as student_id,
-                students.student_name,
-                exam_results.exam_name,
-                exam_results.exam_year,
-                exam_results.marks_obtained,
-                exam_results.grade
-               FROM exam_results
-               JOIN students ON exam_results.student_id = students.id
-               WHERE exam_results.id = ?''',
-            (result_id,)
-        )
-        result = self.cursor.fetchone()
-        self.close()
-        return result
+        with self.manager.cursor() as cursor:
+            cursor.execute(
+                '''SELECT 
+                    exam_results.id,
+                    students.id as student_id,
+                    students.student_name,
+                    exam_results.exam_name,
+                    exam_results.exam_year,
+                    exam_results.marks_obtained,
+                    exam_results.grade
+                   FROM exam_results
+                   JOIN students ON exam_results.student_id = students.id
+                   WHERE exam_results.id = ?''',
+                (result_id,)
+            )
+            return cursor.fetchone()
     
+    @cached("exam_results")
     def get_student_results(self, student_id):
         """Get all exam results for a student"""
-        self.connect()
-        self.cursor.execute(
-            "SELECT * FROM exam_results WHERE student_id = ? ORDER BY exam_year DESC, exam_name",
-            (student_id,)
-        )
-        results = self.cursor.fetchall()
-        self.close()
-        return results
+        with self.manager.cursor() as cursor:
+            cursor.execute(
+                "SELECT * FROM exam_results WHERE student_id = ? ORDER BY exam_year DESC, exam_name",
+                (student_id,)
+            )
+            return cursor.fetchall()
     
+    @cached("students")
     def search_students(self, search_term):
         """Search students by name"""
-        self.connect()
-        self.cursor.execute(
-            "SELECT * FROM students WHERE student_name LIKE ? ORDER BY student_name",
-            (f"%{search_term}%",)
-        )
-        students = self.cursor.fetchall()
-        self.close()
+        with self.manager.cursor() as cursor:
+            cursor.execute(
+                "SELECT * FROM students WHERE student_name LIKE ? ORDER BY student_name",
+                (f"%{search_term}%",)
+            )
+            return cursor.fetchall()
+    
+    # Keyset orderings for student pages: sort name -> ordered columns
+    STUDENT_SORTS = {
+        "id": ("id",),
+        "name": ("student_name", "id"),
+    }
+    
+    def _students_where(self, search=None):
+        """Build the WHERE clause and parameters for a student search"""
+        if not search:
+            return " WHERE 1=1", []
+        
+        match = self.build_match_query(search)
+        if match and self.has_search_index():
+            return (
+                f" WHERE id IN (SELECT rowid FROM {SEARCH_TABLE} WHERE {SEARCH_TABLE} MATCH ?)",
+                [match]
+            )
+        return " WHERE student_name LIKE ?", [f"%{search}%"]
+    
+    @cached("students", "student_notes")
+    def get_students_page(self, search=None, sort="id", limit=20, after_key=None, before_key=None, offset=None):
+        """
+        Get one page of students
+        
+        Use after_key/before_key for keyset paging (next/previous page in
+        constant time) or offset to jump straight to a page.
+        
+        Args:
+            search: Optional name search term
+            sort: "id" or "name"
+            limit: Maximum number of rows to return
+            after_key: Key of the last row of the previous page
+            before_key: Key of the first row of the following page
+            offset: Number of rows to skip (used when no key is given)
+        
+        Returns:
+            List of student rows in the same format as get_all_students
+        """
+        columns = self.STUDENT_SORTS[sort]
+        where, params = self._students_where(search)
+        row_value = f"({', '.join(columns)})"
+        placeholders = f"({', '.join('?' for _ in columns)})"
+        direction = ""
+        
+        if after_key is not None:
+            where += f" AND {row_value} > {placeholders}"
+            params += list(after_key)
+        elif before_key is not None:
+            where += f" AND {row_value} < {placeholders}"
+            params += list(before_key)
+            # Walk backwards from the key, then flip the rows back into order
+            direction = " DESC"
+        
+        order = ", ".join(column + direction for column in columns)
+        query = f"SELECT * FROM students {where} ORDER BY {order} LIMIT ?"
+        params.append(limit)
+        
+        if after_key is None and before_key is None and offset:
+            query += " OFFSET ?"
+            params.append(offset)
+        
+        with self.manager.cursor() as cursor:
+            cursor.execute(query, params)
+            students = cursor.fetchall()
+        
+        if before_key is not None:
+            students.reverse()
         return students
     
+    @classmethod
+    def student_page_key(cls, student, sort="id"):
+        """Get the keyset pagination key of a student row"""
+        # Column positions in the students table
+        positions = {"id": 0, "student_name": 1}
+        return tuple(student[positions[column]] for column in cls.STUDENT_SORTS[sort])
+    
+    @cached("students", "student_notes")
+    def count_students(self, search=None):
+        """
+        Count students, optionally matching a name search
+        
+        Args:
+            search: Optional name search term
+        
+        Returns:
+            Number of matching students
+        """
+        where, params = self._students_where(search)
+        with self.manager.cursor() as cursor:
+            cursor.execute(f"SELECT COUNT(*) FROM students {where}", params)
+            return cursor.fetchone()[0]
+    
+    @cached("students")
+    def get_student_counts_by_grade(self):
+        """Get (grade, number of students) pairs, ordered by grade number"""
+        with self.manager.cursor() as cursor:
+            cursor.execute("SELECT grade, COUNT(*) FROM students GROUP BY grade")
+            counts = cursor.fetchall()
+        
+        def grade_number(item):
+            digits = ''.join(c for c in str(item[0] or "") if c.isdigit())
+            return int(digits) if digits else 0
+        
+        return sorted(counts, key=grade_number)
+    
+    @cached("students")
+    def get_student_counts_by_gender(self):
+        """Get (gender, number of students) pairs"""
+        with self.manager.cursor() as cursor:
+            cursor.execute("SELECT gender, COUNT(*) FROM students GROUP BY gender ORDER BY gender")
+            return cursor.fetchall()
+    
+    @cached("students")
+    def get_latest_registrations(self, limit=5):
+        """
+        Get the most recently registered students
+        
+        Args:
+            limit: Maximum number of students to return
+        
+        Returns:
+            List of (id, student_name, registration_date, grade) tuples
+        """
+        with self.manager.cursor() as cursor:
+            cursor.execute(
+                '''SELECT id, student_name, registration_date, grade
+                   FROM students
+                   ORDER BY registration_date DESC, id DESC
+                   LIMIT ?''',
+                (limit,)
+            )
+            return cursor.fetchall()
+    
+    @cached("students", "student_notes")
+    def search(self, query, limit=50):
+        """
+        Ranked full-text search over students
+        
+        Matches word prefixes in the student name, guardian name, guardian
+        NIC, address and notes. Name matches rank highest.
+        
+        Args:
+            query: Text typed by the user
+            limit: Maximum number of students to return
+        
+        Returns:
+            List of student rows (same format as get_all_students), best match first
+        """
+        match = self.build_match_query(query)
+        if not match:
+            return []
+        
+        if not self.has_search_index():
+            return self.search_students(query)[:limit]
+        
+        with self.manager.cursor() as cursor:
+            cursor.execute(
+                f"""SELECT students.*
+                    FROM {SEARCH_TABLE}
+                    JOIN students ON students.id = {SEARCH_TABLE}.rowid
+                    WHERE {SEARCH_TABLE} MATCH ?
+                    ORDER BY bm25({SEARCH_TABLE}, {SEARCH_WEIGHTS}), students.student_name
+                    LIMIT ?""",
+                (match, limit)
+            )
+            return cursor.fetchall()
+    
+    @invalidates("students")
     def update_student(self, student_id, student_data):
         """Update student information"""
-        self.connect()
         try:
-            self.cursor.execute(
-                '''UPDATE students 
-                   SET student_name=?, date_of_birth=?, gender=?, address=?, 
-                   guardian_name = ?, guardian_nic = ?, guardian_contact = ?, image_path = ?,
-                   registration_date = ?, grade = ?
-                   WHERE id=?''',
-                (*student_data, student_id)
-            )
-            self.conn.commit()
-            self.close()
+            with self.manager.transaction() as cursor:
+                cursor.execute(
+                    '''UPDATE students 
+                       SET student_name=?, date_of_birth=?, gender=?, address=?, 
+                       guardian_name = ?, guardian_nic = ?, guardian_contact = ?, image_path = ?,
+                       registration_date = ?, grade = ?
+                       WHERE id=?''',
+                    (*student_data, student_id)
+                )
+            self._publish("students", UPDATED, [student_id])
             return True, "Student updated successfully"
         except Exception as e:
-            self.close()
             return False, str(e)
     
+    @invalidates("students", "exam_results", "certificates", "student_notes")
     def delete_student(self, student_id):
         """Delete student and their exam results"""
-        self.connect()
         try:
-            # Delete exam results first (foreign key constraint)
-            self.cursor.execute("DELETE FROM exam_results WHERE student_id = ?", (student_id,))
-            # Delete certificates
-            self.cursor.execute("DELETE FROM certificates WHERE student_id = ?", (student_id,))
-            # Delete student notes
-            self.cursor.execute("DELETE FROM student_notes WHERE student_id = ?", (student_id,))
-            # Delete student
-            self.cursor.execute("DELETE FROM students WHERE id = ?", (student_id,))
-            self.conn.commit()
-            self.close()
+            with self.manager.transaction() as cursor:
+                # Delete exam results first (foreign key constraint)
+                cursor.execute("DELETE FROM exam_results WHERE student_id = ?", (student_id,))
+                # Delete certificates
+                cursor.execute("DELETE FROM certificates WHERE student_id = ?", (student_id,))
+                # Delete student notes
+                cursor.execute("DELETE FROM student_notes WHERE student_id = ?", (student_id,))
+                # Delete student
+                cursor.execute("DELETE FROM students WHERE id = ?", (student_id,))
+            # Rows of the other tables went with the student
+            for table in ("exam_results", "certificates", "student_notes"):
+                self._publish(table, DELETED, student_ids=[student_id])
+            self._publish("students", DELETED, [student_id])
             return True, "Student deleted successfully"
         except Exception as e:
-            self.close()
             return False, str(e)
     
-    def get_all_exam_results(self, student_name=None, exam_name=None, exam_year=None):
-        """Get all exam results with optional filters"""
-        self.connect()
-        
-        query = '''SELECT 
-                    exam_results.id,
+    # Columns returned by the exam result listing queries
+    EXAM_RESULT_COLUMNS = '''exam_results.id,
                     students.id as student_id,
                     students.student_name,
                     exam_results.exam_name,
                     exam_results.exam_year,
                     exam_results.marks_obtained,
-                    exam_results.grade
-                   FROM exam_results
-                   JOIN students ON exam_results.student_id = students.id
-                   WHERE 1=1'''
-        
+                    exam_results.grade'''
+    
+    def _exam_results_where(self, student_name=None, exam_name=None, exam_year=None):
+        """Build the WHERE clause and parameters for exam result filters"""
+        query = " WHERE 1=1"
         params = []
         
         if student_name:
@@ -325,79 +860,204 @@ class Database:
             query += " AND exam_results.exam_year = ?"
             params.append(exam_year)
         
-        query += " ORDER BY exam_results.exam_year DESC, students.student_name"
+        return query, params
+    
+    @cached("exam_results", "students")
+    def get_all_exam_results(self, student_name=None, exam_name=None, exam_year=None):
+        """Get all exam results with optional filters"""
+        where, params = self._exam_results_where(student_name, exam_name, exam_year)
+        query = f'''SELECT {self.EXAM_RESULT_COLUMNS}
+                   FROM exam_results
+                   JOIN students ON exam_results.student_id = students.id
+                   {where}
+                   ORDER BY exam_results.exam_year DESC, students.student_name'''
+        
+        with self.manager.cursor() as cursor:
+            cursor.execute(query, params)
+            return cursor.fetchall()
+    
+    def iter_exam_results(self, filters=None, chunk_size=ITER_CHUNK_SIZE):
+        """
+        Iterate over exam results in constant memory
+        
+        Yields the same rows, in the same order, as get_all_exam_results.
+        
+        Args:
+            filters: Optional dict with student_name, exam_name and exam_year
+            chunk_size: Rows fetched per round trip
+        """
+        filters = filters or {}
+        where, params = self._exam_results_where(
+            filters.get("student_name"), filters.get("exam_name"), filters.get("exam_year")
+        )
+        query = f'''SELECT {self.EXAM_RESULT_COLUMNS}
+                   FROM exam_results
+                   JOIN students ON exam_results.student_id = students.id
+                   {where}
+                   ORDER BY exam_results.exam_year DESC, students.student_name'''
+        return self._iter_rows(query, params, chunk_size)
+    
+    @cached("exam_results", "students")
+    def get_exam_results_page(self, filters=None, limit=20, after_key=None, before_key=None, offset=None):
+        """
+        Get one page of exam results
+        
+        Results are ordered by year (newest first), then student name, then ID.
+        Use after_key/before_key for keyset paging (next/previous page in
+        constant time) or offset to jump straight to a page.
+        
+        Args:
+            filters: Optional dict with student_name, exam_name and exam_year
+            limit: Maximum number of rows to return
+            after_key: Key of the last row of the previous page
+            before_key: Key of the first row of the following page
+            offset: Number of rows to skip (used when no key is given)
         
-        self.cursor.execute(query, params)
-        results = self.cursor.fetchall()
-        self.close()
+        Returns:
+            List of result rows in the same format as get_all_exam_results
+        """
+        filters = filters or {}
+        where, params = self._exam_results_where(
+            filters.get("student_name"), filters.get("exam_name"), filters.get("exam_year")
+        )
+        order = "exam_results.exam_year DESC, students.student_name, exam_results.id"
+        
+        if after_key is not None:
+            year, name, result_id = after_key
+            where += ''' AND (exam_results.exam_year < ?
+                          OR (exam_results.exam_year = ?
+                              AND (students.student_name, exam_results.id) > (?, ?)))'''
+            params += [year, year, name, result_id]
+        elif before_key is not None:
+            year, name, result_id = before_key
+            where += ''' AND (exam_results.exam_year > ?
+                          OR (exam_results.exam_year = ?
+                              AND (students.student_name, exam_results.id) < (?, ?)))'''
+            params += [year, year, name, result_id]
+            # Walk backwards from the key, then flip the rows back into order
+            order = "exam_results.exam_year, students.student_name DESC, exam_results.id DESC"
+        
+        query = f'''SELECT {self.EXAM_RESULT_COLUMNS}
+                   FROM exam_results
+                   JOIN students ON exam_results.student_id = students.id
+                   {where}
+                   ORDER BY {order}
+                   LIMIT ?'''
+        params.append(limit)
+        
+        if after_key is None and before_key is None and offset:
+            query += " OFFSET ?"
+            params.append(offset)
+        
+        with self.manager.cursor() as cursor:
+            cursor.execute(query, params)
+            results = cursor.fetchall()
+        
+        if before_key is not None:
+            results.reverse()
         return results
     
+    @staticmethod
+    def exam_result_page_key(result):
+        """Get the keyset pagination key of an exam result row"""
+        return (result[4], result[2], result[0])
+    
+    @cached("exam_results", "students")
+    def count_exam_results(self, filters=None):
+        """
+        Count exam results matching the filters
+        
+        Args:
+            filters: Optional dict with student_name, exam_name and exam_year
+        
+        Returns:
+            Number of matching results
+        """
+        filters = filters or {}
+        where, params = self._exam_results_where(
+            filters.get("student_name"), filters.get("exam_name"), filters.get("exam_year")
+        )
+        
+        # The join is only needed to filter by student name; delete_student
+        # removes a student's results, so every result has a student
+        join = "JOIN students ON exam_results.student_id = students.id" if filters.get("student_name") else ""
+        
+        with self.manager.cursor() as cursor:
+            cursor.execute(f"SELECT COUNT(*) FROM exam_results {join} {where}", params)
+            return cursor.fetchone()[0]
+    
+    @cached("exam_results")
+    def get_exam_years(self):
+        """Get the distinct exam years, newest first"""
+        with self.manager.cursor() as cursor:
+            cursor.execute("SELECT DISTINCT exam_year FROM exam_results ORDER BY exam_year DESC")
+            return [row[0] for row in cursor.fetchall()]
+    
+    @cached("student_notes")
     def get_student_notes(self, student_id):
         """Get notes for a specific student"""
-        self.connect()
-        self.cursor.execute(
-            "SELECT notes FROM student_notes WHERE student_id = ?",
-            (student_id,)
-        )
-        result = self.cursor.fetchone()
-        self.close()
+        with self.manager.cursor() as cursor:
+            cursor.execute(
+                "SELECT notes FROM student_notes WHERE student_id = ?",
+                (student_id,)
+            )
+            result = cursor.fetchone()
         return result[0] if result else ""
     
+    @invalidates("student_notes")
     def save_student_notes(self, student_id, notes):
         """Save or update notes for a student"""
-        self.connect()
         try:
-            # Check if notes exist
-            self.cursor.execute(
-                "SELECT id FROM student_notes WHERE student_id = ?",
-                (student_id,)
-            )
-            existing = self.cursor.fetchone()
-            
-            if existing:
-                # Update existing notes
-                self.cursor.execute(
-                    '''UPDATE student_notes 
-                       SET notes = ?, updated_at = CURRENT_TIMESTAMP 
-                       WHERE student_id = ?''',
-                    (notes, student_id)
-                )
-            else:
-                # Insert new notes
-                self.cursor.execute(
-                    '''INSERT INTO student_notes (student_id, notes) 
-                       VALUES (?, ?)''',
-                    (student_id, notes)
+            with self.manager.transaction() as cursor:
+                # Check if notes exist
+                cursor.execute(
+                    "SELECT id FROM student_notes WHERE student_id = ?",
+                    (student_id,)
                 )
+                existing = cursor.fetchone()
+                
+                if existing:
+                    # Update existing notes
+                    cursor.execute(
+                        '''UPDATE student_notes 
+                           SET notes = ?, updated_at = CURRENT_TIMESTAMP 
+                           WHERE student_id = ?''',
+                        (notes, student_id)
+                    )
+                else:
+                    # Insert new notes
+                    cursor.execute(
+                        '''INSERT INTO student_notes (student_id, notes) 
+                           VALUES (?, ?)''',
+                        (student_id, notes)
+                    )
             
-            self.conn.commit()
-            self.close()
+            self._publish("student_notes", UPDATED if existing else ADDED, student_ids=[student_id])
             return True, "Notes saved successfully"
         except Exception as e:
-            self.close()
             return False, str(e)
     
+    @invalidates("certificates")
     def add_certificate(self, student_id, certificate_image_path, note=""):
         """Add a new certificate for a student"""
         try:
-            self.connect()
-            self.cursor.execute(
-                """INSERT INTO certificates (student_id, certificate_image_path, note) 
-                   VALUES (?, ?, ?)""",
-                (student_id, certificate_image_path, note)
-            )
-            self.conn.commit()
+            with self.manager.transaction() as cursor:
+                cursor.execute(
+                    """INSERT INTO certificates (student_id, certificate_image_path, note) 
+                       VALUES (?, ?, ?)""",
+                    (student_id, certificate_image_path, note) 
+                )
+                certificate_id = cursor.lastrowid
+            self._publish("certificates", ADDED, [certificate_id], [student_id])
             return True, "Certificate added successfully"
         except Exception as e:
             return False, str(e)
-        finally:
-            self.close()
     
+    @cached("certificates", "students")
     def get_certificates_by_student(self, student_id):
         """Get all certificates for a specific student"""
-        try:
-            self.connect()
-            self.cursor.execute(
+        with self.manager.cursor() as cursor:
+            cursor.execute(
                 """SELECT c.id, c.student_id, c.certificate_image_path, c.note, c.created_at,
                           s.student_name
                    FROM certificates c
@@ -406,17 +1066,14 @@ class Database:
                    ORDER BY c.created_at DESC""",
                 (student_id,)
             )
-            return self.cursor.fetchall()
-        finally:
-            self.close()
+            return cursor.fetchall()
     
+    @cached("certificates", "students")
     def get_all_certificates(self, student_name_filter=""):
         """Get all certificates with optional student name filter"""
-        try:
-            self.connect()
-            
+        with self.manager.cursor() as cursor:
             if student_name_filter:
-                self.cursor.execute(
+                cursor.execute(
                     """SELECT c.id, c.student_id, c.certificate_image_path, c.note, c.created_at,
                               s.student_name
                        FROM certificates c
@@ -426,7 +1083,7 @@ class Database:
                     (f"%{student_name_filter}%",)
                 )
             else:
-                self.cursor.execute(
+                cursor.execute(
                     """SELECT c.id, c.student_id, c.certificate_image_path, c.note, c.created_at,
                               s.student_name
                        FROM certificates c
@@ -434,18 +1091,62 @@ class Database:
                        ORDER BY c.created_at DESC"""
                 )
             
-            return self.cursor.fetchall()
-        finally:
-            self.close()
+            return cursor.fetchall()
+    
+    def iter_certificates(self, student_name_filter="", chunk_size=ITER_CHUNK_SIZE):
+        """
+        Iterate over certificates in constant memory
+        
+        Yields the same rows, in the same order, as get_all_certificates.
+        """
+        query = """SELECT c.id, c.student_id, c.certificate_image_path, c.note, c.created_at,
+                          s.student_name
+                   FROM certificates c
+                   JOIN students s ON c.student_id = s.id"""
+        params = ()
+        if student_name_filter:
+            query += " WHERE s.student_name LIKE ?"
+            params = (f"%{student_name_filter}%",)
+        query += " ORDER BY c.created_at DESC"
+        return self._iter_rows(query, params, chunk_size)
+    
+    @cached("certificates")
+    def count_certificates(self):
+        """Count all certificates"""
+        with self.manager.cursor() as cursor:
+            cursor.execute("SELECT COUNT(*) FROM certificates")
+            return cursor.fetchone()[0]
+    
+    def get_dashboard_stats(self, recent_limit=5):
+        """
+        Get the aggregate figures shown on the home dashboard
+        
+        Every figure comes from a COUNT/GROUP BY query, so no student rows
+        are loaded.
+        
+        Args:
+            recent_limit: Number of latest registrations to include
+        
+        Returns:
+            Dict with total_students, by_grade, by_gender, exam_results,
+            certificates and latest_registrations
+        """
+        return {
+            "total_students": self.count_students(),
+            "by_grade": self.get_student_counts_by_grade(),
+            "by_gender": self.get_student_counts_by_gender(),
+            "exam_results": self.count_exam_results(),
+            "certificates": self.count_certificates(),
+            "latest_registrations": self.get_latest_registrations(recent_limit),
+        }
     
+    @invalidates("certificates")
     def delete_certificate(self, certificate_id):
         """Delete a certificate by ID"""
         try:
-            self.connect()
-            self.cursor.execute("DELETE FROM certificates WHERE id = ?", (certificate_id,))
-            self.conn.commit()
+            with self.manager.transaction() as cursor:
+                cursor.execute("DELETE FROM certificates WHERE id = ?", (certificate_id,))
+            self._publish("certificates", DELETED, [certificate_id])
             return True, "Certificate deleted successfully"
         except Exception as e:
             return False, str(e)
-        finally:
-            self.close()
@@ -0,0 +1,166 @@
+"""SQLite performance profiles for the Student Management System
+
+A profile is a named set of PRAGMA settings applied to every connection
+when it is opened. The active profile is read from a JSON config file that
+sits next to the database file, e.g. app_database.config.json:
+
+    {
+        "profile": "fast",
+        "settings": {"cache_size": -131072}
+    }
+
+"settings" is optional and overrides individual values of the profile.
+"""
+import json
+import os
+
+
+# Named profiles. Negative cache_size is in KiB, mmap_size is in bytes,
+# busy_timeout is in milliseconds.
+PROFILES = {
+    # Durable on power loss: every commit is fsynced
+    "safe": {
+        "journal_mode": "WAL",
+        "synchronous": "FULL",
+        "cache_size": -8000,        # ~8 MB page cache
+        "mmap_size": 0,
+        "temp_store": "MEMORY",
+        "busy_timeout": 5000,
+    },
+    # Durable on application crash; a power cut may lose the last commits
+    "fast": {
+        "journal_mode": "WAL",
+        "synchronous": "NORMAL",
+        "cache_size": -64000,       # ~64 MB page cache
+        "mmap_size": 268435456,     # 256 MB memory-mapped I/O
+        "temp_store": "MEMORY",
+        "busy_timeout": 5000,
+    },
+}
+
+DEFAULT_PROFILE = "fast"
+
+# Allowed values for text PRAGMAs (PRAGMA values cannot be bound as parameters)
+_ALLOWED_VALUES = {
+    "journal_mode": {"DELETE", "TRUNCATE", "PERSIST", "MEMORY", "WAL", "OFF"},
+    "synchronous": {"OFF", "NORMAL", "FULL", "EXTRA"},
+    "temp_store": {"DEFAULT", "FILE", "MEMORY"},
+}
+_INTEGER_SETTINGS = {"cache_size", "mmap_size", "busy_timeout"}
+
+
+def get_config_path(db_name):
+    """
+    Get the path of the config file for a database
+    
+    Args:
+        db_name: Path to the SQLite database file
+    
+    Returns:
+        Path to <database name>.config.json in the same folder
+    """
+    return os.path.splitext(db_name)[0] + ".config.json"
+
+
+def load_config(db_name):
+    """
+    Load the JSON config that sits next to a database file
+    
+    Args:
+        db_name: Path to the SQLite database file
+    
+    Returns:
+        Config dictionary (empty if the file is missing or unreadable)
+    """
+    if db_name == ":memory:":
+        return {}
+    
+    config_path = get_config_path(db_name)
+    if not os.path.exists(config_path):
+        return {}
+    
+    try:
+        with open(config_path, "r", encoding="utf-8") as f:
+            config = json.load(f)
+        return config if isinstance(config, dict) else {}
+    except (OSError, ValueError) as e:
+        print(f"Error reading database config {config_path}: {e}")
+        return {}
+
+
+class PerformanceProfile:
+    """A named set of PRAGMA settings applied to new connections"""
+    
+    def __init__(self, name, settings):
+        self.name = name
+        self.settings = dict(settings)
+    
+    @classmethod
+    def from_name(cls, name, overrides=None):
+        """
+        Build a profile from one of the named PROFILES
+        
+        Args:
+            name: Profile name ("safe" or "fast")
+            overrides: Optional dict of individual settings to override
+        
+        Returns:
+            PerformanceProfile (falls back to DEFAULT_PROFILE for unknown names)
+        """
+        if name not in PROFILES:
+            print(f"Unknown database profile '{name}', using '{DEFAULT_PROFILE}'")
+            name = DEFAULT_PROFILE
+        
+        settings = dict(PROFILES[name])
+        for key, value in (overrides or {}).items():
+            if _is_valid_setting(key, value):
+                settings[key] = value
+            else:
+                print(f"Ignoring invalid database setting {key}={value!r}")
+        
+        return cls(name, settings)
+    
+    @classmethod
+    def load(cls, db_name):
+        """
+        Load the profile configured for a database file
+        
+        Args:
+            db_name: Path to the SQLite database file
+        
+        Returns:
+            PerformanceProfile
+        """
+        config = load_config(db_name)
+        return cls.from_name(
+            config.get("profile", DEFAULT_PROFILE),
+            config.get("settings")
+        )
+    
+    def apply(self, conn):
+        """
+        Apply the profile's PRAGMAs to a connection
+        
+        Args:
+            conn: sqlite3.Connection
+        """
+        for key, value in self.settings.items():
+            if key == "journal_mode" and str(value).upper() == "WAL" and _is_memory_database(conn):
+                # In-memory databases cannot use WAL
+                continue
+            conn.execute(f"PRAGMA {key} = {value}")
+
+
+def _is_valid_setting(key, value):
+    """Check that a setting name and value are safe to put into a PRAGMA"""
+    if key in _ALLOWED_VALUES:
+        return isinstance(value, str) and value.upper() in _ALLOWED_VALUES[key]
+    if key in _INTEGER_SETTINGS:
+        return isinstance(value, int) and not isinstance(value, bool)
+    return False
+
+
+def _is_memory_database(conn):
+    """Check whether a connection points at an in-memory database"""
+    row = conn.execute("PRAGMA database_list").fetchone()
+    return not row or not row[2]
@@ -0,0 +1,358 @@
+"""Background database worker for the Student Management System
+
+Database calls made from Tk event handlers block the mainloop, so the
+window freezes for the duration of a slow query or commit. This module
+runs them on a dedicated worker thread instead:
+
+    async_db = AsyncDatabase(db)
+    future = async_db.count_exam_results(filters)   # returns immediately
+
+Results come back to the Tk thread by polling the future with after().
+Views use AsyncLoader for the standard pattern - show a loading state,
+run the job in the background, then render the newest result:
+
+    self.loader = AsyncLoader(self.frame, AsyncDatabase(db))
+    self.loader.load(
+        self._query, filters,
+        on_loading=self._show_loading,
+        on_result=self._render,
+        on_error=self._show_error
+    )
+
+Jobs run one at a time in submission order, on the worker thread's own
+SQLite connection. Never touch Tk widgets from a job.
+
+Search-as-you-type uses LiveSearch, which debounces keystrokes and runs
+queries on a separate "search" worker so they never wait behind a save.
+A query that is superseded by newer typing is aborted mid-statement with
+a progress handler, and only the newest result is rendered.
+"""
+import functools
+import queue
+import threading
+from concurrent.futures import Future
+
+
+POLL_INTERVAL_MS = 30  # How often the Tk thread checks a pending future
+DEBOUNCE_MS = 200  # Typing pause before a live search runs
+PROGRESS_STEPS = 1000  # SQLite VM steps between checks for a superseded search
+
+
+class DatabaseWorker:
+    """A worker thread that executes jobs from a request queue"""
+    
+    _workers = {}
+    _workers_lock = threading.Lock()
+    
+    def __init__(self, name="db-worker"):
+        self._queue = queue.Queue()
+        self._closed = False
+        self._thread = threading.Thread(target=self._run, name=name, daemon=True)
+        self._thread.start()
+    
+    @classmethod
+    def for_database(cls, db_name, role="default"):
+        """
+        Get the shared worker for a database file
+        
+        Args:
+            db_name: Path to the SQLite database file
+            role: Workers with different roles run side by side, e.g.
+                "search" keeps live searches from queueing behind writes
+        
+        Returns:
+            DatabaseWorker instance
+        """
+        key = (db_name, role)
+        with cls._workers_lock:
+            worker = cls._workers.get(key)
+            if worker is None or worker._closed:
+                worker = cls(name=f"db-worker:{role}:{db_name}")
+                cls._workers[key] = worker
+            return worker
+    
+    @classmethod
+    def shutdown_for(cls, db_name):
+        """Stop every worker of a database file"""
+        with cls._workers_lock:
+            keys = [key for key in cls._workers if key[0] == db_name]
+            workers = [cls._workers.pop(key) for key in keys]
+        for worker in workers:
+            worker.shutdown()
+    
+    def submit(self, func, *args, **kwargs):
+        """
+        Queue a job for the worker thread
+        
+        Args:
+            func: Callable to run on the worker thread
+            *args, **kwargs: Arguments for func
+        
+        Returns:
+            concurrent.futures.Future for the job's result
+        """
+        if self._closed:
+            raise RuntimeError("Database worker has been shut down")
+        
+        future = Future()
+        self._queue.put((future, func, args, kwargs))
+        return future
+    
+    def _run(self):
+        """Worker thread main loop"""
+        while True:
+            item = self._queue.get()
+            if item is None:
+                break
+            
+            future, func, args, kwargs = item
+            if not future.set_running_or_notify_cancel():
+                continue  # Cancelled while waiting in the queue
+            
+            try:
+                result = func(*args, **kwargs)
+            except BaseException as e:
+                future.set_exception(e)
+            else:
+                future.set_result(result)
+    
+    def shutdown(self, wait=True):
+        """
+        Stop the worker thread
+        
+        Jobs that have not started yet are cancelled; the running job (if
+        any) is allowed to finish.
+        
+        Args:
+            wait: Block until the worker thread has exited
+        """
+        self._closed = True
+        
+        while True:
+            try:
+                item = self._queue.get_nowait()
+            except queue.Empty:
+                break
+            if item is not None:
+                item[0].cancel()
+        
+        self._queue.put(None)
+        if wait and self._thread is not threading.current_thread():
+            self._thread.join()
+
+
+class AsyncDatabase:
+    """
+    Asynchronous facade over a Database
+    
+    Every Database method is available with the same arguments, but runs on
+    the background worker and returns a Future instead of its result.
+    """
+    
+    def __init__(self, db, role="default"):
+        self.db = db
+        self.role = role
+    
+    @property
+    def worker(self):
+        """Worker thread for this database file"""
+        return DatabaseWorker.for_database(self.db.db_name, self.role)
+    
+    def submit(self, func, *args, **kwargs):
+        """
+        Run any function on the worker thread
+        
+        Use this for jobs made of several Database calls (plus file
+        operations) that should not block the UI.
+        
+        Returns:
+            Future for the function's result
+        """
+        return self.worker.submit(func, *args, **kwargs)
+    
+    def __getattr__(self, name):
+        attr = getattr(self.db, name)
+        if not callable(attr):
+            raise AttributeError(f"Database.{name} is not a method")
+        return functools.partial(self.submit, attr)
+
+
+def _widget_exists(widget):
+    """Check that a Tk widget has not been destroyed"""
+    try:
+        return bool(widget.winfo_exists())
+    except Exception:
+        return False
+
+
+def deliver(widget, future, on_result, on_error=None, poll_ms=POLL_INTERVAL_MS):
+    """
+    Call on_result(result) on the Tk thread once a future completes
+    
+    The future is polled with widget.after(), so the callbacks always run
+    on the Tk thread. If the widget is destroyed first (the user navigated
+    away) the result is dropped.
+    
+    Args:
+        widget: Any Tk widget owned by the receiving view
+        future: Future returned by AsyncDatabase
+        on_result: Callable(result)
+        on_error: Optional callable(exception); errors are printed otherwise
+        poll_ms: Polling interval in milliseconds
+    """
+    def poll():
+        if not _widget_exists(widget):
+            return
+        if not future.done():
+            widget.after(poll_ms, poll)
+            return
+        if future.cancelled():
+            return
+        
+        error = future.exception()
+        if error is None:
+            on_result(future.result())
+        elif on_error:
+            on_error(error)
+        else:
+            print(f"Background database call failed: {error}")
+    
+    widget.after(0, poll)
+
+
+class AsyncLoader:
+    """
+    Standard loading pattern for a view
+    
+    Each load() shows the loading state, runs the job in the background and
+    renders its result. Only the newest load is rendered: a result that
+    arrives after a newer load was started is discarded, so clicking
+    "Next" twice quickly never shows the first page last.
+    """
+    
+    def __init__(self, widget, async_db):
+        self.widget = widget
+        self.async_db = async_db
+        self._generation = 0
+        self._pending = None
+    
+    @property
+    def loading(self):
+        """Whether a load is still in progress"""
+        return self._pending is not None and not self._pending.done()
+    
+    def load(self, func, *args, on_result, on_error=None, on_loading=None, **kwargs):
+        """
+        Run func(*args, **kwargs) in the background and render the result
+        
+        Args:
+            func: Callable to run on the worker thread
+            on_result: Callable(result), run on the Tk thread
+            on_error: Optional callable(exception), run on the Tk thread
+            on_loading: Optional callable() that shows the loading state
+        
+        Returns:
+            Future for the job
+        """
+        self._generation += 1
+        generation = self._generation
+        
+        if on_loading:
+            on_loading()
+        
+        def if_current(callback):
+            def wrapper(value):
+                if generation == self._generation and callback:
+                    callback(value)
+            return wrapper
+        
+        future = self.async_db.submit(func, *args, **kwargs)
+        self._pending = future
+        deliver(self.widget, future, if_current(on_result), if_current(on_error) if on_error else None)
+        return future
+    
+    def cancel(self):
+        """Discard the result of any load in progress"""
+        self._generation += 1
+        if self._pending is not None:
+            self._pending.cancel()
+
+
+class LiveSearch:
+    """
+    Search-as-you-type for an entry widget
+    
+    Call schedule(text) on every keystroke. Once typing pauses for
+    delay_ms the search runs on the "search" worker thread; every newer
+    keystroke supersedes it. A superseded query still running is aborted
+    through a SQLite progress handler, and its result is never rendered.
+    """
+    
+    def __init__(self, widget, db, search_func, on_result, on_error=None, delay_ms=DEBOUNCE_MS):
+        """
+        Args:
+            widget: Tk widget used for after() scheduling (usually the entry)
+            db: Database instance
+            search_func: Callable(text) run on the worker thread
+            on_result: Callable(text, result), run on the Tk thread
+            on_error: Optional callable(exception), run on the Tk thread
+            delay_ms: Typing pause before the search runs
+        """
+        self.widget = widget
+        self.db = db
+        self.search_func = search_func
+        self.on_result = on_result
+        self.on_error = on_error
+        self.delay_ms = delay_ms
+        self.async_db = AsyncDatabase(db, role="search")
+        self._generation = 0
+        self._after_id = None
+        self._pending = None
+    
+    def schedule(self, text):
+        """Search for text once typing pauses (supersedes any earlier search)"""
+        self.cancel()
+        self._after_id = self.widget.after(self.delay_ms, lambda: self.run_now(text))
+    
+    def run_now(self, text):
+        """Search for text immediately (supersedes any earlier search)"""
+        self.cancel()
+        generation = self._generation
+        
+        def job():
+            conn = self.db.manager.get_connection()
+            # Abort the query as soon as a newer search has been started
+            conn.set_progress_handler(lambda: generation != self._generation, PROGRESS_STEPS)
+            try:
+                return self.search_func(text)
+            finally:
+                conn.set_progress_handler(None, 0)
+        
+        def render(result):
+            if generation == self._generation:
+                self.on_result(text, result)
+        
+        def fail(error):
+            # A superseded search fails with "interrupted"; that is expected
+            if generation != self._generation:
+                return
+            if self.on_error:
+                self.on_error(error)
+            else:
+                print(f"Live search failed: {error}")
+        
+        self._pending = self.async_db.submit(job)
+        deliver(self.widget, self._pending, render, fail)
+    
+    def cancel(self):
+        """Drop any scheduled or running search"""
+        self._generation += 1
+        if self._after_id is not None:
+            try:
+                self.widget.after_cancel(self._after_id)
+            except Exception:
+                pass
+            self._after_id = None
+        if self._pending is not None:
+            self._pending.cancel()
+            self._pending = None
@@ -0,0 +1,195 @@
+"""Change notifications for the Student Management System
+
+Database write methods publish a DataChanged event after they commit,
+naming the table, what happened and the ids of the affected rows:
+
+    db.events.subscribe(self._on_data_changed, tables=["exam_results"], widget=self.frame)
+    
+    def _on_data_changed(self, event):
+        if event.action == UPDATED:
+            for result_id in event.ids:
+                self._patch_result(result_id)
+
+Writes may run on the background worker thread, so subscriptions made with
+a widget are delivered on the Tk thread: events are queued and a pump
+scheduled with after() on the Tk root dispatches them. Subscriptions
+without a widget are called straight away on the publishing thread.
+
+A subscription made with a widget ends when the widget is destroyed.
+"""
+import queue
+import threading
+
+
+# DataChanged actions
+ADDED = "added"
+UPDATED = "updated"
+DELETED = "deleted"
+
+PUMP_INTERVAL_MS = 50  # How often the Tk thread delivers queued events
+
+
+class DataChanged:
+    """A committed write to one table"""
+    
+    def __init__(self, table, action, ids=(), student_ids=()):
+        """
+        Args:
+            table: Table that was written to
+            action: ADDED, UPDATED or DELETED
+            ids: Ids of the affected rows; empty when unknown (e.g. bulk writes)
+            student_ids: Students the affected rows belong to, when known
+        """
+        self.table = table
+        self.action = action
+        self.ids = tuple(ids)
+        self.student_ids = tuple(student_ids)
+    
+    def __repr__(self):
+        return f"DataChanged({self.table!r}, {self.action!r}, ids={self.ids!r}, student_ids={self.student_ids!r})"
+
+
+class Subscription:
+    """A callback registered with an EventBus"""
+    
+    def __init__(self, bus, callback, tables, widget):
+        self.bus = bus
+        self.callback = callback
+        self.tables = set(tables) if tables else None
+        self.widget = widget
+        self.active = True
+    
+    def wants(self, event):
+        """Whether this subscription receives an event"""
+        return self.active and (self.tables is None or event.table in self.tables)
+    
+    def unsubscribe(self):
+        """Stop receiving events"""
+        self.bus.unsubscribe(self)
+
+
+def _widget_exists(widget):
+    """Check that a Tk widget has not been destroyed"""
+    try:
+        return bool(widget.winfo_exists())
+    except Exception:
+        return False
+
+
+class EventBus:
+    """Publish/subscribe hub for the change events of one database"""
+    
+    _buses = {}
+    _buses_lock = threading.Lock()
+    
+    def __init__(self):
+        self._subscriptions = []
+        self._lock = threading.Lock()
+        self._queue = queue.Queue()  # (subscription, event) waiting for the Tk thread
+        self._pump_root = None
+    
+    @classmethod
+    def for_database(cls, db_name):
+        """
+        Get the shared event bus for a database file
+        
+        Args:
+            db_name: Path to the SQLite database file
+        
+        Returns:
+            EventBus instance
+        """
+        with cls._buses_lock:
+            bus = cls._buses.get(db_name)
+            if bus is None:
+                bus = cls._buses[db_name] = cls()
+            return bus
+    
+    def subscribe(self, callback, tables=None, widget=None):
+        """
+        Register a callback for change events
+        
+        Call this on the Tk thread when passing a widget.
+        
+        Args:
+            callback: Callable(event)
+            tables: Optional iterable of table names; None receives every event
+            widget: Optional Tk widget; events are then delivered on the Tk
+                thread, and the subscription ends when the widget is destroyed
+        
+        Returns:
+            Subscription (call .unsubscribe() to stop)
+        """
+        subscription = Subscription(self, callback, tables, widget)
+        with self._lock:
+            self._subscriptions.append(subscription)
+        if widget is not None:
+            self._start_pump(widget)
+        return subscription
+    
+    def unsubscribe(self, subscription):
+        """Remove a subscription"""
+        subscription.active = False
+        with self._lock:
+            if subscription in self._subscriptions:
+                self._subscriptions.remove(subscription)
+    
+    def publish(self, event):
+        """
+        Send an event to every interested subscription
+        
+        Safe to call from any thread.
+        """
+        with self._lock:
+            subscriptions = [sub for sub in self._subscriptions if sub.wants(event)]
+        
+        for subscription in subscriptions:
+            if subscription.widget is not None:
+                self._queue.put((subscription, event))
+                continue
+            try:
+                subscription.callback(event)
+            except Exception as e:
+                print(f"Error handling {event!r}: {e}")
+    
+    def _start_pump(self, widget):
+        """Start delivering queued events on the Tk thread (once per root window)"""
+        root = widget._root()
+        if self._pump_root is root and _widget_exists(root):
+            return
+        self._pump_root = root
+        root.after(PUMP_INTERVAL_MS, lambda: self._pump(root))
+    
+    def _pump(self, root):
+        """Deliver queued events to widget subscriptions (runs on the Tk thread)"""
+        if root is not self._pump_root or not _widget_exists(root):
+            return
+        
+        while True:
+            try:
+                subscription, event = self._queue.get_nowait()
+            except queue.Empty:
+                break
+            
+            if not subscription.active:
+                continue
+            if not _widget_exists(subscription.widget):
+                self.unsubscribe(subscription)
+                continue
+            try:
+                subscription.callback(event)
+            except Exception as e:
+                print(f"Error handling {event!r}: {e}")
+        
+        # Drop subscriptions whose widgets are gone, then keep pumping while any remain
+        with self._lock:
+            dead = [sub for sub in self._subscriptions if sub.widget is not None and not _widget_exists(sub.widget)]
+        for subscription in dead:
+            self.unsubscribe(subscription)
+        
+        with self._lock:
+            has_widgets = any(sub.widget is not None for sub in self._subscriptions)
+        if has_widgets:
+            root.after(PUMP_INTERVAL_MS, lambda: self._pump(root))
+        else:
+            self._pump_root = None
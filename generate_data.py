@@ -0,0 +1,463 @@
+"""Synthetic data generator for the Student Management System
+
+Fills a fresh database with realistic students, multi-year exam results,
+notes and certificates, so the application can be exercised (and
+benchmarked) at production scale. The output is fully determined by the
+seed and the options.
+
+Placeholder images are saved into the normal student folder layout,
+students/<StudentName_StudentID>/, as small gradient PNGs, through the
+same content store and thumbnails as uploaded files (see blob_store.py and
+thumbnail_store.py). A handful of distinct images is made with zlib and
+rendered to thumbnails once; every student file is a link to one of them.
+
+The database records the files as students/<StudentName_StudentID>/...,
+relative to the folder the app runs from, exactly as the app itself does.
+The files root must therefore be a folder named "students": by default the
+one next to the database, so run the app from the database's folder.
+
+Command line usage:
+    python generate_data.py --students 50000 --seed 1
+    python generate_data.py --db bench.db --students 1000000 --no-images --force
+    python generate_data.py --db /tmp/bench/app_database.db --force  # files in /tmp/bench/students
+"""
+import argparse
+import os
+import random
+import re
+import shutil
+import struct
+import sys
+import time
+import zlib
+from datetime import date, timedelta
+from database import Database, INDEXES, SEARCH_TABLE, SEARCH_TRIGGERS
+from blob_store import STUDENTS_ROOT, store_file
+from student_folder_utils import get_student_folder_name
+from thumbnail_store import THUMBS_DIR, generate_thumbnails
+from validators import Validators, EXAM_NAMES, GENDERS
+
+
+FIRST_NAMES = {
+    "Male": [
+        "Amal", "Kasun", "Nuwan", "Chamara", "Dilshan", "Tharindu", "Ruwan", "Sahan",
+        "Isuru", "Lahiru", "Pasindu", "Janith", "Ashen", "Dinuka", "Gayan", "Hasitha",
+        "Kavindu", "Malith", "Nimesh", "Ravindu", "Sachin", "Thisara", "Yasiru", "Arjun",
+        "Karthik", "Suresh", "Rizwan", "Imran", "Fahim", "Daniel",
+    ],
+    "Female": [
+        "Nethmi", "Sanduni", "Dilini", "Kavya", "Hiruni", "Tharushi", "Ishara", "Sachini",
+        "Nadeesha", "Anjali", "Dulani", "Gayathri", "Hansani", "Imasha", "Janani", "Kaushalya",
+        "Madhavi", "Nipuni", "Oshadi", "Piumi", "Ruvini", "Sewwandi", "Thilini", "Uthpala",
+        "Vindya", "Yashodha", "Priya", "Fathima", "Ayesha", "Sarah",
+    ],
+}
+
+LAST_NAMES = [
+    "Perera", "Fernando", "Silva", "Jayasinghe", "Bandara", "Wickramasinghe", "Gunawardena",
+    "Rathnayake", "Dissanayake", "Herath", "Karunaratne", "Wijesinghe", "Senanayake",
+    "Rajapaksha", "Liyanage", "Abeysekara", "Samarasinghe", "Ekanayake", "Kumara",
+    "Weerasinghe", "Mendis", "Peiris", "Jayawardena", "Amarasinghe", "Ranasinghe",
+    "Nanayakkara", "Hettiarachchi", "Rodrigo", "Sivakumar", "Mohamed",
+]
+
+STREETS = [
+    "Temple Road", "Main Street", "Station Road", "Lake Drive", "Hill Street", "Galle Road",
+    "Kandy Road", "School Lane", "Church Street", "Flower Road", "Park Avenue", "Canal Road",
+]
+
+TOWNS = [
+    "Colombo", "Kandy", "Galle", "Matara", "Kurunegala", "Negombo", "Gampaha", "Jaffna",
+    "Anuradhapura", "Ratnapura", "Badulla", "Kalutara", "Trincomalee", "Batticaloa",
+]
+
+NOTES = [
+    "Excellent participation in class discussions.",
+    "Needs extra support with mathematics.",
+    "Member of the school cricket team.",
+    "Shows strong interest in science projects.",
+    "Prefect; very responsible and punctual.",
+    "Frequently absent in the first term.",
+    "Represents the school in debate competitions.",
+    "Talented in art and music.",
+    "Recommended for the scholarship programme.",
+    "Parents requested monthly progress updates.",
+]
+
+CERTIFICATE_NOTES = [
+    "Sports Meet", "Science Fair", "Art Competition", "Debate", "Music Festival",
+    "Perfect Attendance", "Mathematics Olympiad", "Essay Competition", "",
+]
+
+MOBILE_PREFIXES = ["070", "071", "072", "074", "075", "076", "077", "078"]
+
+# Generated data is dated relative to this day, so a seed always produces
+# the same database whatever day it is run on
+DEFAULT_REFERENCE_DATE = "2025-12-31"
+
+DEFAULT_BATCH_SIZE = 5000
+PHOTO_SIZE = (600, 600)
+CERTIFICATE_SIZE = (1200, 900)
+TEMPLATE_COUNT = 8  # Distinct placeholder images of each kind
+TEMPLATES_DIR = ".templates"  # Under the files root; hidden from the student folder scans
+
+
+def _png_bytes(width, height, top_color, bottom_color):
+    """
+    Encode a vertical gradient as a PNG file
+    
+    Args:
+        width, height: Image size in pixels
+        top_color, bottom_color: (r, g, b) colours of the first and last row
+    
+    Returns:
+        PNG file contents
+    """
+    rows = []
+    for y in range(height):
+        t = y / max(1, height - 1)
+        color = bytes(round(a + (b - a) * t) for a, b in zip(top_color, bottom_color))
+        # Alternate darker 30-row bands so the image is not trivially uniform
+        if (y // 30) % 2:
+            color = bytes(max(0, c - 24) for c in color)
+        rows.append(b"\x00" + color * width)  # Filter type 0 per row
+    
+    def chunk(kind, data):
+        body = kind + data
+        return struct.pack(">I", len(data)) + body + struct.pack(">I", zlib.crc32(body) & 0xFFFFFFFF)
+    
+    header = struct.pack(">IIBBBBB", width, height, 8, 2, 0, 0, 0)  # 8-bit RGB
+    return (
+        b"\x89PNG\r\n\x1a\n"
+        + chunk(b"IHDR", header)
+        + chunk(b"IDAT", zlib.compress(b"".join(rows), 6))
+        + chunk(b"IEND", b"")
+    )
+
+
+def _make_templates(rng, size, folder, kind):
+    """
+    Write TEMPLATE_COUNT placeholder PNGs of one size and their thumbnails
+    
+    Returns:
+        List of template file paths
+    """
+    os.makedirs(folder, exist_ok=True)
+    templates = []
+    for number in range(TEMPLATE_COUNT):
+        top = tuple(rng.randint(60, 230) for _ in range(3))
+        bottom = tuple(rng.randint(20, 200) for _ in range(3))
+        path = os.path.join(folder, f"{kind}_{number + 1}.png")
+        with open(path, "wb") as f:
+            f.write(_png_bytes(size[0], size[1], top, bottom))
+        generate_thumbnails(path, force=True)
+        templates.append(path)
+    return templates
+
+
+def _link_or_copy(source_path, dest_path):
+    """Hard link a file, or copy it where links are not supported"""
+    try:
+        os.link(source_path, dest_path)
+    except OSError:
+        shutil.copy2(source_path, dest_path)
+
+
+def _random_date(rng, start, end):
+    """Random date between start and end inclusive"""
+    return start + timedelta(days=rng.randint(0, max(0, (end - start).days)))
+
+
+def _nic(rng, birth_year):
+    """12 digit NIC: birth year, day of year (+500 for women), serial, check digit"""
+    day = rng.randint(1, 365) + (500 if rng.random() < 0.5 else 0)
+    return f"{birth_year}{day:03d}{rng.randint(0, 9999):04d}{rng.randint(0, 9)}"
+
+
+class DataGenerator:
+    """Generates and inserts synthetic records in batches"""
+    
+    def __init__(self, db, seed=1, years=3, certificates=1.0, notes=0.3, images=True,
+                 reference_date=DEFAULT_REFERENCE_DATE, batch_size=DEFAULT_BATCH_SIZE,
+                 files_root=STUDENTS_ROOT):
+        self.db = db
+        self.rng = random.Random(seed)
+        self.years = years
+        self.certificates = certificates
+        self.notes = notes
+        self.images = images
+        self.reference_date = date.fromisoformat(reference_date)
+        self.batch_size = batch_size
+        self.files_root = files_root
+        self.counts = {"students": 0, "exam_results": 0, "student_notes": 0, "certificates": 0, "files": 0}
+        
+        if images:
+            templates_folder = os.path.join(files_root, TEMPLATES_DIR)
+            self.photo_templates = _make_templates(self.rng, PHOTO_SIZE, templates_folder, "photo")
+            self.certificate_templates = _make_templates(
+                self.rng, CERTIFICATE_SIZE, templates_folder, "certificate"
+            )
+    
+    def _next_student_id(self):
+        """ID the next inserted student will get"""
+        with self.db.manager.cursor() as cursor:
+            cursor.execute("SELECT COALESCE(MAX(id), 0) + 1 FROM students")
+            return cursor.fetchone()[0]
+    
+    def _student(self, student_id):
+        """
+        Generate one student with their results, notes and certificates
+        
+        Returns:
+            (student_row, exam_rows, note_row or None, certificate_rows, files)
+            where files is a list of (path on disk, template path) to save;
+            the rows hold the paths the app uses, relative to its folder
+        """
+        rng = self.rng
+        today = self.reference_date
+        
+        gender = rng.choice(GENDERS)
+        last_name = rng.choice(LAST_NAMES)
+        student_name = f"{rng.choice(FIRST_NAMES[gender])} {last_name}"
+        guardian_gender = rng.choice(GENDERS)
+        guardian_name = f"{rng.choice(FIRST_NAMES[guardian_gender])} {last_name}"
+        
+        # Grade N students are roughly N + 5 years old
+        grade_number = rng.randint(1, 13)
+        age = grade_number + 5
+        dob = _random_date(rng, date(today.year - age - 1, today.month, 1), date(today.year - age, 12, 31))
+        dob = min(dob, today)
+        
+        # Registered some time in the last `years` years, but not before age 5
+        earliest = max(date(dob.year + 5, 1, 10), date(today.year - self.years + 1, 1, 10))
+        registration_date = _random_date(rng, min(earliest, today), today)
+        
+        guardian_birth_year = dob.year - rng.randint(22, 45)
+        address = f"{rng.randint(1, 250)} {rng.choice(STREETS)}, {rng.choice(TOWNS)}"
+        contact = rng.choice(MOBILE_PREFIXES) + f"{rng.randint(0, 9999999):07d}"
+        
+        image_path = None
+        files = []
+        folder_name = get_student_folder_name(student_name, student_id)
+        if self.images:
+            image_path = os.path.join(STUDENTS_ROOT, folder_name, "profile_generated.png")
+            files.append((self._disk_path(image_path), rng.choice(self.photo_templates)))
+        
+        student_row = (
+            student_id, student_name, dob.isoformat(), gender, address, guardian_name,
+            _nic(rng, guardian_birth_year), contact, image_path,
+            registration_date.isoformat(), f"Grade {grade_number}"
+        )
+        
+        # Three terms a year from the registration year on; each student has
+        # an ability level so their marks are consistent across terms
+        ability = rng.gauss(62, 12)
+        exam_rows = []
+        for exam_year in range(registration_date.year, today.year + 1):
+            for exam_name in EXAM_NAMES:
+                marks = round(min(100.0, max(0.0, rng.gauss(ability, 9))), 1)
+                exam_rows.append((student_id, exam_name, exam_year, marks, Validators.calculate_grade(marks)))
+        
+        note_row = None
+        if rng.random() < self.notes:
+            note_row = (student_id, " ".join(rng.sample(NOTES, rng.randint(1, 3))))
+        
+        certificate_rows = []
+        if self.images:
+            # Whole part of the mean, plus one more with probability of the fraction
+            count = int(self.certificates) + (1 if rng.random() < self.certificates % 1 else 0)
+            for number in range(count):
+                note = rng.choice(CERTIFICATE_NOTES)
+                path = os.path.join(STUDENTS_ROOT, folder_name, f"certificate_generated_{number + 1}.png")
+                certificate_rows.append((student_id, path, note))
+                files.append((self._disk_path(path), rng.choice(self.certificate_templates)))
+        
+        return student_row, exam_rows, note_row, certificate_rows, files
+    
+    def _disk_path(self, app_path):
+        """Where a file recorded as students/... is written under the files root"""
+        return os.path.join(self.files_root, os.path.relpath(app_path, STUDENTS_ROOT))
+    
+    def _write_files(self, files):
+        """Save placeholder image files and their thumbnails"""
+        for path, template_path in files:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            digest = store_file(template_path, path, self.files_root)
+            
+            # The templates' thumbnails were rendered once; link them in so
+            # generate_thumbnails() only has to record the file
+            thumbs_folder = os.path.join(os.path.dirname(path), THUMBS_DIR)
+            os.makedirs(thumbs_folder, exist_ok=True)
+            for thumb_path in generate_thumbnails(template_path).values():
+                dest_thumb = os.path.join(thumbs_folder, os.path.basename(thumb_path))
+                if not os.path.exists(dest_thumb):
+                    _link_or_copy(thumb_path, dest_thumb)
+            generate_thumbnails(path, digest=digest)
+        self.counts["files"] += len(files)
+    
+    def _insert_batch(self, students, exam_results, notes, certificates):
+        """Insert one batch of every table in a single transaction"""
+        with self.db.manager.transaction() as cursor:
+            cursor.executemany(
+                '''INSERT INTO students
+                   (id, student_name, date_of_birth, gender, address,
+                    guardian_name, guardian_nic, guardian_contact, image_path,
+                    registration_date, grade)
+                   VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)''',
+                students
+            )
+            cursor.executemany(
+                '''INSERT INTO exam_results
+                   (student_id, exam_name, exam_year, marks_obtained, grade)
+                   VALUES (?, ?, ?, ?, ?)''',
+                exam_results
+            )
+            cursor.executemany("INSERT INTO student_notes (student_id, notes) VALUES (?, ?)", notes)
+            cursor.executemany(
+                "INSERT INTO certificates (student_id, certificate_image_path, note) VALUES (?, ?, ?)",
+                certificates
+            )
+        
+        self.counts["students"] += len(students)
+        self.counts["exam_results"] += len(exam_results)
+        self.counts["student_notes"] += len(notes)
+        self.counts["certificates"] += len(certificates)
+    
+    def generate(self, student_count, progress_callback=None):
+        """
+        Generate student_count students and everything that belongs to them
+        
+        Args:
+            student_count: Number of students to add
+            progress_callback: Optional callable(students_done) called per batch
+        
+        Returns:
+            Dict of table name -> rows inserted (plus "files" written)
+        """
+        student_id = self._next_student_id()
+        remaining = student_count
+        
+        while remaining > 0:
+            batch = min(self.batch_size, remaining)
+            students, exam_results, notes, certificates, files = [], [], [], [], []
+            
+            for _ in range(batch):
+                student_row, exam_rows, note_row, certificate_rows, student_files = self._student(student_id)
+                students.append(student_row)
+                exam_results.extend(exam_rows)
+                if note_row:
+                    notes.append(note_row)
+                certificates.extend(certificate_rows)
+                files.extend(student_files)
+                student_id += 1
+            
+            self._insert_batch(students, exam_results, notes, certificates)
+            self._write_files(files)
+            remaining -= batch
+            
+            if progress_callback:
+                progress_callback(student_count - remaining)
+        
+        # Generated rows bypass the write methods, so drop cached results
+        self.db.query_cache.invalidate("students", "exam_results", "student_notes", "certificates")
+        return dict(self.counts)
+
+
+def _drop_derived_structures(db):
+    """
+    Drop the secondary indexes and the search index of a fresh database
+    
+    Loading rows without maintaining them is much faster; run_migrations()
+    rebuilds all of them in one pass afterwards.
+    """
+    with db.manager.transaction() as cursor:
+        for index_name, _, _ in INDEXES:
+            cursor.execute(f"DROP INDEX IF EXISTS {index_name}")
+        for trigger_sql in SEARCH_TRIGGERS:
+            trigger_name = re.search(r"CREATE TRIGGER IF NOT EXISTS (\w+)", trigger_sql).group(1)
+            cursor.execute(f"DROP TRIGGER IF EXISTS {trigger_name}")
+        cursor.execute(f"DROP TABLE IF EXISTS {SEARCH_TABLE}")
+    db.manager.search_index = False
+
+
+def _remove_database(db_name):
+    """Delete a database file and its WAL/shared-memory files"""
+    for suffix in ("", "-wal", "-shm"):
+        if os.path.exists(db_name + suffix):
+            os.remove(db_name + suffix)
+
+
+def main(argv=None):
+    """Command line entry point"""
+    parser = argparse.ArgumentParser(description="Generate a synthetic Student Management System database")
+    parser.add_argument("--db", default="app_database.db", help="Database file (default: app_database.db)")
+    parser.add_argument("--students", type=int, default=1000, help="Number of students (default: 1000)")
+    parser.add_argument("--years", type=int, default=3, help="Years of exam results (default: 3)")
+    parser.add_argument("--certificates", type=float, default=1.0,
+                        help="Average certificates per student (default: 1.0)")
+    parser.add_argument("--notes", type=float, default=0.3,
+                        help="Fraction of students with notes (default: 0.3)")
+    parser.add_argument("--seed", type=int, default=1, help="Random seed (default: 1)")
+    parser.add_argument("--reference-date", default=DEFAULT_REFERENCE_DATE,
+                        help=f"Generate data as of this date (default: {DEFAULT_REFERENCE_DATE})")
+    parser.add_argument("--batch-size", type=int, default=DEFAULT_BATCH_SIZE,
+                        help="Students per insert transaction")
+    parser.add_argument("--files-root",
+                        help="Folder for the student photos and certificates "
+                             "(default: the students folder next to the database; must be named students)")
+    parser.add_argument("--no-images", action="store_true",
+                        help="Skip profile photos and certificates (much faster for large runs)")
+    parser.add_argument("--force", action="store_true", help="Replace the database if it already exists")
+    parser.add_argument("--append", action="store_true", help="Add to an existing database")
+    args = parser.parse_args(argv)
+    
+    files_root = args.files_root or os.path.join(os.path.dirname(args.db), STUDENTS_ROOT)
+    if os.path.basename(os.path.normpath(files_root)) != STUDENTS_ROOT:
+        # The database records students/... paths, resolved from the app's folder
+        parser.error(f"--files-root must be a folder named {STUDENTS_ROOT}, the one the app will run next to")
+    
+    if os.path.exists(args.db) and not args.append:
+        if not args.force:
+            print(f"{args.db} already exists - use --force to replace it or --append to add to it")
+            return 1
+        _remove_database(args.db)
+        # The old files belonged to the replaced database
+        if os.path.isdir(files_root):
+            print(f"Removing {files_root}", file=sys.stderr)
+            shutil.rmtree(files_root)
+    
+    db = Database(args.db)
+    db.initialize_database()
+    if not args.append:
+        _drop_derived_structures(db)
+    
+    # Generated rows bypass the Database methods, so skip SQL tracing
+    db.connect().set_trace_callback(None)
+    
+    generator = DataGenerator(
+        db, seed=args.seed, years=args.years, certificates=args.certificates, notes=args.notes,
+        images=not args.no_images, reference_date=args.reference_date, batch_size=args.batch_size,
+        files_root=files_root
+    )
+    
+    start = time.perf_counter()
+    
+    def show_progress(done):
+        """Report progress on stderr"""
+        rate = done / max(time.perf_counter() - start, 1e-9)
+        print(f"  {done}/{args.students} students ({rate:.0f}/s)", file=sys.stderr)
+    
+    try:
+        counts = generator.generate(args.students, show_progress)
+        # Rebuild the indexes dropped above (no-op when appending)
+        db.run_migrations()
+    finally:
+        db.close()
+    
+    elapsed = time.perf_counter() - start
+    print(", ".join(f"{count} {name}" for name, count in counts.items()) + f" in {elapsed:.1f}s")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
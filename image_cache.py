@@ -0,0 +1,392 @@
+"""Shared image cache for the Student Management System
+
+Views display student photos and certificates as small thumbnails, and the
+same files are shown again and again (every visit to a profile, every
+refresh of a certificate list). Decoding a camera photo takes far longer
+than drawing it, so every CTkImage is created through this cache:
+
+    photo = ImageCache.shared().get_image(image_path, (150, 150))
+    ctk.CTkLabel(frame, image=photo, text="")
+
+Entries are keyed by (path, modification time, target size), so replacing
+a file on disk is picked up on its next use. The cache is an LRU bounded by
+the decoded size of the thumbnails it holds. Files in the student folders
+are decoded from their stored thumbnails (see thumbnail_store.py) rather
+than from the full-resolution originals. Faded logos for WatermarkWidget
+are cached the same way, per (path, size, opacity).
+
+Decoding does not touch Tk, so get_thumbnail() may be called from worker
+threads; get_image() wraps the thumbnail in a CTkImage and belongs on the
+Tk thread. Views showing many images at once use an ImageLoader, which
+decodes them on a shared thread pool and hands each CTkImage back on the
+Tk thread:
+
+    self.image_loader = ImageLoader(self)
+    self.image_loader.request(path, (350, 300), on_loaded=show, is_visible=on_screen)
+"""
+import os
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from PIL import Image
+from db_worker import deliver
+from preview_loader import REDUCING_GAP, load_preview
+from thumbnail_store import get_thumbnail_path
+
+
+DEFAULT_MAX_MB = 64
+DECODE_WORKERS = min(4, os.cpu_count() or 1)
+
+_decoder_pool = None
+_decoder_pool_lock = threading.Lock()
+
+
+def _image_bytes(img):
+    """Approximate memory used by a decoded image, in bytes"""
+    return img.width * img.height * len(img.getbands())
+
+
+def _render_watermark(path, size, opacity):
+    """Load an image as RGBA, stretched to size, with its alpha scaled by opacity"""
+    with Image.open(path) as img:
+        img = img.convert("RGBA")
+    if size:
+        img = img.resize(tuple(size), Image.Resampling.LANCZOS, reducing_gap=REDUCING_GAP)
+    
+    # One table lookup per pixel instead of arithmetic on the alpha values
+    alpha_table = [int(value * opacity) for value in range(256)]
+    img.putalpha(img.getchannel("A").point(alpha_table))
+    return img
+
+
+class _Entry:
+    """A cached image and the CTkImages made from it"""
+    
+    def __init__(self, image):
+        self.image = image
+        self.photos = {}  # display size -> CTkImage
+        self.size = _image_bytes(image)
+
+
+class ImageCache:
+    """LRU cache of decoded thumbnails, bounded by their decoded size"""
+    
+    _shared = None
+    _shared_lock = threading.Lock()
+    
+    def __init__(self, max_bytes=DEFAULT_MAX_MB * 1024 * 1024):
+        self.max_bytes = max_bytes
+        self._entries = OrderedDict()  # (path, mtime, size, variant) -> _Entry
+        self._lock = threading.Lock()
+        self.current_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+    
+    @classmethod
+    def shared(cls):
+        """
+        Get the cache shared by every view in the process
+        
+        Returns:
+            ImageCache instance
+        """
+        with cls._shared_lock:
+            if cls._shared is None:
+                cls._shared = cls()
+            return cls._shared
+    
+    def _key(self, path, size, variant):
+        """Build the cache key of a file at a target size"""
+        path = os.path.abspath(path)
+        return (path, os.stat(path).st_mtime_ns, tuple(size) if size else None, variant)
+    
+    def _lookup(self, key, count_miss=True):
+        """Get a cached entry and mark it recently used, or None"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                if count_miss:
+                    self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry
+    
+    def _store(self, key, entry):
+        """Add an entry, evicting the least recently used ones over budget"""
+        if entry.size > self.max_bytes:
+            return entry
+        
+        with self._lock:
+            existing = self._entries.get(key)
+            if existing is not None:
+                # Another thread decoded the same file first
+                self._entries.move_to_end(key)
+                return existing
+            
+            self._entries[key] = entry
+            self.current_bytes += entry.size
+            
+            while self.current_bytes > self.max_bytes and self._entries:
+                _, evicted = self._entries.popitem(last=False)
+                self.current_bytes -= evicted.size
+                self.evictions += 1
+            return entry
+    
+    def _load(self, path, size, resample):
+        """Decode an image file and shrink it to fit within size"""
+        # Files in the student folders have small stored copies to decode instead
+        source = get_thumbnail_path(path, size) or path
+        return load_preview(source, size, resample)
+    
+    def _get_entry(self, path, size, variant, render):
+        """Get the cache entry of a file, calling render() for its image on a miss"""
+        key = self._key(path, size, variant)
+        entry = self._lookup(key)
+        if entry is None:
+            entry = self._store(key, _Entry(render()))
+        return entry
+    
+    def _get_thumbnail_entry(self, path, size, resample):
+        """Get the cache entry of a file shrunk to fit within size"""
+        return self._get_entry(path, size, ("thumbnail", resample), lambda: self._load(path, size, resample))
+    
+    def get_thumbnail(self, path, size, resample=None):
+        """
+        Get a decoded image that fits within a target size
+        
+        Safe to call from any thread. The returned image is shared; copy it
+        before changing it.
+        
+        Args:
+            path: Image file path
+            size: (width, height) the image must fit within
+            resample: Optional PIL resampling filter (PIL's default if None)
+        
+        Returns:
+            PIL Image
+        
+        Raises:
+            OSError if the file is missing or cannot be decoded
+        """
+        return self._get_thumbnail_entry(path, size, resample).image
+    
+    def get_image(self, path, size, keep_aspect=False, resample=None):
+        """
+        Get a CTkImage of an image file, ready to put on a label
+        
+        Call this on the Tk thread.
+        
+        Args:
+            path: Image file path
+            size: (width, height) to display the image at
+            keep_aspect: Display at the thumbnail's own size (within size)
+                instead of stretching it to exactly size
+            resample: Optional PIL resampling filter (PIL's default if None)
+        
+        Returns:
+            customtkinter.CTkImage
+        
+        Raises:
+            OSError if the file is missing or cannot be decoded
+        """
+        return self._photo(self._get_thumbnail_entry(path, size, resample), size, keep_aspect)
+    
+    def get_cached_image(self, path, size, keep_aspect=False, resample=None):
+        """
+        Get a CTkImage only if the file is already decoded
+        
+        Call this on the Tk thread.
+        
+        Returns:
+            customtkinter.CTkImage, or None if the image is not cached (or
+            the file is missing)
+        """
+        try:
+            key = self._key(path, size, ("thumbnail", resample))
+        except OSError:
+            return None
+        entry = self._lookup(key, count_miss=False)
+        return self._photo(entry, size, keep_aspect) if entry is not None else None
+    
+    def get_watermark(self, path, size, opacity):
+        """
+        Get a CTkImage of an image with its transparency scaled, for watermarks
+        
+        Call this on the Tk thread.
+        
+        Args:
+            path: Image file path
+            size: (width, height) to stretch the image to, or None for its own size
+            opacity: 0.0 (invisible) to 1.0 (unchanged)
+        
+        Returns:
+            customtkinter.CTkImage
+        
+        Raises:
+            OSError if the file is missing or cannot be decoded
+        """
+        opacity = round(opacity, 3)
+        entry = self._get_entry(path, size, ("watermark", opacity), lambda: _render_watermark(path, size, opacity))
+        return self._photo(entry, size, keep_aspect=size is None)
+    
+    def _photo(self, entry, size, keep_aspect):
+        """Get the CTkImage of a cache entry at a display size"""
+        import customtkinter as ctk
+        
+        display_size = entry.image.size if keep_aspect else tuple(size)
+        photo = entry.photos.get(display_size)
+        if photo is None:
+            photo = ctk.CTkImage(light_image=entry.image, dark_image=entry.image, size=display_size)
+            entry.photos[display_size] = photo
+        return photo
+    
+    def invalidate(self, path):
+        """Drop every cached size of a file"""
+        path = os.path.abspath(path)
+        with self._lock:
+            for key in [key for key in self._entries if key[0] == path]:
+                self.current_bytes -= self._entries.pop(key).size
+    
+    def clear(self):
+        """Drop every cached image"""
+        with self._lock:
+            self._entries.clear()
+            self.current_bytes = 0
+    
+    def stats(self):
+        """
+        Get cache statistics for tuning
+        
+        Returns:
+            Dict with hits, misses, hit_rate, evictions, entries, bytes and max_bytes
+        """
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": self.hits / lookups if lookups else 0.0,
+                "evictions": self.evictions,
+                "entries": len(self._entries),
+                "bytes": self.current_bytes,
+                "max_bytes": self.max_bytes,
+            }
+
+
+def _get_decoder_pool():
+    """Get the thread pool shared by every ImageLoader"""
+    global _decoder_pool
+    with _decoder_pool_lock:
+        if _decoder_pool is None:
+            _decoder_pool = ThreadPoolExecutor(max_workers=DECODE_WORKERS, thread_name_prefix="image-decoder")
+        return _decoder_pool
+
+
+class _ImageRequest:
+    """An image waiting to be decoded for an ImageLoader"""
+    
+    def __init__(self, path, size, on_loaded, on_error, is_visible):
+        self.path = path
+        self.size = size
+        self.on_loaded = on_loaded
+        self.on_error = on_error
+        self.is_visible = is_visible
+
+
+class ImageLoader:
+    """
+    Decodes the images of one view in the background
+    
+    Requests are decoded on the shared pool a few at a time, so that the
+    ones on screen when a slot frees up can go first. Each decoded image is
+    handed to its on_loaded callback on the Tk thread. cancel() (or
+    destroying the widget) drops every request still waiting.
+    """
+    
+    def __init__(self, widget, cache=None, max_in_flight=DECODE_WORKERS):
+        """
+        Args:
+            widget: Tk widget of the view, used for after() scheduling
+            cache: ImageCache to decode through (the shared one by default)
+            max_in_flight: Decodes of this view running at the same time
+        """
+        self.widget = widget
+        self.cache = cache or ImageCache.shared()
+        self.max_in_flight = max_in_flight
+        self._waiting = []
+        self._running = set()  # Futures of decodes in progress
+        self._generation = 0
+    
+    def request(self, path, size, on_loaded, on_error=None, is_visible=None):
+        """
+        Load an image as a CTkImage displayed at size
+        
+        Call this on the Tk thread. Images that are already cached are
+        passed to on_loaded straight away.
+        
+        Args:
+            path: Image file path
+            size: (width, height) to display the image at
+            on_loaded: Callable(photo), run on the Tk thread
+            on_error: Optional callable(exception), run on the Tk thread
+            is_visible: Optional callable() telling whether the image is on
+                screen; visible requests are decoded first
+        """
+        photo = self.cache.get_cached_image(path, size)
+        if photo is not None:
+            on_loaded(photo)
+            return
+        
+        self._waiting.append(_ImageRequest(path, size, on_loaded, on_error, is_visible))
+        self._start_next()
+    
+    def cancel(self):
+        """Drop every request that has not been delivered yet"""
+        self._generation += 1
+        self._waiting.clear()
+        for future in self._running:
+            future.cancel()
+        self._running.clear()
+    
+    def _next_request(self):
+        """Take the first waiting request that is on screen, else the oldest one"""
+        for index, request in enumerate(self._waiting):
+            if request.is_visible is None or request.is_visible():
+                return self._waiting.pop(index)
+        return self._waiting.pop(0)
+    
+    def _start_next(self):
+        """Start decoding waiting requests while there are free slots"""
+        while self._waiting and len(self._running) < self.max_in_flight:
+            request = self._next_request()
+            future = _get_decoder_pool().submit(self.cache.get_thumbnail, request.path, request.size)
+            self._running.add(future)
+            
+            deliver(
+                self.widget, future,
+                lambda thumbnail, f=future, r=request, g=self._generation: self._finish(f, r, g, None),
+                lambda error, f=future, r=request, g=self._generation: self._finish(f, r, g, error)
+            )
+    
+    def _finish(self, future, request, generation, error):
+        """Hand a decoded image to its request and start the next decode (Tk thread)"""
+        if generation != self._generation:
+            return
+        self._running.discard(future)
+        self._start_next()
+        
+        if error is None:
+            try:
+                # The thumbnail was just cached, so this does not decode again
+                photo = self.cache.get_image(request.path, request.size)
+            except Exception as e:
+                error = e
+        
+        if error is None:
+            request.on_loaded(photo)
+        elif request.on_error:
+            request.on_error(error)
+        else:
+            print(f"Error loading image {request.path}: {error}")
@@ -15,8 +15,11 @@ class App(ctk.CTk):
         ctk.set_default_color_theme("blue")
         
         # Initialize database
-        db = Database()
-        db.initialize_database()
+        self.db = Database()
+        self.db.initialize_database()
+        
+        # Release database connections when the window is closed
+        self.protocol("WM_DELETE_WINDOW", self.on_close)
         
         # Configure grid
         self.grid_columnconfigure(0, weight=1)
@@ -68,7 +71,14 @@ class App(ctk.CTk):
     def on_logout(self):
         """Handle logout"""
         self.current_user = None
+        # Close pooled connections; they are reopened on next use
+        self.db.close()
         self.show_login()
+    
+    def on_close(self):
+        """Handle window close"""
+        self.db.close()
+        self.destroy()
 
 if __name__ == "__main__":
     app = App()
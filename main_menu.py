@@ -4,6 +4,7 @@ All views are now separated into individual files in the views/ directory
 """
 
 import customtkinter as ctk
+from collections import OrderedDict
 from database import Database
 from views import (
     HomeView,
@@ -19,6 +20,30 @@ from views import (
 )
 
 
+# Tables each section reads. A cached view is refreshed when it is shown
+# again after one of its tables has been written to, unless it applies
+# change events itself (views with live_updates = True).
+SECTION_TABLES = {
+    "Home": ("students", "exam_results", "certificates"),
+    "Add Student": (),
+    "Student Profiles": ("students", "student_notes"),
+    "Add Exam Results": ("students",),
+    "View Exam Results": ("exam_results", "students"),
+    "Add Certificates": ("students",),
+}
+
+MAX_CACHED_VIEWS = 4  # Sections kept alive (hidden) between visits
+
+
+class CachedView:
+    """A section view kept alive in its own host frame"""
+    
+    def __init__(self, host, view):
+        self.host = host
+        self.view = view
+        self.stale = False  # One of the section's tables changed since it loaded
+
+
 class MainMenu(ctk.CTkFrame):
     def __init__(self, parent, username, on_logout):
         super().__init__(parent)
@@ -31,11 +56,17 @@ class MainMenu(ctk.CTkFrame):
         
         # Database instance
         self.db = Database()
+        self.db.events.subscribe(self._on_data_changed, widget=self)
         
         # Track current student for detail/edit views
         self.current_student = None
         self.previous_section = None
         
+        # Section views kept alive between visits (least recently used first),
+        # and the host frame of the student detail/edit view on screen
+        self.view_cache = OrderedDict()
+        self.student_view_host = None
+        
         # Create sidebar
         self._create_sidebar()
         
@@ -111,35 +142,84 @@ class MainMenu(ctk.CTkFrame):
     
     def show_content(self, section):
         """Update main content area based on selected section"""
-        # Clear current content
-        for widget in self.content_frame.winfo_children():
-            widget.destroy()
+        self._hide_content()
+        
+        cached = self.view_cache.get(section)
+        if cached is not None and cached.stale:
+            # Data changed since the view was loaded
+            if hasattr(cached.view, "refresh"):
+                cached.stale = False
+                cached.view.refresh()
+            else:
+                self._evict_view(section)
+                cached = None
         
+        if cached is None:
+            host = ctk.CTkFrame(self.content_frame, fg_color="transparent", corner_radius=0)
+            cached = CachedView(host, self._create_view(section, host))
+            self.view_cache[section] = cached
+        
+        cached.host.grid(row=0, column=0, sticky="nsew")
+        self.view_cache.move_to_end(section)
+        
+        while len(self.view_cache) > MAX_CACHED_VIEWS:
+            self._evict_view(next(iter(self.view_cache)))
+    
+    def _create_view(self, section, host):
+        """Create the view of a section inside its host frame"""
         if section == "Home":
-            HomeView.create(self.content_frame, self.username, self.db)
+            return HomeView.create(host, self.username, self.db)
         elif section == "Add Student":
-            AddStudentView(self.content_frame, self.db)
+            return AddStudentView(host, self.db)
         elif section == "Student Profiles":
-            StudentProfilesView(self.content_frame, self.db, on_show_view=self._show_student_view)
+            return StudentProfilesView(host, self.db, on_show_view=self._show_student_view)
         elif section == "Add Exam Results":
-            AddExamResultsView(self.content_frame, self.db)
+            return AddExamResultsView(host, self.db)
         elif section == "View Exam Results":
-            ViewExamResultsView(self.content_frame, self.db)
+            return ViewExamResultsView(host, self.db)
         elif section == "Add Certificates":
-            AddCertificateView(self.content_frame, self.db)
+            return AddCertificateView(host, self.db)
+    
+    def _on_data_changed(self, event):
+        """Mark the cached views that read the changed table as stale"""
+        for section, cached in self.view_cache.items():
+            if getattr(cached.view, "live_updates", False):
+                continue
+            if event.table in SECTION_TABLES.get(section, ()):
+                cached.stale = True
+    
+    def _hide_content(self):
+        """Hide the cached section views and destroy any student view"""
+        for cached in self.view_cache.values():
+            cached.host.grid_remove()
+        
+        if self.student_view_host is not None:
+            self.student_view_host.destroy()
+            self.student_view_host = None
+    
+    def _evict_view(self, section):
+        """Destroy a cached section view"""
+        cached = self.view_cache.pop(section, None)
+        if cached is not None:
+            cached.host.destroy()
     
     def _show_student_view(self, view_name, student):
         """Show a specific student-related view"""
-        # Clear current content
-        for widget in self.content_frame.winfo_children():
-            widget.destroy()
+        self._hide_content()
+        
+        # Student views are not cached; they are destroyed when navigating away
+        self.student_view_host = ctk.CTkFrame(self.content_frame, fg_color="transparent", corner_radius=0)
+        self.student_view_host.grid(row=0, column=0, sticky="nsew")
+        self.student_view_host.grid_columnconfigure(0, weight=1)
+        self.student_view_host.grid_rowconfigure(0, weight=1)
+        parent = self.student_view_host
         
         self.current_student = student
         self.previous_section = "Student Profiles"
         
         if view_name == "Student Detail":
             view = StudentDetailView(
-                self.content_frame,
+                parent,
                 student,
                 self.db,
                 on_back=self._back_to_profiles,
@@ -150,7 +230,7 @@ class MainMenu(ctk.CTkFrame):
             view.grid(row=0, column=0, sticky="nsew")
         elif view_name == "Student Edit":
             view = StudentEditView(
-                self.content_frame,
+                parent,
                 student,
                 self.db,
                 on_back=self._back_to_profiles,
@@ -159,7 +239,7 @@ class MainMenu(ctk.CTkFrame):
             view.grid(row=0, column=0, sticky="nsew")
         elif view_name == "Student Exam Results":
             view = StudentExamResultsView(
-                self.content_frame,
+                parent,
                 student,
                 self.db,
                 on_back=self._back_to_profiles
@@ -167,7 +247,7 @@ class MainMenu(ctk.CTkFrame):
             view.grid(row=0, column=0, sticky="nsew")
         elif view_name == "Student Certificates":
             view = StudentCertificatesView(
-                self.content_frame,
+                parent,
                 student,
                 self.db,
                 on_back=self._back_to_profiles
@@ -0,0 +1,93 @@
+"""Fast decoding of images at preview size
+
+Photos and certificate scans are several megapixels, but they are only
+ever shown a few hundred pixels wide. load_preview() decodes them straight
+to about the size they are displayed at:
+
+    img = load_preview("students/Ann_Lee_5/profile.jpg", (150, 150))
+
+JPEG files are decoded at 1/2, 1/4 or 1/8 scale inside the decoder (Pillow's
+draft mode), images are then shrunk by a fast integer reduce(), and only
+the last step uses a high quality resampling filter. The EXIF
+orientation of phone photos is applied, so previews are upright.
+"""
+from PIL import Image
+
+
+ORIENTATION_TAG = 0x0112
+
+# EXIF orientation -> transpose that makes the image upright
+ORIENTATION_TRANSPOSE = {
+    2: Image.Transpose.FLIP_LEFT_RIGHT,
+    3: Image.Transpose.ROTATE_180,
+    4: Image.Transpose.FLIP_TOP_BOTTOM,
+    5: Image.Transpose.TRANSPOSE,
+    6: Image.Transpose.ROTATE_270,
+    7: Image.Transpose.TRANSVERSE,
+    8: Image.Transpose.ROTATE_90,
+}
+
+# reduce() stops while the image is still this many times the target size,
+# so the final resample has enough pixels to look smooth
+REDUCING_GAP = 2.0
+
+
+def _orientation(img):
+    """Get the EXIF orientation of an image (1 when missing or unreadable)"""
+    try:
+        return img.getexif().get(ORIENTATION_TAG, 1)
+    except Exception:
+        return 1
+
+
+def load_preview(path, size, resample=None):
+    """
+    Decode an image file to fit within a target size
+    
+    Args:
+        path: Image file path
+        size: (width, height) the upright image must fit within
+        resample: Optional PIL resampling filter (PIL's default if None)
+    
+    Returns:
+        PIL Image in L, RGB or RGBA mode, detached from the file
+    
+    Raises:
+        OSError if the file is missing or cannot be decoded
+    """
+    with Image.open(path) as img:
+        orientation = _orientation(img)
+        transpose = ORIENTATION_TRANSPOSE.get(orientation)
+        
+        # The stored pixels of a photo taken sideways are rotated by 90 degrees
+        box = tuple(size)
+        if orientation in (5, 6, 7, 8):
+            box = (box[1], box[0])
+        
+        # JPEG: let the decoder scale by 1/2, 1/4 or 1/8 in the DCT, to the
+        # smallest scale that still covers the box. DCT scaling averages
+        # whole blocks, so it needs no extra headroom. Other formats ignore this.
+        img.draft(None, box)
+        
+        # Palette images only resize with nearest-neighbour, so expand them first
+        if img.mode == "P":
+            preview = img.convert("RGBA" if "transparency" in img.info else "RGB")
+        elif img.mode == "1":
+            preview = img.convert("L")
+        else:
+            preview = img
+        
+        # thumbnail() shrinks by an integer factor with reduce() while the
+        # image is more than REDUCING_GAP times the box, then resamples
+        if resample is None:
+            preview.thumbnail(box, reducing_gap=REDUCING_GAP)
+        else:
+            preview.thumbnail(box, resample, reducing_gap=REDUCING_GAP)
+        
+        if transpose is not None:
+            preview = preview.transpose(transpose)
+        if preview.mode not in ("L", "RGB", "RGBA"):
+            preview = preview.convert("RGBA" if "A" in preview.getbands() else "RGB")
+        
+        # Detach the pixels from the file before it is closed
+        return preview.copy() if preview is img else preview
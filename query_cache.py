@@ -0,0 +1,243 @@
+"""In-process query result cache for the Student Management System
+
+Read methods of Database are wrapped with @cached(tables...) and write
+methods with @invalidates(tables...). Each table has a generation counter;
+a write bumps the counters of the tables it touches, and a cached result
+is only returned while the generations it was stored under are unchanged.
+
+The cache is an LRU bounded by an approximate memory budget, configured in
+the database config file (see db_config.py):
+
+    {"query_cache_mb": 32}
+
+A value of 0 disables caching.
+"""
+import functools
+import sys
+import threading
+from collections import OrderedDict
+from db_config import load_config
+
+
+DEFAULT_MAX_MB = 32
+
+
+def _estimate_size(value):
+    """Approximate memory used by a query result, in bytes"""
+    size = sys.getsizeof(value)
+    if isinstance(value, (list, tuple)):
+        size += sum(_estimate_size(item) for item in value)
+    elif isinstance(value, dict):
+        size += sum(_estimate_size(k) + _estimate_size(v) for k, v in value.items())
+    return size
+
+
+def _freeze(value):
+    """Turn method arguments into a hashable cache key"""
+    if isinstance(value, dict):
+        return tuple(sorted((k, _freeze(v)) for k, v in value.items()))
+    if isinstance(value, (list, tuple)):
+        return tuple(_freeze(v) for v in value)
+    return value
+
+
+def _copy_result(value):
+    """
+    Copy the containers of a cached result
+    
+    Rows are tuples and safe to share, but callers may sort or append to
+    the list they get back, which must not change the cached copy.
+    """
+    if isinstance(value, list):
+        return list(value)
+    if isinstance(value, dict):
+        return {k: _copy_result(v) for k, v in value.items()}
+    return value
+
+
+class QueryCache:
+    """LRU cache of query results, invalidated per table"""
+    
+    _caches = {}
+    _caches_lock = threading.Lock()
+    
+    def __init__(self, max_bytes=DEFAULT_MAX_MB * 1024 * 1024):
+        self.max_bytes = max_bytes
+        self._entries = OrderedDict()  # key -> (generations, value, size)
+        self._generations = {}  # table -> write generation
+        self._lock = threading.Lock()
+        self.current_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+    
+    @classmethod
+    def for_database(cls, db_name):
+        """
+        Get the shared cache for a database file
+        
+        Args:
+            db_name: Path to the SQLite database file
+        
+        Returns:
+            QueryCache instance
+        """
+        with cls._caches_lock:
+            cache = cls._caches.get(db_name)
+            if cache is None:
+                max_mb = load_config(db_name).get("query_cache_mb", DEFAULT_MAX_MB)
+                if not isinstance(max_mb, (int, float)) or max_mb < 0:
+                    print(f"Ignoring invalid query_cache_mb={max_mb!r}")
+                    max_mb = DEFAULT_MAX_MB
+                cache = cls(int(max_mb * 1024 * 1024))
+                cls._caches[db_name] = cache
+            return cache
+    
+    @property
+    def enabled(self):
+        """Whether results are being cached at all"""
+        return self.max_bytes > 0
+    
+    def generation(self, tables):
+        """
+        Get the current write generations of some tables
+        
+        Args:
+            tables: Iterable of table names
+        
+        Returns:
+            Tuple of generation numbers, one per table; it changes whenever
+            any of the tables is written to
+        """
+        with self._lock:
+            return tuple(self._generations.get(table, 0) for table in tables)
+    
+    def get(self, key, tables):
+        """
+        Look up a cached result
+        
+        Returns:
+            (True, value) on a hit or (False, None) on a miss
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                generations, value, size = entry
+                if generations == tuple(self._generations.get(table, 0) for table in tables):
+                    self._entries.move_to_end(key)
+                    self.hits += 1
+                    return True, value
+                # Stale: a table was written since the result was stored
+                del self._entries[key]
+                self.current_bytes -= size
+            self.misses += 1
+            return False, None
+    
+    def put(self, key, generations, value):
+        """
+        Store a result
+        
+        Args:
+            key: Cache key
+            generations: Table generations read before the query ran
+            value: Query result
+        """
+        size = _estimate_size(value)
+        if size > self.max_bytes:
+            return
+        
+        with self._lock:
+            old = self._entries.pop(key, None)
+            if old is not None:
+                self.current_bytes -= old[2]
+            
+            self._entries[key] = (generations, value, size)
+            self.current_bytes += size
+            
+            while self.current_bytes > self.max_bytes and self._entries:
+                _, (_, _, evicted_size) = self._entries.popitem(last=False)
+                self.current_bytes -= evicted_size
+                self.evictions += 1
+    
+    def invalidate(self, *tables):
+        """Mark every cached result that read from these tables as stale"""
+        with self._lock:
+            for table in tables:
+                self._generations[table] = self._generations.get(table, 0) + 1
+    
+    def clear(self):
+        """Drop every cached result (generations keep counting)"""
+        with self._lock:
+            self._entries.clear()
+            self.current_bytes = 0
+    
+    def stats(self):
+        """
+        Get cache statistics for tuning
+        
+        Returns:
+            Dict with hits, misses, hit_rate, evictions, entries, bytes and max_bytes
+        """
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": self.hits / lookups if lookups else 0.0,
+                "evictions": self.evictions,
+                "entries": len(self._entries),
+                "bytes": self.current_bytes,
+                "max_bytes": self.max_bytes,
+            }
+
+
+def cached(*tables):
+    """
+    Cache the result of a Database read method
+    
+    Args:
+        tables: Tables the method reads from
+    """
+    def decorator(method):
+        @functools.wraps(method)
+        def wrapper(self, *args, **kwargs):
+            cache = self.query_cache
+            if not cache.enabled:
+                return method(self, *args, **kwargs)
+            
+            key = (method.__name__, _freeze(args), _freeze(kwargs))
+            try:
+                hash(key)
+            except TypeError:
+                return method(self, *args, **kwargs)
+            
+            hit, value = cache.get(key, tables)
+            if hit:
+                return _copy_result(value)
+            
+            # Read the generations before querying, so a write that lands
+            # while the query runs leaves the stored result already stale
+            generations = cache.generation(tables)
+            value = method(self, *args, **kwargs)
+            cache.put(key, generations, value)
+            return _copy_result(value)
+        return wrapper
+    return decorator
+
+
+def invalidates(*tables):
+    """
+    Invalidate cached results after a Database write method runs
+    
+    Args:
+        tables: Tables the method writes to
+    """
+    def decorator(method):
+        @functools.wraps(method)
+        def wrapper(self, *args, **kwargs):
+            try:
+                return method(self, *args, **kwargs)
+            finally:
+                self.query_cache.invalidate(*tables)
+        return wrapper
+    return decorator
@@ -0,0 +1,387 @@
+"""Query timing instrumentation for the Student Management System
+
+Every public Database method is timed (wall clock, including query cache
+hits) and its row count recorded. Per method we keep totals plus a rolling
+window of the most recent durations, from which a latency histogram and
+percentiles are computed.
+
+SQL statements are captured with the connection trace callback (SQLite
+expands the bound parameters into the text). When a call is slower than
+the threshold, an entry with the types and sizes of the method arguments,
+the SQL with its literal values replaced by ?, and the EXPLAIN QUERY PLAN
+of each SELECT is appended to the slow-query log, <database name>.slow.log.
+Argument values never reach the log, and methods handling credentials are
+not timed at all (see @untimed).
+
+Methods returning a generator are timed while the rows are consumed, one
+step at a time, and recorded when the generator is exhausted or closed.
+
+Settings in the database config file (see db_config.py):
+
+    {
+        "slow_query_ms": 200,
+        "query_stats_file": "query_stats.json"
+    }
+
+When "query_stats_file" is set, the statistics are written to it as JSON
+when the application exits.
+"""
+import atexit
+import functools
+import inspect
+import json
+import os
+import re
+import threading
+import time
+from collections import deque
+from datetime import datetime
+from db_config import load_config
+
+
+DEFAULT_SLOW_QUERY_MS = 200
+WINDOW_SIZE = 1000  # Durations kept per method for the rolling histogram
+
+# Histogram bucket upper bounds in milliseconds (the last bucket is open)
+HISTOGRAM_BUCKETS_MS = [1, 5, 10, 25, 50, 100, 250, 500, 1000]
+
+_local = threading.local()
+
+
+def _percentile(sorted_values, fraction):
+    """Nearest-rank percentile of an already sorted list"""
+    if not sorted_values:
+        return 0.0
+    index = min(len(sorted_values) - 1, max(0, round(fraction * len(sorted_values)) - 1))
+    return sorted_values[index]
+
+
+def _count_rows(result):
+    """Number of rows in a method result, or None when it is not a row list"""
+    if isinstance(result, list):
+        return len(result)
+    return None
+
+
+class MethodStats:
+    """Timing totals and a rolling window for one Database method"""
+    
+    def __init__(self):
+        self.calls = 0
+        self.errors = 0
+        self.total_ms = 0.0
+        self.max_ms = 0.0
+        self.rows = 0
+        self.window = deque(maxlen=WINDOW_SIZE)
+    
+    def record(self, elapsed_ms, rows, failed):
+        """Add one call"""
+        self.calls += 1
+        self.total_ms += elapsed_ms
+        self.max_ms = max(self.max_ms, elapsed_ms)
+        if rows:
+            self.rows += rows
+        if failed:
+            self.errors += 1
+        self.window.append(elapsed_ms)
+    
+    def to_dict(self):
+        """Summary of the method's timings"""
+        recent = sorted(self.window)
+        histogram = {}
+        for bound in HISTOGRAM_BUCKETS_MS:
+            histogram[f"<={bound}ms"] = 0
+        histogram[f">{HISTOGRAM_BUCKETS_MS[-1]}ms"] = 0
+        
+        for value in recent:
+            for bound in HISTOGRAM_BUCKETS_MS:
+                if value <= bound:
+                    histogram[f"<={bound}ms"] += 1
+                    break
+            else:
+                histogram[f">{HISTOGRAM_BUCKETS_MS[-1]}ms"] += 1
+        
+        return {
+            "calls": self.calls,
+            "errors": self.errors,
+            "rows": self.rows,
+            "total_ms": round(self.total_ms, 3),
+            "mean_ms": round(self.total_ms / self.calls, 3) if self.calls else 0.0,
+            "max_ms": round(self.max_ms, 3),
+            "p50_ms": round(_percentile(recent, 0.50), 3),
+            "p95_ms": round(_percentile(recent, 0.95), 3),
+            "p99_ms": round(_percentile(recent, 0.99), 3),
+            "histogram": histogram,
+        }
+
+
+class QueryStats:
+    """Per-method timing statistics and the slow-query log for a database"""
+    
+    _registry = {}
+    _registry_lock = threading.Lock()
+    
+    def __init__(self, db_name, slow_query_ms=DEFAULT_SLOW_QUERY_MS, stats_file=None):
+        self.db_name = db_name
+        self.slow_query_ms = slow_query_ms
+        self.stats_file = stats_file
+        self.slow_log_path = None if db_name == ":memory:" else os.path.splitext(db_name)[0] + ".slow.log"
+        self.started_at = datetime.now().isoformat(timespec="seconds")
+        self._methods = {}
+        self._lock = threading.Lock()
+        self._log_lock = threading.Lock()
+    
+    @classmethod
+    def for_database(cls, db_name):
+        """
+        Get the shared statistics for a database file
+        
+        Args:
+            db_name: Path to the SQLite database file
+        
+        Returns:
+            QueryStats instance
+        """
+        with cls._registry_lock:
+            stats = cls._registry.get(db_name)
+            if stats is None:
+                config = load_config(db_name)
+                slow_query_ms = config.get("slow_query_ms", DEFAULT_SLOW_QUERY_MS)
+                if not isinstance(slow_query_ms, (int, float)) or slow_query_ms < 0:
+                    print(f"Ignoring invalid slow_query_ms={slow_query_ms!r}")
+                    slow_query_ms = DEFAULT_SLOW_QUERY_MS
+                
+                stats = cls(db_name, slow_query_ms, config.get("query_stats_file"))
+                cls._registry[db_name] = stats
+                if stats.stats_file:
+                    atexit.register(stats.dump, stats.stats_file)
+            return stats
+    
+    def record(self, method_name, elapsed_ms, rows, failed=False):
+        """Record one call of a Database method"""
+        with self._lock:
+            method_stats = self._methods.get(method_name)
+            if method_stats is None:
+                method_stats = self._methods[method_name] = MethodStats()
+            method_stats.record(elapsed_ms, rows, failed)
+    
+    def snapshot(self):
+        """
+        Get the statistics of every method
+        
+        Returns:
+            Dict of method name -> calls, errors, rows, total/mean/max and
+            p50/p95/p99 milliseconds, and a histogram of recent calls
+        """
+        with self._lock:
+            return {name: stats.to_dict() for name, stats in sorted(self._methods.items())}
+    
+    def reset(self):
+        """Forget every recorded call"""
+        with self._lock:
+            self._methods.clear()
+    
+    def dump(self, path):
+        """
+        Write the statistics to a JSON file
+        
+        Args:
+            path: Destination file path
+        """
+        report = {
+            "database": self.db_name,
+            "started_at": self.started_at,
+            "dumped_at": datetime.now().isoformat(timespec="seconds"),
+            "slow_query_ms": self.slow_query_ms,
+            "methods": self.snapshot(),
+        }
+        try:
+            with open(path, "w", encoding="utf-8") as f:
+                json.dump(report, f, indent=2)
+        except OSError as e:
+            print(f"Error writing query stats to {path}: {e}")
+    
+    def log_slow_call(self, method_name, args, kwargs, elapsed_ms, statements, plans):
+        """Append a slow call to the slow-query log"""
+        if not self.slow_log_path:
+            return
+        
+        lines = [
+            f"[{datetime.now().isoformat(timespec='seconds')}] {method_name} took {elapsed_ms:.1f} ms",
+            f"  arguments: {_format_arguments(args, kwargs)}",
+        ]
+        for sql in statements:
+            lines.append(f"  sql: {' '.join(redact_sql(sql).split())}")
+            for plan_line in plans.get(sql, []):
+                lines.append(f"    plan: {plan_line}")
+        
+        try:
+            with self._log_lock:
+                with open(self.slow_log_path, "a", encoding="utf-8") as f:
+                    f.write("\n".join(lines) + "\n\n")
+        except OSError as e:
+            print(f"Error writing slow query log: {e}")
+
+
+def _describe(value):
+    """Type (and length) of a value, without the value itself"""
+    if value is None or isinstance(value, bool):
+        return repr(value)
+    if isinstance(value, (str, bytes, list, tuple, dict, set)):
+        return f"{type(value).__name__}[{len(value)}]"
+    return type(value).__name__
+
+
+def _format_arguments(args, kwargs):
+    """Short description of a method's arguments for the log"""
+    parts = [_describe(arg) for arg in args]
+    parts += [f"{key}={_describe(value)}" for key, value in kwargs.items()]
+    return ", ".join(parts)
+
+
+# String and blob literals, then numbers outside identifiers
+_SQL_LITERAL = re.compile(r"[xX]?'(?:[^']|'')*'|(?<![\w.])-?\d+(?:\.\d+)?(?:[eE][-+]?\d+)?(?![\w.])")
+
+
+def redact_sql(sql):
+    """Replace the literal values in a statement with ?"""
+    return _SQL_LITERAL.sub("?", sql)
+
+
+def trace_statement(sql):
+    """
+    Connection trace callback: capture SQL run inside a timed method
+    
+    Installed on every connection by ConnectionManager.
+    """
+    frames = getattr(_local, "frames", None)
+    if frames and not getattr(_local, "suspended", False):
+        frames[-1].append(sql)
+
+
+def _explain(conn, statements):
+    """Get the EXPLAIN QUERY PLAN lines of each SELECT statement"""
+    plans = {}
+    _local.suspended = True
+    try:
+        for sql in statements:
+            if not sql.lstrip().upper().startswith(("SELECT", "WITH")) or sql in plans:
+                continue
+            try:
+                rows = conn.execute(f"EXPLAIN QUERY PLAN {sql}").fetchall()
+                plans[sql] = [row[-1] for row in rows]
+            except Exception as e:
+                plans[sql] = [f"(unavailable: {e})"]
+    finally:
+        _local.suspended = False
+    return plans
+
+
+def _frames():
+    """Get this thread's stack of statement lists, one per timed call in progress"""
+    frames = getattr(_local, "frames", None)
+    if frames is None:
+        frames = _local.frames = []
+    return frames
+
+
+def _finish_call(db, method_name, args, kwargs, elapsed_ms, statements, rows, failed):
+    """Record a finished call and log it when it is slow"""
+    stats = db.query_stats
+    stats.record(method_name, elapsed_ms, rows, failed)
+    
+    # Only log the outermost slow call, once
+    if elapsed_ms >= stats.slow_query_ms and not _frames():
+        try:
+            plans = _explain(db.connect(), statements)
+        except Exception:
+            plans = {}
+        stats.log_slow_call(method_name, args, kwargs, elapsed_ms, statements, plans)
+
+
+def _timed_rows(db, method_name, generator, args, kwargs, elapsed_ms, statements):
+    """
+    Time a generator returned by a Database method while it is consumed
+    
+    Only the time spent producing rows counts, not the caller's work
+    between them. The call is recorded once the generator is exhausted,
+    fails or is closed.
+    """
+    rows = 0
+    failed = False
+    try:
+        while True:
+            frames = _frames()
+            frames.append([])
+            start = time.perf_counter()
+            try:
+                row = next(generator)
+            except StopIteration:
+                return
+            except BaseException:
+                failed = True
+                raise
+            finally:
+                elapsed_ms += (time.perf_counter() - start) * 1000
+                step = frames.pop()
+                statements.extend(step)
+                if frames:
+                    frames[-1].extend(step)
+            rows += 1
+            yield row
+    finally:
+        generator.close()
+        _finish_call(db, method_name, args, kwargs, elapsed_ms, statements, rows, failed)
+
+
+def timed(method):
+    """Time a Database method and log it when it is slow"""
+    @functools.wraps(method)
+    def wrapper(self, *args, **kwargs):
+        frames = _frames()
+        frames.append([])
+        
+        failed = False
+        result = None
+        start = time.perf_counter()
+        try:
+            result = method(self, *args, **kwargs)
+        except BaseException:
+            failed = True
+            raise
+        finally:
+            elapsed_ms = (time.perf_counter() - start) * 1000
+            statements = frames.pop()
+            if frames:
+                # Nested call: the outer method ran these statements too
+                frames[-1].extend(statements)
+            
+            if failed or not inspect.isgenerator(result):
+                _finish_call(self, method.__name__, args, kwargs, elapsed_ms, statements,
+                             _count_rows(result), failed)
+        
+        if inspect.isgenerator(result):
+            # The rows are only read as the caller iterates
+            return _timed_rows(self, method.__name__, result, args, kwargs, elapsed_ms, statements)
+        return result
+    return wrapper
+
+
+def untimed(method):
+    """Exclude a public Database method from instrument()"""
+    method._untimed = True
+    return method
+
+
+def instrument(cls):
+    """
+    Class decorator: time every public method of a Database class
+    
+    Properties, static methods, class methods and methods marked with
+    @untimed are left alone.
+    """
+    for name, attr in list(vars(cls).items()):
+        if name.startswith("_") or not inspect.isfunction(attr) or getattr(attr, "_untimed", False):
+            continue
+        setattr(cls, name, timed(attr))
+    return cls
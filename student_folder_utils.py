@@ -1,7 +1,9 @@
 """Utility functions for managing student folder structure"""
 import os
-import shutil
+import threading
 from datetime import datetime
+from blob_store import remove_file, store_file
+from thumbnail_store import generate_thumbnails, remove_thumbnails
 
 
 def get_student_folder_name(student_name, student_id):
@@ -58,7 +60,7 @@ def ensure_student_folder_exists(student_name, student_id):
     return folder_path
 
 
-def save_student_profile_image(image_path, student_name, student_id):
+def save_student_profile_image(image_path, student_name, student_id, max_size=None):
     """
     Save a student's profile image to their folder
     
@@ -66,6 +68,8 @@ def save_student_profile_image(image_path, student_name, student_id):
         image_path: Path to the source image file
         student_name: Student's full name
         student_id: Student's database ID
+        max_size: Optional longest side in pixels; larger images are scaled
+                  down instead of being copied as-is
     
     Returns:
         Path to saved image file, or None if error
@@ -84,15 +88,54 @@ def save_student_profile_image(image_path, student_name, student_id):
         # Full destination path
         dest_path = os.path.join(folder_path, filename)
         
-        # Copy the file
-        shutil.copy2(image_path, dest_path)
+        if max_size:
+            digest = _save_resized_image(image_path, dest_path, max_size)
+        else:
+            # Copy the file (shared with any identical file already stored)
+            digest = store_file(image_path, dest_path)
         
+        generate_thumbnails(dest_path, digest=digest)
         return dest_path
     except Exception as e:
         print(f"Error saving profile image: {e}")
         return None
 
 
+def _save_resized_image(image_path, dest_path, max_size):
+    """
+    Save a copy of an image whose longest side is at most max_size pixels
+    
+    Images that are already small enough are copied unchanged.
+    
+    Returns:
+        SHA-256 of the saved file
+    """
+    from PIL import Image
+    from preview_loader import load_preview
+    
+    with Image.open(image_path) as img:
+        small_enough = max(img.size) <= max_size
+    if small_enough:
+        return store_file(image_path, dest_path)
+    
+    # Decoded at reduced size and turned upright, since the EXIF
+    # orientation is not carried over to the copy
+    img = load_preview(image_path, (max_size, max_size))
+    ext = os.path.splitext(dest_path)[1].lower()
+    if img.mode not in ("RGB", "L") and ext in (".jpg", ".jpeg"):
+        img = img.convert("RGB")
+    
+    # dest_path may already be a link to a stored blob shared with other
+    # files, so never write into it: save aside and link the result in
+    temp_path = f"{dest_path}.{threading.get_ident()}.resized.tmp"
+    try:
+        img.save(temp_path, Image.registered_extensions().get(ext))
+        return store_file(temp_path, dest_path)
+    finally:
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+
+
 def save_student_certificate(cert_path, student_name, student_id, cert_note=""):
     """
     Save a student's certificate to their folder
@@ -130,9 +173,10 @@ def save_student_certificate(cert_path, student_name, student_id, cert_note=""):
         # Full destination path
         dest_path = os.path.join(folder_path, filename)
         
-        # Copy the file
-        shutil.copy2(cert_path, dest_path)
+        # Copy the file (shared with any identical file already stored)
+        digest = store_file(cert_path, dest_path)
         
+        generate_thumbnails(dest_path, digest=digest)
         return dest_path
     except Exception as e:
         print(f"Error saving certificate: {e}")
@@ -143,6 +187,8 @@ def delete_student_file(file_path):
     """
     Delete a student file (image or certificate)
     
+    The stored content is released once no other student file shares it.
+    
     Args:
         file_path: Path to the file to delete
     
@@ -151,9 +197,37 @@ def delete_student_file(file_path):
     """
     try:
         if file_path and os.path.exists(file_path):
-            os.remove(file_path)
+            remove_thumbnails(file_path)
+            remove_file(file_path)
             return True
         return False
     except Exception as e:
         print(f"Error deleting file: {e}")
         return False
+
+
+def delete_student_and_files(db, student_id, image_path=None):
+    """
+    Delete a student's record together with every file they own
+    
+    Their profile photo and certificate files are released like any other
+    deleted student file, so stored content shared with other students is
+    kept until the last file using it is gone.
+    
+    Args:
+        db: Database instance
+        student_id: Student's database ID
+        image_path: Optional path of the student's profile photo
+    
+    Returns:
+        (success, message) from Database.delete_student
+    """
+    # The certificate rows go with the student, so read their paths first
+    certificate_paths = [cert[2] for cert in db.get_certificates_by_student(student_id)]
+    
+    success, message = db.delete_student(student_id)
+    if success:
+        for file_path in [image_path] + certificate_paths:
+            if file_path:
+                delete_student_file(file_path)
+    return success, message
@@ -0,0 +1,75 @@
+"""Tests for deleting students and the files they share through the blob store"""
+import os
+import pytest
+from blob_store import file_sha256, get_blob_path
+from database import Database
+from student_folder_utils import (delete_student_and_files, save_student_certificate,
+                                  save_student_profile_image)
+
+
+@pytest.fixture
+def db(tmp_path, monkeypatch):
+    """A fresh database, with the student folders under a temporary directory"""
+    monkeypatch.chdir(tmp_path)
+    database = Database(str(tmp_path / "test.db"))
+    database.initialize_database()
+    yield database
+    database.close()
+
+
+def _add_student(db, name):
+    """Add a student and return their ID"""
+    success, student_id = db.add_student(
+        (name, "2010-01-01", "Female", "1 Main Street", "Guardian", "200012345678",
+         "0771234567", None, "2024-01-10", "Grade 8")
+    )
+    assert success
+    return student_id
+
+
+def _add_certificate(db, source_path, name, student_id):
+    """Save a certificate file for a student and record it"""
+    path = save_student_certificate(source_path, name, student_id, "Sports Meet")
+    assert path is not None
+    assert db.add_certificate(student_id, path, "Sports Meet")[0]
+    return path
+
+
+def test_shared_certificate_blob_freed_with_last_student(db, tmp_path):
+    source_path = tmp_path / "certificate.pdf"
+    source_path.write_bytes(b"%PDF-1.4 the same scan uploaded for two students")
+    blob_path = get_blob_path(file_sha256(source_path))
+    
+    first_id = _add_student(db, "Ann Lee")
+    second_id = _add_student(db, "Ben Lee")
+    first_path = _add_certificate(db, source_path, "Ann Lee", first_id)
+    second_path = _add_certificate(db, source_path, "Ben Lee", second_id)
+    
+    # One blob, linked from both student folders
+    assert os.stat(blob_path).st_nlink == 3
+    
+    assert delete_student_and_files(db, first_id)[0]
+    assert not os.path.exists(first_path)
+    assert os.path.exists(blob_path)
+    assert os.stat(second_path).st_nlink == 2
+    
+    assert delete_student_and_files(db, second_id)[0]
+    assert not os.path.exists(second_path)
+    assert not os.path.exists(blob_path)
+
+
+def test_photo_and_certificates_deleted_with_student(db, tmp_path):
+    source_path = tmp_path / "certificate.pdf"
+    source_path.write_bytes(b"%PDF-1.4 a certificate")
+    photo_source = tmp_path / "photo.raw"
+    photo_source.write_bytes(b"not decoded by the store")
+    
+    student_id = _add_student(db, "Ann Lee")
+    certificate_path = _add_certificate(db, source_path, "Ann Lee", student_id)
+    photo_path = save_student_profile_image(str(photo_source), "Ann Lee", student_id)
+    
+    assert delete_student_and_files(db, student_id, photo_path)[0]
+    assert not os.path.exists(certificate_path)
+    assert not os.path.exists(photo_path)
+    assert db.get_certificates_by_student(student_id) == []
+    assert not any(files for _, _, files in os.walk(tmp_path / "students" / ".blobs"))
@@ -0,0 +1,323 @@
+"""Stored thumbnails for the files in the student folders
+
+Profile photos and certificates are kept at full resolution, but the views
+only ever show them as small previews. The standard preview sizes are
+generated once, when a file is saved, into a .thumbs folder next to it:
+
+    students/<StudentName_StudentID>/.thumbs/<content hash>_150x150.png
+
+Thumbnails are named after the SHA-256 of the original's content, so a
+replaced file never shows a stale preview. .thumbs/index.json remembers the
+hash of each original together with its size and modification time, so
+the originals only need hashing again when they change.
+
+Missing thumbnails are generated on first use. Files saved before
+thumbnails existed can be backfilled from the command line:
+
+    python thumbnail_store.py [--root students] [--workers 4]
+"""
+import argparse
+import json
+import os
+import sys
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from blob_store import file_sha256
+
+
+STUDENTS_ROOT = "students"
+THUMBS_DIR = ".thumbs"
+INDEX_FILE = "index.json"
+
+# Certificate cards, profile photos and the certificate gallery
+THUMBNAIL_SIZES = ((60, 60), (150, 150), (350, 300))
+
+IMAGE_EXTENSIONS = ('.jpg', '.jpeg', '.png', '.gif', '.bmp')
+HASH_NAME_LENGTH = 32  # Hex digits of the content hash used in thumbnail names
+
+_index_lock = threading.Lock()
+
+
+def is_student_file(path):
+    """Whether a path is a file inside the student folders (not a thumbnail or blob)"""
+    path = os.path.abspath(path)
+    root = os.path.abspath(STUDENTS_ROOT)
+    parts = path[len(root) + 1:].split(os.sep)
+    return path.startswith(root + os.sep) and not any(part.startswith(".") for part in parts)
+
+
+def _thumbs_folder(path):
+    """Get the .thumbs folder that holds the thumbnails of a file"""
+    return os.path.join(os.path.dirname(path), THUMBS_DIR)
+
+
+def _thumbnail_name(digest, size):
+    """Get the file name of a thumbnail"""
+    return f"{digest[:HASH_NAME_LENGTH]}_{size[0]}x{size[1]}.png"
+
+
+def _load_index(thumbs_folder):
+    """Read the hash index of a .thumbs folder (empty if missing or unreadable)"""
+    try:
+        with open(os.path.join(thumbs_folder, INDEX_FILE), "r", encoding="utf-8") as f:
+            index = json.load(f)
+        return index if isinstance(index, dict) else {}
+    except (OSError, ValueError):
+        return {}
+
+
+def _save_index(thumbs_folder, index):
+    """Write the hash index of a .thumbs folder"""
+    index_path = os.path.join(thumbs_folder, INDEX_FILE)
+    temp_path = index_path + ".tmp"
+    with open(temp_path, "w", encoding="utf-8") as f:
+        json.dump(index, f, indent=1, sort_keys=True)
+    os.replace(temp_path, index_path)
+
+
+def _content_hash(path, digest=None):
+    """
+    Get the SHA-256 of a student file, from the index while the file is unchanged
+    
+    Args:
+        path: Student file
+        digest: Hash already known to the caller, recorded without reading the file
+    """
+    thumbs_folder = _thumbs_folder(path)
+    name = os.path.basename(path)
+    stat = os.stat(path)
+    
+    with _index_lock:
+        entry = _load_index(thumbs_folder).get(name)
+    if entry and entry.get("mtime_ns") == stat.st_mtime_ns and entry.get("size") == stat.st_size:
+        if digest is None or digest == entry["sha256"]:
+            return entry["sha256"]
+    
+    if digest is None:
+        digest = file_sha256(path)
+    with _index_lock:
+        os.makedirs(thumbs_folder, exist_ok=True)
+        index = _load_index(thumbs_folder)
+        index[name] = {"sha256": digest, "mtime_ns": stat.st_mtime_ns, "size": stat.st_size}
+        _save_index(thumbs_folder, index)
+    return digest
+
+
+def _render_thumbnails(path, targets):
+    """
+    Decode an image once and save it at several sizes
+    
+    Args:
+        path: Original image file
+        targets: Dict of (width, height) -> thumbnail path
+    """
+    from preview_loader import load_preview
+    
+    # Largest first: each smaller thumbnail is shrunk from the previous one
+    sizes = sorted(targets, key=lambda s: s[0] * s[1], reverse=True)
+    img = load_preview(path, sizes[0])
+    for size in sizes:
+        img.thumbnail(size)
+        dest_path = targets[size]
+        # Another thread may be rendering the same thumbnail
+        temp_path = f"{dest_path}.{threading.get_ident()}.tmp"
+        img.save(temp_path, "PNG")
+        os.replace(temp_path, dest_path)
+
+
+def _ensure_thumbnails(path, force=False, digest=None):
+    """
+    Create whichever standard thumbnails of a file are missing
+    
+    Returns:
+        (dict of size -> thumbnail path, number of thumbnails created)
+    """
+    digest = _content_hash(path, digest)
+    thumbs_folder = _thumbs_folder(path)
+    paths = {size: os.path.join(thumbs_folder, _thumbnail_name(digest, size)) for size in THUMBNAIL_SIZES}
+    
+    missing = {size: thumb for size, thumb in paths.items() if force or not os.path.exists(thumb)}
+    if missing:
+        _render_thumbnails(path, missing)
+    return paths, len(missing)
+
+
+def generate_thumbnails(path, force=False, digest=None):
+    """
+    Create the standard thumbnails of an image file
+    
+    Args:
+        path: Image file inside a student folder
+        force: Render the thumbnails again even if they exist
+        digest: Optional SHA-256 of the file, if the caller already has it
+    
+    Returns:
+        Dict of (width, height) -> thumbnail path; empty if the file is not
+        an image or could not be decoded
+    """
+    if not path.lower().endswith(IMAGE_EXTENSIONS):
+        return {}
+    try:
+        paths, _ = _ensure_thumbnails(path, force, digest)
+        return paths
+    except Exception as e:
+        print(f"Error creating thumbnails for {path}: {e}")
+        return {}
+
+
+def get_thumbnail_path(path, size):
+    """
+    Get the stored thumbnail to display a student file at a given size
+    
+    The smallest standard size that covers the display size is used, and
+    generated first if it is missing.
+    
+    Args:
+        path: Image file path
+        size: (width, height) the image will be displayed at
+    
+    Returns:
+        Thumbnail path, or None if the file is not an image inside a student
+        folder or is displayed larger than every standard size
+    """
+    if not is_student_file(path):
+        return None
+    
+    covering = [s for s in THUMBNAIL_SIZES if s[0] >= size[0] and s[1] >= size[1]]
+    if not covering:
+        return None
+    standard = min(covering, key=lambda s: s[0] * s[1])
+    return generate_thumbnails(path).get(standard)
+
+
+def remove_thumbnails(path):
+    """
+    Forget a student file that is being deleted
+    
+    Its thumbnails are deleted unless another file in the folder has the
+    same content.
+    
+    Args:
+        path: Original file path
+    """
+    thumbs_folder = _thumbs_folder(path)
+    name = os.path.basename(path)
+    
+    with _index_lock:
+        index = _load_index(thumbs_folder)
+        entry = index.pop(name, None)
+        if entry is None:
+            return
+        _save_index(thumbs_folder, index)
+        
+        digest = entry["sha256"]
+        if any(other["sha256"] == digest for other in index.values()):
+            return
+    
+    for size in THUMBNAIL_SIZES:
+        thumb_path = os.path.join(thumbs_folder, _thumbnail_name(digest, size))
+        if os.path.exists(thumb_path):
+            os.remove(thumb_path)
+
+
+def _prune_folder(student_folder):
+    """
+    Drop index entries of deleted files and thumbnails nothing refers to
+    
+    Returns:
+        Number of thumbnail files removed
+    """
+    thumbs_folder = os.path.join(student_folder, THUMBS_DIR)
+    if not os.path.isdir(thumbs_folder):
+        return 0
+    
+    with _index_lock:
+        index = _load_index(thumbs_folder)
+        live = {name: entry for name, entry in index.items()
+                if os.path.exists(os.path.join(student_folder, name))}
+        if len(live) != len(index):
+            _save_index(thumbs_folder, live)
+    
+    keep = {_thumbnail_name(entry["sha256"], size) for entry in live.values() for size in THUMBNAIL_SIZES}
+    removed = 0
+    for name in os.listdir(thumbs_folder):
+        if name.endswith(".png") and name not in keep:
+            os.remove(os.path.join(thumbs_folder, name))
+            removed += 1
+    return removed
+
+
+def backfill_thumbnails(root=STUDENTS_ROOT, workers=4, force=False, progress_callback=None):
+    """
+    Create missing thumbnails for every image in the student folders
+    
+    Also removes thumbnails of files that no longer exist.
+    
+    Args:
+        root: Folder holding the student folders
+        workers: Number of threads decoding images
+        force: Render every thumbnail again
+        progress_callback: Optional callable(files_done, total_files)
+    
+    Returns:
+        Dict with images, thumbnails_created, thumbnails_removed and failed
+    """
+    images = []
+    student_folders = []
+    if os.path.isdir(root):
+        for entry in sorted(os.listdir(root)):
+            folder = os.path.join(root, entry)
+            if entry.startswith(".") or not os.path.isdir(folder):
+                continue
+            student_folders.append(folder)
+            for name in sorted(os.listdir(folder)):
+                file_path = os.path.join(folder, name)
+                if name.lower().endswith(IMAGE_EXTENSIONS) and os.path.isfile(file_path):
+                    images.append(file_path)
+    
+    report = {"images": len(images), "thumbnails_created": 0, "thumbnails_removed": 0, "failed": []}
+    
+    def process(path):
+        try:
+            return _ensure_thumbnails(path, force)[1], None
+        except Exception as e:
+            return 0, f"{path}: {e}"
+    
+    with ThreadPoolExecutor(max_workers=max(1, workers)) as executor:
+        for done, (created, error) in enumerate(executor.map(process, images), 1):
+            report["thumbnails_created"] += created
+            if error:
+                report["failed"].append(error)
+            if progress_callback and (done % 100 == 0 or done == len(images)):
+                progress_callback(done, len(images))
+    
+    for folder in student_folders:
+        report["thumbnails_removed"] += _prune_folder(folder)
+    
+    return report
+
+
+def main(argv=None):
+    """Command line entry point"""
+    parser = argparse.ArgumentParser(description="Create missing thumbnails for the student folders")
+    parser.add_argument("--root", default=STUDENTS_ROOT, help=f"Student folders root (default: {STUDENTS_ROOT})")
+    parser.add_argument("--workers", type=int, default=4, help="Number of threads decoding images")
+    parser.add_argument("--force", action="store_true", help="Render every thumbnail again")
+    args = parser.parse_args(argv)
+    
+    def show_progress(done, total):
+        """Report progress on stderr so stdout only carries the summary"""
+        print(f"  {done}/{total} image(s) processed", file=sys.stderr)
+    
+    report = backfill_thumbnails(args.root, args.workers, args.force, show_progress)
+    
+    print(f"{report['images']} image(s): {report['thumbnails_created']} thumbnail(s) created, "
+          f"{report['thumbnails_removed']} removed, {len(report['failed'])} failed")
+    for message in report["failed"][:20]:
+        print(f"  {message}")
+    
+    return 0 if not report["failed"] else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -3,6 +3,13 @@ from datetime import datetime
 import re
 
 
+# Exam terms offered throughout the application
+EXAM_NAMES = ["First Term", "Second Term", "Third Term"]
+
+# Gender options offered on the registration form
+GENDERS = ["Male", "Female"]
+
+
 class ValidationResult:
     """Container for validation results"""
     def __init__(self, is_valid, error_message=""):
@@ -169,6 +176,25 @@ class Validators:
         
         return ValidationResult(True)
     
+    @staticmethod
+    def validate_gender(gender):
+        """
+        Validate gender - must be one of the registration form options
+        
+        Args:
+            gender: Gender string
+        
+        Returns:
+            ValidationResult
+        """
+        if not gender or not gender.strip():
+            return ValidationResult(False, "Gender is required")
+        
+        if gender.strip() not in GENDERS:
+            return ValidationResult(False, f"Gender must be one of: {', '.join(GENDERS)}")
+        
+        return ValidationResult(True)
+    
     @staticmethod
     def validate_exam_year(year):
         """
@@ -201,6 +227,25 @@ class Validators:
         
         return ValidationResult(True)
     
+    @staticmethod
+    def validate_exam_name(exam_name):
+        """
+        Validate exam name - must be one of the exam terms
+        
+        Args:
+            exam_name: Exam name string
+        
+        Returns:
+            ValidationResult
+        """
+        if not exam_name or not exam_name.strip():
+            return ValidationResult(False, "Exam name is required")
+        
+        if exam_name.strip() not in EXAM_NAMES:
+            return ValidationResult(False, f"Exam name must be one of: {', '.join(EXAM_NAMES)}")
+        
+        return ValidationResult(True)
+    
     @staticmethod
     def validate_marks_obtained(marks):
         """
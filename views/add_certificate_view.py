@@ -1,10 +1,11 @@
 """Add Certificate view for Student Management System"""
 import customtkinter as ctk
 from tkinter import filedialog, messagebox
-from PIL import Image
 import shutil
 import os
+from image_cache import ImageCache
 from student_folder_utils import save_student_certificate, ensure_student_folder_exists
+from db_worker import AsyncDatabase, LiveSearch, deliver
 
 
 class AddCertificateView:
@@ -14,6 +15,7 @@ class AddCertificateView:
         self.parent = parent
         self.db = db
         self.certificates = []  # List to store [path, note] pairs
+        self.async_db = AsyncDatabase(db)
         
         # Create the main frame
         self.main_frame = ctk.CTkFrame(parent)
@@ -51,12 +53,22 @@ class AddCertificateView:
             font=ctk.CTkFont(size=13)
         )
         self.student_filter.pack(side="left", padx=10)
+        self.student_filter.bind("<KeyRelease>", self._filter_typed)
+        
+        # Filter as the user types: debounced, newest result only
+        self.last_filter_text = ""
+        self.live_search = LiveSearch(
+            self.student_filter,
+            self.db,
+            self._query_students,
+            on_result=lambda filter_text, students: self._show_students(students)
+        )
         
         ctk.CTkButton(
             filter_frame,
             text="🔍 Filter",
             width=100,
-            command=self._load_students
+            command=self._filter_now
         ).pack(side="left", padx=5)
         
         ctk.CTkButton(
@@ -139,7 +151,7 @@ class AddCertificateView:
         self.message_label.pack(pady=10)
         
         # Submit button
-        ctk.CTkButton(
+        self.save_button = ctk.CTkButton(
             form_frame,
             text="💾 Save Certificates",
             font=ctk.CTkFont(size=16, weight="bold"),
@@ -148,17 +160,41 @@ class AddCertificateView:
             fg_color="#43A047",
             hover_color="#388E3C",
             command=self._save_certificate
-        ).pack(pady=20)
+        )
+        self.save_button.pack(pady=20)
         
         # Load students and update display
         self._load_students()
         self._update_certificates_display()
     
+    def refresh(self):
+        """Reload the student picker (called when cached data went stale)"""
+        self._load_students()
+    
     def _load_students(self):
         """Load students from database with optional filter"""
+        self.live_search.cancel()
+        self._show_students(self._query_students(self.student_filter.get().strip()))
+    
+    def _query_students(self, filter_text):
+        """Students matching the filter text (also runs on the search worker)"""
+        # Ranked full-text search, best matches first
+        return self.db.search(filter_text, limit=100) if filter_text else self.db.get_all_students()
+    
+    def _filter_typed(self, event=None):
+        """Filter as the user types (runs once typing pauses)"""
         filter_text = self.student_filter.get().strip()
-        students = self.db.search_students(filter_text) if filter_text else self.db.get_all_students()
-        
+        if filter_text != self.last_filter_text:
+            self.last_filter_text = filter_text
+            self.live_search.schedule(filter_text)
+    
+    def _filter_now(self):
+        """Filter button: search immediately in the background"""
+        self.last_filter_text = self.student_filter.get().strip()
+        self.live_search.run_now(self.last_filter_text)
+    
+    def _show_students(self, students):
+        """Fill the student dropdown"""
         if students:
             self.students_dict = {f"{s[1]} (ID: {s[0]})": s for s in students}
             self.student_combo.configure(values=list(self.students_dict.keys()))
@@ -171,6 +207,7 @@ class AddCertificateView:
     def _clear_filter(self):
         """Clear the student filter"""
         self.student_filter.delete(0, "end")
+        self.last_filter_text = ""
         self._load_students()
     
     def _choose_certificate(self):
@@ -225,9 +262,7 @@ class AddCertificateView:
             # Show preview thumbnail if image
             if cert_path.lower().endswith(('.jpg', '.jpeg', '.png', '.gif', '.bmp')):
                 try:
-                    img = Image.open(cert_path)
-                    img.thumbnail((60, 60))
-                    photo = ctk.CTkImage(light_image=img, dark_image=img, size=(60, 60))
+                    photo = ImageCache.shared().get_image(cert_path, (60, 60))
                     img_label = ctk.CTkLabel(left_frame, image=photo, text="")
                     img_label.image = photo
                     img_label.pack(side="left", padx=5)
@@ -290,58 +325,87 @@ class AddCertificateView:
             self.message_label.configure(text="❌ Please add at least one certificate", text_color="red")
             return
         
-        try:
-            # Get selected student ID and name
-            selected_key = self.student_combo.get()
-            student_record = self.students_dict[selected_key]
-            student_id = student_record[0]
-            student_name = student_record[1]
-            
-            # Ensure student folder exists
-            ensure_student_folder_exists(student_name, student_id)
-            
-            # Save each certificate
-            saved_count = 0
-            failed_count = 0
-            
-            for cert_path, note in self.certificates:
-                try:
-                    # Save certificate to student folder
-                    saved_cert_path = save_student_certificate(cert_path, student_name, student_id, note)
+        # Get selected student ID and name
+        selected_key = self.student_combo.get()
+        student_record = self.students_dict.get(selected_key)
+        if student_record is None:
+            # The combo box is editable, so the text may not name a student
+            self.message_label.configure(text="❌ Please select a student", text_color="red")
+            return
+        student_id = student_record[0]
+        student_name = student_record[1]
+        
+        # Copy the files and insert the records without blocking the window
+        self.save_button.configure(state="disabled")
+        self.message_label.configure(text="Saving certificates...", text_color="gray")
+        future = self.async_db.submit(
+            self._save_certificate_files, student_id, student_name, [tuple(cert) for cert in self.certificates]
+        )
+        deliver(self.main_frame, future, self._show_save_result, self._show_save_error)
+    
+    def _save_certificate_files(self, student_id, student_name, certificates):
+        """
+        Copy certificates to the student folder and add their records
+        
+        Runs on the database worker thread.
+        
+        Returns:
+            (saved_count, failed_count)
+        """
+        # Ensure student folder exists
+        ensure_student_folder_exists(student_name, student_id)
+        
+        # Save each certificate
+        saved_count = 0
+        failed_count = 0
+        
+        for cert_path, note in certificates:
+            try:
+                # Save certificate to student folder
+                saved_cert_path = save_student_certificate(cert_path, student_name, student_id, note)
+                
+                if saved_cert_path:
+                    # Save to database
+                    success, message = self.db.add_certificate(student_id, saved_cert_path, note)
                     
-                    if saved_cert_path:
-                        # Save to database
-                        success, message = self.db.add_certificate(student_id, saved_cert_path, note)
-                        
-                        if success:
-                            saved_count += 1
-                        else:
-                            failed_count += 1
+                    if success:
+                        saved_count += 1
                     else:
                         failed_count += 1
-                except Exception as e:
+                else:
                     failed_count += 1
+            except Exception as e:
+                failed_count += 1
             
-            # Show result
-            if saved_count > 0 and failed_count == 0:
-                self.message_label.configure(
-                    text=f"{saved_count} certificate(s) saved successfully!", 
-                    text_color="green"
-                )
-                # Clear form
-                self._clear_certificate()
-                # Refresh students
-                self._load_students()
-            elif saved_count > 0 and failed_count > 0:
-                self.message_label.configure(
-                    text=f"⚠ {saved_count} saved, {failed_count} failed", 
-                    text_color="orange"
-                )
-            else:
-                self.message_label.configure(
-                    text=f"❌ Failed to save certificates", 
-                    text_color="red"
-                )
+        return saved_count, failed_count
                 
-        except Exception as e:
-            self.message_label.configure(text=f"❌ Error: {str(e)}", text_color="red")
+    def _show_save_error(self, error):
+        """Show an error raised while saving"""
+        self.save_button.configure(state="normal")
+        self.message_label.configure(text=f"❌ Error: {str(error)}", text_color="red")
+
+    def _show_save_result(self, counts):
+        """Show the outcome of _save_certificate_files"""
+        saved_count, failed_count = counts
+        self.save_button.configure(state="normal")
+        
+        # Show result
+        if saved_count > 0 and failed_count == 0:
+            self.message_label.configure(
+                text=f"{saved_count} certificate(s) saved successfully!", 
+                text_color="green"
+            )
+            # Clear form
+            self._clear_certificate()
+            # Refresh students
+            self._load_students()
+        elif saved_count > 0 and failed_count > 0:
+            self.message_label.configure(
+                text=f"⚠ {saved_count} saved, {failed_count} failed", 
+                text_color="orange"
+            )
+        else:
+            self.message_label.configure(
+                text=f"❌ Failed to save certificates", 
+                text_color="red"
+            )
@@ -1,8 +1,11 @@
 """Add Exam Results view for Student Management System"""
 import customtkinter as ctk
-from widgets import SearchWidget, FieldWithClearButton
+from tkinter import filedialog
+from widgets import SearchWidget, FieldWithClearButton, run_csv_import
 from validators import Validators
 from formatters import Formatters
+from bulk_import import import_exam_results_csv
+from db_worker import AsyncDatabase, LiveSearch
 
 
 class AddExamResultsView:
@@ -12,6 +15,7 @@ class AddExamResultsView:
         self.parent = parent
         self.db = db
         self.error_labels = {}  # Store error label widgets
+        self.async_db = AsyncDatabase(db)
         
         # Create main frame
         self.form_frame = ctk.CTkScrollableFrame(parent)
@@ -50,12 +54,14 @@ class AddExamResultsView:
         ctk.CTkLabel(search_frame, text="Search Student:", font=ctk.CTkFont(size=14)).pack(side="left", padx=5)
         self.exam_search_entry = ctk.CTkEntry(search_frame, width=200, placeholder_text="Enter student name...")
         self.exam_search_entry.pack(side="left", padx=5)
+        self.exam_search_entry.bind("<Return>", lambda e: self._filter_students())
+        self.exam_search_entry.bind("<KeyRelease>", self._search_typed)
         
         ctk.CTkButton(
             search_frame,
             text="Search",
             width=80,
-            command=lambda: self._filter_students(students)
+            command=self._filter_students
         ).pack(side="left", padx=5)
         
         ctk.CTkButton(
@@ -68,6 +74,14 @@ class AddExamResultsView:
         ).pack(side="left", padx=5)
         
         self.all_students = students
+        self.last_search_term = ""
+        # Search as you type: debounced, newest result only
+        self.live_search = LiveSearch(
+            self.exam_search_entry,
+            self.db,
+            self._query_students,
+            on_result=lambda search_term, found: self._show_student_options(found)
+        )
         student_options = [f"{s[0]} - {s[1]}" for s in students]
         
         # === PERSISTENT FIELDS AT TOP ===
@@ -135,16 +149,51 @@ class AddExamResultsView:
             width=200,
             height=45,
             command=self._submit_result
-        ).grid(row=9, column=0, columnspan=2, pady=(20, 40))
+        ).grid(row=9, column=0, columnspan=2, pady=(20, 20))
+        
+        # === BULK IMPORT ===
+        
+        import_frame = ctk.CTkFrame(content, fg_color="transparent")
+        import_frame.grid(row=10, column=0, columnspan=2, pady=(0, 40))
+        
+        self.import_button = ctk.CTkButton(
+            import_frame,
+            text="Import from CSV",
+            width=160,
+            fg_color="#666666",
+            hover_color="#888888",
+            command=self._import_csv
+        )
+        self.import_button.pack(side="left", padx=5)
+        
+        self.dry_run_var = ctk.BooleanVar(value=True)
+        ctk.CTkCheckBox(
+            import_frame,
+            text="Dry run (validate only)",
+            variable=self.dry_run_var
+        ).pack(side="left", padx=5)
     
-    def _filter_students(self, all_students):
-        """Filter students based on search"""
-        search_term = self.exam_search_entry.get().strip()
+    def _query_students(self, search_term):
+        """Students matching a search term (runs on the search worker)"""
         if search_term:
-            filtered_students = self.db.search_students(search_term)
-        else:
-            filtered_students = all_students
-        
+            # Ranked full-text search, best matches first
+            return self.db.search(search_term, limit=100)
+        return self.all_students
+    
+    def _search_typed(self, event=None):
+        """Search as the user types (runs once typing pauses)"""
+        search_term = self.exam_search_entry.get().strip()
+        if search_term != self.last_search_term:
+            self.last_search_term = search_term
+            self.live_search.schedule(search_term)
+    
+    def _filter_students(self):
+        """Filter students based on search"""
+        self.last_search_term = self.exam_search_entry.get().strip()
+        self.live_search.run_now(self.last_search_term)
+    
+    def _show_student_options(self, filtered_students):
+        """Fill the student dropdown with search results"""
         if filtered_students:
             student_options = [f"{s[0]} - {s[1]}" for s in filtered_students]
             self.student_select.configure(values=student_options)
@@ -154,6 +203,8 @@ class AddExamResultsView:
     
     def _clear_search(self, all_students):
         """Clear search and reset dropdown"""
+        self.live_search.cancel()
+        self.last_search_term = ""
         self.exam_search_entry.delete(0, 'end')
         student_options = [f"{s[0]} - {s[1]}" for s in all_students]
         self.student_select.configure(values=student_options)
@@ -240,3 +291,15 @@ class AddExamResultsView:
             self.grade_entry.delete(0, 'end')
         else:
             self.result_message.configure(text=f"Error: {message}", text_color="red")
+
+    def _import_csv(self):
+        """Import exam results from a CSV file"""
+        csv_path = filedialog.askopenfilename(
+            title="Select Exam Results CSV",
+            filetypes=[("CSV files", "*.csv"), ("All files", "*.*")]
+        )
+        if not csv_path:
+            return
+        
+        run_csv_import(self.result_message, self.import_button, self.async_db, import_exam_results_csv,
+                       csv_path, dry_run=self.dry_run_var.get())
@@ -2,14 +2,16 @@
 import customtkinter as ctk
 from datetime import datetime
 from tkinter import filedialog
-from PIL import Image
 import shutil
 import os
-from widgets import WatermarkWidget
+from image_cache import ImageCache
+from widgets import WatermarkWidget, run_csv_import
 from student_folder_utils import (save_student_profile_image, save_student_certificate,
                                    ensure_student_folder_exists)
 from validators import Validators
 from formatters import Formatters
+from bulk_import import import_students_csv
+from db_worker import AsyncDatabase
 
 
 class AddStudentView:
@@ -22,6 +24,7 @@ class AddStudentView:
         self.certificates = []  # List to store (path, note) tuples
         self.form_message_callback = form_message_callback
         self.error_labels = {}  # Store error label widgets
+        self.async_db = AsyncDatabase(db)
         
         # Create the form
         self.form_frame = ctk.CTkScrollableFrame(parent)
@@ -207,7 +210,28 @@ class AddStudentView:
             fg_color="#43A047",
             hover_color="#388E3C",
             command=self.submit_student
-        ).grid(row=17, column=0, columnspan=2, pady=(20, 40))
+        ).grid(row=17, column=0, columnspan=2, pady=(20, 20))
+        
+        # Bulk registration from CSV
+        import_frame = ctk.CTkFrame(content, fg_color="transparent")
+        import_frame.grid(row=18, column=0, columnspan=2, pady=(0, 40))
+        
+        self.import_button = ctk.CTkButton(
+            import_frame,
+            text="Import Students from CSV",
+            width=200,
+            fg_color="#666666",
+            hover_color="#888888",
+            command=self.import_students
+        )
+        self.import_button.pack(side="left", padx=5)
+        
+        self.dry_run_var = ctk.BooleanVar(value=True)
+        ctk.CTkCheckBox(
+            import_frame,
+            text="Dry run (validate only)",
+            variable=self.dry_run_var
+        ).pack(side="left", padx=5)
     
     def choose_image(self):
         """Open file dialog to choose student image"""
@@ -219,9 +243,7 @@ class AddStudentView:
             self.image_path = file_path
             # Show preview
             try:
-                img = Image.open(file_path)
-                img.thumbnail((150, 150))
-                photo = ctk.CTkImage(light_image=img, dark_image=img, size=(150, 150))
+                photo = ImageCache.shared().get_image(file_path, (150, 150))
                 self.preview_label.configure(
                     image=photo,
                     text="",
@@ -292,9 +314,7 @@ class AddStudentView:
             # Show preview thumbnail if image
             if cert_path.lower().endswith(('.jpg', '.jpeg', '.png', '.gif', '.bmp')):
                 try:
-                    img = Image.open(cert_path)
-                    img.thumbnail((60, 60))
-                    photo = ctk.CTkImage(light_image=img, dark_image=img, size=(60, 60))
+                    photo = ImageCache.shared().get_image(cert_path, (60, 60))
                     img_label = ctk.CTkLabel(left_frame, image=photo, text="")
                     img_label.image = photo
                     img_label.pack(side="left", padx=5)
@@ -484,3 +504,19 @@ class AddStudentView:
             )
         else:
             self.form_message.configure(text=f"Error: {result}", text_color="red")
+
+    def import_students(self):
+        """Register students from a CSV file, with photos from a folder"""
+        csv_path = filedialog.askopenfilename(
+            title="Select Students CSV",
+            filetypes=[("CSV files", "*.csv"), ("All files", "*.*")]
+        )
+        if not csv_path:
+            return
+        
+        # Photos are optional - cancelling the folder dialog imports without them
+        photo_dir = filedialog.askdirectory(title="Select Photo Folder (Cancel for no photos)") or None
+        dry_run = self.dry_run_var.get()
+        
+        run_csv_import(self.form_message, self.import_button, self.async_db, import_students_csv,
+                       csv_path, photo_dir, dry_run=dry_run)
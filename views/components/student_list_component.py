@@ -1,6 +1,8 @@
 """Student list/table component - displays all students in a searchable table with pagination"""
 import customtkinter as ctk
-from widgets import SearchWidget, create_label_with_tooltip
+from widgets import SearchWidget, VirtualTable
+from db_worker import LiveSearch
+from event_bus import UPDATED
 
 
 class StudentListComponent:
@@ -20,24 +22,25 @@ class StudentListComponent:
         self.total_pages = 1
         self.current_search_term = None
         
+        # Keyset pagination: boundary keys of the page on screen, and the
+        # seek to use for the next render ("after"/"before", key) or None
+        self.page_first_key = None
+        self.page_last_key = None
+        self.pending_seek = None
+        
         # Create main frame
         self.list_frame = ctk.CTkFrame(parent)
         self.list_frame.pack(fill="both", expand=True)
         
         self._create_ui()
-    
-    def _create_ui(self, search_term=None, reset_page=False):
-        """Create the student list UI with pagination"""
-        # Clear existing widgets
-        for widget in self.list_frame.winfo_children():
-            widget.destroy()
-        
-        # Store search term for pagination
-        if search_term is not None or reset_page:
-            self.current_search_term = search_term
-            if reset_page:
-                self.current_page = 1
+        self._show_page()
         
+        # Keep the table up to date with student changes made anywhere in the app
+        self.reload_pending = False
+        db.events.subscribe(self._on_data_changed, tables=["students"], widget=self.list_frame)
+    
+    def _create_ui(self):
+        """Create the title, search bar, table and pagination controls (once)"""
         # Title
         title_text = "Student Profiles"
         title = ctk.CTkLabel(
@@ -48,265 +51,328 @@ class StudentListComponent:
         title.pack(pady=(20, 10))
         
         # Search widget
-        search_widget = SearchWidget(
+        self.search_widget = SearchWidget(
             self.list_frame,
-            placeholder="Enter student name...",
+            placeholder="Name, guardian, NIC, address or notes...",
             on_search=self._perform_search,
-            on_clear=self._clear_search
+            on_clear=self._clear_search,
+            on_change=self._search_typed
+        )
+        self.search_widget.pack(pady=10)
+        
+        # Search as you type: debounced, newest result only
+        self.live_search = LiveSearch(
+            self.search_widget.search_entry,
+            self.db,
+            self._query_first_page,
+            on_result=self._show_live_results
         )
-        search_widget.pack(pady=10)
         
-        if self.current_search_term:
-            search_widget.set_search_term(self.current_search_term)
+        # Info bar (showing results and pagination info)
+        info_frame = ctk.CTkFrame(self.list_frame, fg_color="transparent")
+        info_frame.pack(fill="x", padx=20, pady=(0, 10))
         
-        # Get all students (for pagination calculation)
-        all_students = self.db.search_students(self.current_search_term) if self.current_search_term else self.db.get_all_students()
+        self.info_label = ctk.CTkLabel(
+            info_frame,
+            text="",
+            font=ctk.CTkFont(size=12),
+            text_color="gray"
+        )
+        self.info_label.pack(side="left")
         
-        if not all_students:
+        # Items per page selector (shown when there are more than 10 students)
+        self.items_label = ctk.CTkLabel(
+            info_frame,
+            text="Items per page:",
+            font=ctk.CTkFont(size=12)
+        )
+        items_options = ["10", "20", "50", "100", "All"]
+        self.items_dropdown = ctk.CTkOptionMenu(
+            info_frame,
+            values=items_options,
+            width=80,
+            command=self._change_items_per_page
+        )
+        
+        # Student table: only the visible rows have widgets
+        columns = [
+            # (header, width, max length before truncation)
+            ("ID", 50, 10),
+            ("Name", 200, 30),
+            ("DOB", 100, 12),
+            ("Gender", 100, 10),
+            ("Guardian", 200, 30),
+            ("Guardian NIC", 120, 15),
+        ]
+        actions = [{"text": "View", "command": self.on_view_student}]
+        if self.on_view_results:
+            actions.append({
+                "text": "Results",
+                "command": self.on_view_results,
+                "fg_color": "#2f9f5a",
+                "hover_color": "#147056"
+            })
+        actions.append({
+            "text": "Edit",
+            "command": self.on_edit_student,
+            "fg_color": "#FF8C00",
+            "hover_color": "#FFA500"
+        })
+        actions.append({
+            "text": "Delete",
+            "command": self.on_delete_student,
+            "fg_color": "#DC143C",
+            "hover_color": "#B22222"
+        })
+        
+        self.table = VirtualTable(
+            self.list_frame,
+            columns,
+            row_values=lambda student: [student[0], student[1], student[2], student[3], student[5], student[6]],
+            actions=actions
+        )
+        self.table.pack(fill="both", expand=True, padx=20, pady=(0, 10))
+        
+        self._create_pagination_controls()
+    
+    def _show_page(self, search_term=None, reset_page=False, keep_position=False):
+        """
+        Load the current page into the table and update the info bar and pagination
+        
+        Args:
+            search_term: New search term (None keeps the current one unless reset_page)
+            reset_page: Go back to page 1
+            keep_position: Keep the table's scroll position (used by refresh)
+        """
+        # Store search term for pagination
+        if search_term is not None or reset_page:
+            self.current_search_term = search_term
+            if reset_page:
+                self.current_page = 1
+        
+        # Count matching students (for pagination calculation)
+        total_students = self.db.count_students(self.current_search_term)
+        
+        students = []
+        if total_students:
+            # Ensure current page is valid
+            total_pages = (total_students + self.items_per_page - 1) // self.items_per_page  # Ceiling division
+            self.current_page = min(max(self.current_page, 1), total_pages)
+            
+            # Get students for current page
+            students = self._fetch_page((self.current_page - 1) * self.items_per_page)
+        
+        self._render_page(total_students, students, keep_position)
+    
+    def _render_page(self, total_students, students, keep_position=False):
+        """Show a page of students in the table and update the info bar and pagination"""
+        if not total_students:
             no_results_msg = f"No students found matching '{self.current_search_term}'." if self.current_search_term else "No students registered yet."
-            ctk.CTkLabel(
-                self.list_frame,
-                text=no_results_msg,
-                font=ctk.CTkFont(size=14)
-            ).pack(pady=50)
+            self.table.set_empty_text(no_results_msg)
+            self.table.set_rows([])
+            self.info_label.configure(text="")
+            self.items_label.pack_forget()
+            self.items_dropdown.pack_forget()
+            self.total_pages = 1
+            self._update_pagination_controls()
             return
         
         # Calculate pagination
-        total_students = len(all_students)
         self.total_pages = (total_students + self.items_per_page - 1) // self.items_per_page  # Ceiling division
-        
-        # Ensure current page is valid
-        if self.current_page > self.total_pages:
-            self.current_page = self.total_pages
-        if self.current_page < 1:
-            self.current_page = 1
-        
-        # Get students for current page
         start_idx = (self.current_page - 1) * self.items_per_page
         end_idx = start_idx + self.items_per_page
-        students = all_students[start_idx:end_idx]
         
-        # Info bar (showing results and pagination info)
-        info_frame = ctk.CTkFrame(self.list_frame, fg_color="transparent")
-        info_frame.pack(fill="x", padx=20, pady=(0, 10))
+        if students:
+            sort = self._get_sort()
+            self.page_first_key = self.db.student_page_key(students[0], sort)
+            self.page_last_key = self.db.student_page_key(students[-1], sort)
         
         info_text = f"Showing {start_idx + 1}-{min(end_idx, total_students)} of {total_students} students"
         if self.total_pages > 1:
             info_text += f" | Page {self.current_page} of {self.total_pages}"
+        self.info_label.configure(text=info_text)
         
-        ctk.CTkLabel(
-            info_frame,
-            text=info_text,
-            font=ctk.CTkFont(size=12),
-            text_color="gray"
-        ).pack(side="left")
-        
-        # Items per page selector
         if total_students > 10:
-            ctk.CTkLabel(
-                info_frame,
-                text="Items per page:",
-                font=ctk.CTkFont(size=12)
-            ).pack(side="right", padx=(20, 5))
-            
-            items_options = ["10", "20", "50", "100", "All"]
-            items_dropdown = ctk.CTkOptionMenu(
-                info_frame,
-                values=items_options,
-                width=80,
-                command=self._change_items_per_page
-            )
-            items_dropdown.set(str(self.items_per_page) if self.items_per_page < 1000 else "All")
-            items_dropdown.pack(side="right")
-        
-        # Scrollable frame for students (FIXED: removed orientation="horizontal")
-        scroll_frame = ctk.CTkScrollableFrame(self.list_frame, height=400, fg_color="transparent")
-        scroll_frame.pack(fill="both", expand=True, padx=20, pady=(0, 10))
-        
-        # Header
-        header_frame = ctk.CTkFrame(scroll_frame)
-        header_frame.pack(fill="x", padx=10, pady=5)
-        
-        headers = ["ID", "Name", "DOB", "Gender", "Guardian", "Guardian NIC"]
-        header_widths = [50, 200, 100, 100, 200, 120]
-        
-        for i, (header, width) in enumerate(zip(headers, header_widths)):
-            ctk.CTkLabel(
-                header_frame,
-                text=header,
-                font=ctk.CTkFont(size=12, weight="bold"),
-                width=width,
-                anchor="w"
-            ).grid(row=0, column=i, padx=5, pady=5, sticky="w")
-        
-        # Student rows (only current page)
-        for student in students:
-            self._create_student_row(scroll_frame, student, header_widths)
-        
-        # Pagination controls (only show if more than one page)
-        if self.total_pages > 1:
-            self._create_pagination_controls()
+            if not self.items_label.winfo_manager():
+                self.items_label.pack(side="right", padx=(20, 5))
+                self.items_dropdown.pack(side="right")
+            self.items_dropdown.set(str(self.items_per_page) if self.items_per_page < 1000 else "All")
+        else:
+            self.items_label.pack_forget()
+            self.items_dropdown.pack_forget()
+        
+        self.table.set_rows(students, keep_position=keep_position)
+        self._update_pagination_controls()
+    
+    def _query_first_page(self, search_term):
+        """
+        Count and fetch the first page for a live search (on the search worker)
+        
+        Returns:
+            (total, students)
+        """
+        search_term = search_term or None
+        total_students = self.db.count_students(search_term)
+        if not total_students:
+            return 0, []
+        sort = "name" if search_term else "id"
+        return total_students, self.db.get_students_page(search_term, sort, self.items_per_page, offset=0)
+    
+    def _show_live_results(self, search_term, data):
+        """Render the newest live search result"""
+        self.current_search_term = search_term or None
+        self.current_page = 1
+        self.pending_seek = None
+        total_students, students = data
+        self._render_page(total_students, students)
+    
+    def _get_sort(self):
+        """Search results are ordered by name, the full list by ID"""
+        return "name" if self.current_search_term else "id"
     
-    def _create_student_row(self, parent, student, header_widths):
-        """Create a single student row with action buttons"""
-        student_frame = ctk.CTkFrame(parent, fg_color="#363535")
-        student_frame.pack(fill="x", padx=10, pady=2)
-        
-        values = [student[0], student[1], student[2], student[3], student[5], student[6]]
-        # Max lengths for truncation: ID (10), Name (30), DOB (12), Gender (10), Guardian (30), NIC (15)
-        max_lengths = [10, 30, 12, 10, 30, 15]
-        
-        for i, (value, max_len, col_width) in enumerate(zip(values, max_lengths, header_widths)):
-            label = create_label_with_tooltip(
-                student_frame,
-                str(value),
-                max_length=max_len,
-                font=ctk.CTkFont(size=11),
-                width=col_width,
-                anchor="w"
+    def _fetch_page(self, start_idx):
+        """Fetch the current page, seeking from the previous page's keys when possible"""
+        sort = self._get_sort()
+        students = []
+        seek = self.pending_seek
+        self.pending_seek = None
+        
+        if seek:
+            direction, key = seek
+            students = self.db.get_students_page(
+                self.current_search_term, sort, self.items_per_page,
+                after_key=key if direction == "after" else None,
+                before_key=key if direction == "before" else None
             )
-            label.grid(row=0, column=i, padx=5, pady=5, sticky="w")
-        
-        # View button
-        ctk.CTkButton(
-            student_frame,
-            text="View",
-            width=60,
-            command=lambda: self.on_view_student(student)
-        ).grid(row=0, column=len(values), padx=5)
-        
-        # View Results button (if callback provided)
-        button_col = len(values) + 1
-        if self.on_view_results:
-            ctk.CTkButton(
-                student_frame,
-                text="Results",
-                width=60,
-                fg_color="#2f9f5a",
-                hover_color="#147056",
-                command=lambda: self.on_view_results(student)
-            ).grid(row=0, column=button_col, padx=5)
-            button_col += 1
-        
-        # Edit button
-        ctk.CTkButton(
-            student_frame,
-            text="Edit",
-            width=60,
-            fg_color="#FF8C00",
-            hover_color="#FFA500",
-            command=lambda: self.on_edit_student(student)
-        ).grid(row=0, column=button_col, padx=5)
-        
-        # Delete button
-        ctk.CTkButton(
-            student_frame,
-            text="Delete",
-            width=60,
-            fg_color="#DC143C",
-            hover_color="#B22222",
-            command=lambda: self.on_delete_student(student)
-        ).grid(row=0, column=button_col+1, padx=5)
+        
+        if not students:
+            # First/last/jump (or a seek that ran off the end after a delete)
+            students = self.db.get_students_page(
+                self.current_search_term, sort, self.items_per_page, offset=start_idx
+            )
+        
+        return students
     
     def _create_pagination_controls(self):
-        """Create pagination navigation controls"""
-        pagination_frame = ctk.CTkFrame(self.list_frame)
-        pagination_frame.pack(fill="x", padx=20, pady=10)
+        """Create pagination navigation controls (shown when there is more than one page)"""
+        self.pagination_frame = ctk.CTkFrame(self.list_frame)
         
         # Center the controls
-        controls_container = ctk.CTkFrame(pagination_frame, fg_color="transparent")
+        controls_container = ctk.CTkFrame(self.pagination_frame, fg_color="transparent")
         controls_container.pack(expand=True)
         
         # First page button
-        first_btn = ctk.CTkButton(
+        self.first_btn = ctk.CTkButton(
             controls_container,
             text="⏮ First",
             width=80,
-            command=self._go_to_first_page,
-            state="normal" if self.current_page > 1 else "disabled"
+            command=self._go_to_first_page
         )
-        first_btn.pack(side="left", padx=2)
+        self.first_btn.pack(side="left", padx=2)
         
         # Previous page button
-        prev_btn = ctk.CTkButton(
+        self.prev_btn = ctk.CTkButton(
             controls_container,
             text="◀ Previous",
             width=90,
-            command=self._go_to_previous_page,
-            state="normal" if self.current_page > 1 else "disabled"
+            command=self._go_to_previous_page
         )
-        prev_btn.pack(side="left", padx=2)
+        self.prev_btn.pack(side="left", padx=2)
         
         # Page indicator
-        page_label = ctk.CTkLabel(
+        self.page_label = ctk.CTkLabel(
             controls_container,
-            text=f"Page {self.current_page} of {self.total_pages}",
+            text="",
             font=ctk.CTkFont(size=13, weight="bold"),
             width=120
         )
-        page_label.pack(side="left", padx=10)
+        self.page_label.pack(side="left", padx=10)
         
         # Next page button
-        next_btn = ctk.CTkButton(
+        self.next_btn = ctk.CTkButton(
             controls_container,
             text="Next ▶",
             width=90,
-            command=self._go_to_next_page,
-            state="normal" if self.current_page < self.total_pages else "disabled"
+            command=self._go_to_next_page
         )
-        next_btn.pack(side="left", padx=2)
+        self.next_btn.pack(side="left", padx=2)
         
         # Last page button
-        last_btn = ctk.CTkButton(
+        self.last_btn = ctk.CTkButton(
             controls_container,
             text="Last ⏭",
             width=80,
-            command=self._go_to_last_page,
-            state="normal" if self.current_page < self.total_pages else "disabled"
+            command=self._go_to_last_page
         )
-        last_btn.pack(side="left", padx=2)
+        self.last_btn.pack(side="left", padx=2)
+        
+        # Quick jump to page (shown when there are more than 5 pages)
+        self.jump_frame = ctk.CTkFrame(controls_container, fg_color="transparent")
+        
+        ctk.CTkLabel(
+            self.jump_frame,
+            text="Go to:",
+            font=ctk.CTkFont(size=12)
+        ).pack(side="left", padx=(15, 5))
+        
+        page_entry = ctk.CTkEntry(self.jump_frame, width=50)
+        page_entry.pack(side="left", padx=2)
+        page_entry.bind("<Return>", lambda e: self._jump_to_page(page_entry.get()))
+        
+        jump_btn = ctk.CTkButton(
+            self.jump_frame,
+            text="Go",
+            width=50,
+            command=lambda: self._jump_to_page(page_entry.get())
+        )
+        jump_btn.pack(side="left", padx=2)
+    
+    def _update_pagination_controls(self):
+        """Show, hide and enable the pagination controls for the current page"""
+        if self.total_pages <= 1:
+            self.pagination_frame.pack_forget()
+            return
+        
+        if not self.pagination_frame.winfo_manager():
+            self.pagination_frame.pack(fill="x", padx=20, pady=10)
+        
+        back_state = "normal" if self.current_page > 1 else "disabled"
+        forward_state = "normal" if self.current_page < self.total_pages else "disabled"
+        self.first_btn.configure(state=back_state)
+        self.prev_btn.configure(state=back_state)
+        self.next_btn.configure(state=forward_state)
+        self.last_btn.configure(state=forward_state)
+        self.page_label.configure(text=f"Page {self.current_page} of {self.total_pages}")
         
-        # Quick jump to page
         if self.total_pages > 5:
-            ctk.CTkLabel(
-                controls_container,
-                text="Go to:",
-                font=ctk.CTkFont(size=12)
-            ).pack(side="left", padx=(15, 5))
-            
-            page_entry = ctk.CTkEntry(controls_container, width=50)
-            page_entry.pack(side="left", padx=2)
-            page_entry.bind("<Return>", lambda e: self._jump_to_page(page_entry.get()))
-            
-            jump_btn = ctk.CTkButton(
-                controls_container,
-                text="Go",
-                width=50,
-                command=lambda: self._jump_to_page(page_entry.get())
-            )
-            jump_btn.pack(side="left", padx=2)
+            if not self.jump_frame.winfo_manager():
+                self.jump_frame.pack(side="left")
+        else:
+            self.jump_frame.pack_forget()
     
     def _go_to_first_page(self):
         """Navigate to first page"""
         self.current_page = 1
-        self._create_ui()
+        self._show_page()
     
     def _go_to_previous_page(self):
         """Navigate to previous page"""
         if self.current_page > 1:
             self.current_page -= 1
-            self._create_ui()
+            self.pending_seek = ("before", self.page_first_key)
+            self._show_page()
     
     def _go_to_next_page(self):
         """Navigate to next page"""
         if self.current_page < self.total_pages:
             self.current_page += 1
-            self._create_ui()
+            self.pending_seek = ("after", self.page_last_key)
+            self._show_page()
     
     def _go_to_last_page(self):
         """Navigate to last page"""
         self.current_page = self.total_pages
-        self._create_ui()
+        self._show_page()
     
     def _jump_to_page(self, page_str):
         """Jump to specific page number"""
@@ -314,7 +380,7 @@ class StudentListComponent:
             page = int(page_str)
             if 1 <= page <= self.total_pages:
                 self.current_page = page
-                self._create_ui()
+                self._show_page()
         except ValueError:
             pass  # Invalid input, ignore
     
@@ -326,16 +392,59 @@ class StudentListComponent:
             self.items_per_page = int(value)
         
         self.current_page = 1  # Reset to first page
-        self._create_ui()
+        self._show_page()
+    
+    def _search_typed(self, search_term):
+        """Search as the user types (runs once typing pauses)"""
+        self.live_search.schedule(search_term)
     
     def _perform_search(self, search_term):
         """Handle search (resets to page 1)"""
-        self._create_ui(search_term, reset_page=True)
+        self.live_search.cancel()
+        self._show_page(search_term, reset_page=True)
     
     def _clear_search(self):
         """Clear search and show all students (resets to page 1)"""
-        self._create_ui(None, reset_page=True)
+        self.live_search.cancel()
+        self._show_page(None, reset_page=True)
+    
+    def _on_data_changed(self, event):
+        """
+        Apply a student change event to the table
+        
+        Edited students visible in the table are updated in place; added or
+        deleted students shift the pages, so the current page is reloaded.
+        So is an edit that changes a student's sort key (a rename while the
+        list is sorted by name), since the row belongs somewhere else.
+        """
+        if event.action == UPDATED and event.ids:
+            sort = self._get_sort()
+            for student_id in event.ids:
+                index = self.table.find_row(lambda row: row[0] == student_id)
+                if index is None:
+                    continue
+                student = self.db.get_student_by_id(student_id)
+                if not student:
+                    continue
+                old_key = self.db.student_page_key(self.table.rows[index], sort)
+                if self.db.student_page_key(student, sort) != old_key:
+                    self._schedule_reload()
+                    return
+                self.table.update_row(index, student)
+        else:
+            self._schedule_reload()
+    
+    def _schedule_reload(self):
+        """Reload the page once, however many changes arrive together"""
+        if not self.reload_pending:
+            self.reload_pending = True
+            self.list_frame.after(100, self._reload_now)
+    
+    def _reload_now(self):
+        """Run a scheduled reload"""
+        self.reload_pending = False
+        self.refresh()
     
     def refresh(self):
-        """Refresh the student list (maintains current page)"""
-        self._create_ui()
+        """Refresh the student list (maintains current page and scroll position)"""
+        self._show_page(keep_position=True)
@@ -1,6 +1,7 @@
 import customtkinter as ctk
 from PIL import Image
 import os
+from image_cache import ImageCache
 from utils import resource_path
 
 
@@ -41,13 +42,11 @@ class HomeView:
         try:
             logo_path = resource_path("logo.png")
             if os.path.exists(logo_path):
-                img = Image.open(logo_path)
                 # Resize logo to reasonable size for center display
                 logo_size = (300, 300)
-                img.thumbnail(logo_size, Image.Resampling.LANCZOS)
-                
-                photo = ctk.CTkImage(light_image=img, dark_image=img, 
-                                    size=(img.width, img.height))
+                photo = ImageCache.shared().get_image(
+                    logo_path, logo_size, keep_aspect=True, resample=Image.Resampling.LANCZOS
+                )
                 logo_label = ctk.CTkLabel(center_frame, image=photo, text="")
                 logo_label.pack(pady=20)
             else:
@@ -66,23 +65,93 @@ class HomeView:
             )
             logo_label.pack(pady=20)
         
-        # Bottom section: Student count
+        # Bottom section: Dashboard tiles
         bottom_frame = ctk.CTkFrame(main_container, fg_color="transparent")
         bottom_frame.grid(row=2, column=0, sticky="n", pady=(10, 20))
         
-        # Get student count
-        students = db.get_all_students()
+        # Aggregate queries only - no student rows are loaded
+        stats = db.get_dashboard_stats()
         
-        student_count_label = ctk.CTkLabel(
-            bottom_frame,
-            text=f"Total Students: {len(students)}",
-            font=ctk.CTkFont(size=24, weight="bold"),
-            text_color="#000000"
-        )
-        student_count_label.pack()
+        HomeView._create_stat_tiles(bottom_frame, stats)
+        HomeView._create_breakdown_tiles(bottom_frame, stats)
         
         # Empty row for bottom spacing
         spacer = ctk.CTkFrame(main_container, fg_color="transparent", height=1)
         spacer.grid(row=3, column=0, sticky="n")
         
         return main_container
+
+    @staticmethod
+    def _create_tile(parent, title: str, width: int = 200):
+        """Create an empty dashboard tile with a title and return its frame"""
+        tile = ctk.CTkFrame(parent, fg_color="#F5F2B8", corner_radius=12, width=width)
+        
+        ctk.CTkLabel(
+            tile,
+            text=title,
+            font=ctk.CTkFont(size=14),
+            text_color="#333333"
+        ).pack(padx=20, pady=(12, 0))
+        
+        return tile
+    
+    @staticmethod
+    def _create_stat_tiles(parent, stats: dict):
+        """Create the row of headline count tiles"""
+        tiles_frame = ctk.CTkFrame(parent, fg_color="transparent")
+        tiles_frame.pack(pady=(0, 10))
+        
+        gender_text = " / ".join(f"{count} {gender}" for gender, count in stats["by_gender"]) or "0"
+        
+        headline = [
+            ("Total Students", str(stats["total_students"])),
+            ("Exam Results", str(stats["exam_results"])),
+            ("Certificates", str(stats["certificates"])),
+            ("By Gender", gender_text),
+        ]
+        
+        for col, (title, value) in enumerate(headline):
+            tile = HomeView._create_tile(tiles_frame, title)
+            tile.grid(row=0, column=col, padx=8, sticky="nsew")
+            
+            ctk.CTkLabel(
+                tile,
+                text=value,
+                font=ctk.CTkFont(size=24, weight="bold"),
+                text_color="#000000"
+            ).pack(padx=20, pady=(0, 12))
+    
+    @staticmethod
+    def _create_breakdown_tiles(parent, stats: dict):
+        """Create the students-by-grade and latest-registrations tiles"""
+        tiles_frame = ctk.CTkFrame(parent, fg_color="transparent")
+        tiles_frame.pack()
+        
+        # Students by grade
+        grade_tile = HomeView._create_tile(tiles_frame, "Students by Grade")
+        grade_tile.grid(row=0, column=0, padx=8, sticky="nsew")
+        
+        grade_text = "\n".join(f"{grade or 'N/A'}: {count}" for grade, count in stats["by_grade"])
+        ctk.CTkLabel(
+            grade_tile,
+            text=grade_text or "No students registered yet",
+            font=ctk.CTkFont(size=13),
+            text_color="#000000",
+            justify="left"
+        ).pack(padx=20, pady=(4, 12))
+        
+        # Latest registrations
+        latest_tile = HomeView._create_tile(tiles_frame, "Latest Registrations")
+        latest_tile.grid(row=0, column=1, padx=8, sticky="nsew")
+        
+        latest_text = "\n".join(
+            f"{name} ({registration_date or 'N/A'})"
+            for _, name, registration_date, _ in stats["latest_registrations"]
+        )
+        ctk.CTkLabel(
+            latest_tile,
+            text=latest_text or "No students registered yet",
+            font=ctk.CTkFont(size=13),
+            text_color="#000000",
+            justify="left"
+        ).pack(padx=20, pady=(4, 12))
@@ -1,9 +1,10 @@
 """Student certificates gallery view"""
 import customtkinter as ctk
-from PIL import Image
 import os
+from image_cache import ImageLoader
 import tkinter.messagebox as messagebox
 from widgets import ConfirmDeleteDialog
+from student_folder_utils import delete_student_file
 
 
 class StudentCertificatesView(ctk.CTkFrame):
@@ -15,12 +16,21 @@ class StudentCertificatesView(ctk.CTkFrame):
         self.db = db
         self.on_back = on_back
         
+        # Certificate images are decoded in the background, on-screen cards first
+        self.image_loader = ImageLoader(self)
+        self.scroll_frame = None
+        
         # Configure grid
         self.grid_columnconfigure(0, weight=1)
         self.grid_rowconfigure(0, weight=1)
         
         self._create_content()
     
+    def destroy(self):
+        """Stop decoding certificate images when the view is closed"""
+        self.image_loader.cancel()
+        super().destroy()
+    
     def _create_content(self):
         """Create view content"""
         # Content frame
@@ -51,6 +61,7 @@ class StudentCertificatesView(ctk.CTkFrame):
         # Scrollable frame for certificates
         scroll_frame = ctk.CTkScrollableFrame(content)
         scroll_frame.grid(row=2, column=0, sticky="nsew", pady=10)
+        self.scroll_frame = scroll_frame
         
         if not certificates:
             ctk.CTkLabel(
@@ -109,7 +120,7 @@ class StudentCertificatesView(ctk.CTkFrame):
             height=30,
             fg_color="#e74c3c",
             hover_color="#c0392b",
-            command=lambda: self._delete_certificate(cert_id)
+            command=lambda: self._delete_certificate(cert_id, image_path)
         ).pack(pady=(0, 10))
     
     def _display_certificate_image(self, container, image_path):
@@ -118,16 +129,23 @@ class StudentCertificatesView(ctk.CTkFrame):
             try:
                 # Load and display image
                 if image_path.lower().endswith(('.jpg', '.jpeg', '.png', '.gif', '.bmp')):
-                    img = Image.open(image_path)
-                    img.thumbnail((350, 300))
-                    photo = ctk.CTkImage(light_image=img, dark_image=img, size=(350, 300))
+                    # Placeholder the size of the image until it is decoded
                     img_label = ctk.CTkLabel(
                         container,
-                        image=photo,
-                        text=""
+                        text="⏳ Loading...",
+                        font=ctk.CTkFont(size=12),
+                        text_color="gray",
+                        width=350,
+                        height=300
                     )
-                    img_label.image = photo
                     img_label.pack(pady=10)
+                    self.image_loader.request(
+                        image_path,
+                        (350, 300),
+                        on_loaded=lambda photo: self._show_certificate_image(img_label, photo),
+                        on_error=lambda error: self._show_image_error(img_label),
+                        is_visible=lambda: self._is_on_screen(container)
+                    )
                 else:
                     # For PDF or other files
                     ctk.CTkLabel(
@@ -150,6 +168,28 @@ class StudentCertificatesView(ctk.CTkFrame):
                 text_color="red"
             ).pack(pady=50)
     
+    def _show_certificate_image(self, img_label, photo):
+        """Replace a placeholder with the decoded certificate image"""
+        if img_label.winfo_exists():
+            img_label.configure(image=photo, text="")
+            img_label.image = photo
+    
+    def _show_image_error(self, img_label):
+        """Replace a placeholder with an error message"""
+        if img_label.winfo_exists():
+            img_label.configure(text="❌ Error loading image", text_color="red")
+    
+    def _is_on_screen(self, widget):
+        """Whether a widget in the gallery is scrolled into view"""
+        try:
+            canvas = self.scroll_frame._parent_canvas
+            view_top = canvas.winfo_rooty()
+            view_bottom = view_top + canvas.winfo_height()
+            top = widget.winfo_rooty()
+            return top < view_bottom and top + widget.winfo_height() > view_top
+        except Exception:
+            return True
+    
     def _create_note_section(self, card, note, created_at):
         """Create note display section"""
         note_frame = ctk.CTkFrame(card, fg_color="transparent")
@@ -190,13 +230,18 @@ class StudentCertificatesView(ctk.CTkFrame):
                 text_color="gray"
             ).pack(anchor="w", pady=5)
     
-    def _delete_certificate(self, cert_id):
-        """Delete a certificate after confirmation"""
+    def _delete_certificate(self, cert_id, image_path):
+        """Delete a certificate and its file after confirmation"""
         def delete_confirmed():
             """Execute deletion after confirmation"""
             success, message = self.db.delete_certificate(cert_id)
             if success:
+                # Release the file's thumbnails and stored content
+                if image_path:
+                    delete_student_file(image_path)
+                
                 # Refresh the certificates view
+                self.image_loader.cancel()
                 for widget in self.winfo_children():
                     widget.destroy()
                 self._create_content()
@@ -1,7 +1,7 @@
 """Student detail view - shows complete information about a student"""
 import customtkinter as ctk
-from PIL import Image
 import os
+from image_cache import ImageCache
 
 
 class StudentDetailView(ctk.CTkFrame):
@@ -53,9 +53,7 @@ class StudentDetailView(ctk.CTkFrame):
         # Display image if available
         if self.student[8] and os.path.exists(self.student[8]):
             try:
-                img = Image.open(self.student[8])
-                img.thumbnail((150, 150))
-                photo = ctk.CTkImage(light_image=img, dark_image=img, size=(150, 150))
+                photo = ImageCache.shared().get_image(self.student[8], (150, 150))
                 img_label = ctk.CTkLabel(centered_container, image=photo, text="")
                 img_label.image = photo
                 img_label.pack(pady=10)
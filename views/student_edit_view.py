@@ -2,9 +2,9 @@
 import customtkinter as ctk
 from datetime import datetime
 from tkinter import filedialog
-from PIL import Image
 import shutil
 import os
+from image_cache import ImageCache
 from student_folder_utils import save_student_profile_image, ensure_student_folder_exists
 from validators import Validators
 from formatters import Formatters
@@ -245,9 +245,7 @@ class StudentEditView(ctk.CTkFrame):
     def _display_image(self, image_path):
         """Display image in preview"""
         try:
-            img = Image.open(image_path)
-            img.thumbnail((150, 150))
-            photo = ctk.CTkImage(light_image=img, dark_image=img, size=(150, 150))
+            photo = ImageCache.shared().get_image(image_path, (150, 150))
             self.preview_label.configure(image=photo, text="")
             self.preview_label.image = photo
         except:
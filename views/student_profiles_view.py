@@ -3,8 +3,9 @@ Student Profiles View - Refactored to use separate components
 This view orchestrates the student profile components
 """
 import tkinter.messagebox as messagebox
-import os
 from widgets import ConfirmDeleteDialog
+from db_worker import AsyncDatabase, deliver
+from student_folder_utils import delete_student_and_files
 from .components import (
     StudentListComponent,
     StudentNotesEditorWindow
@@ -17,11 +18,15 @@ class StudentProfilesView:
     Separated into focused, single-responsibility components
     """
     
+    # The student list applies change events itself
+    live_updates = True
+    
     def __init__(self, parent, db, on_refresh=None, on_show_view=None):
         self.parent = parent
         self.db = db
         self.on_refresh = on_refresh
         self.on_show_view = on_show_view  # Callback to show different views
+        self.async_db = AsyncDatabase(db)
         
         # Create the main list component
         self.list_component = StudentListComponent(
@@ -45,20 +50,29 @@ class StudentProfilesView:
     
     def _delete_student(self, student):
         """Delete student after confirmation"""
-        def delete_confirmed():
-            """Execute deletion after confirmation"""
-            success, message = self.db.delete_student(student[0])
+        def delete_in_background():
+            """Delete the record, photo and certificate files (runs on the worker thread)"""
+            image_path = student[8] if len(student) > 8 else None
+            return delete_student_and_files(self.db, student[0], image_path)
+        
+        def on_deleted(outcome):
+            """Report the outcome once the deletion has finished"""
+            success, message = outcome
             if success:
-                # Delete image file if exists
-                if len(student) > 8 and student[8] and os.path.exists(student[8]):
-                    try:
-                        os.remove(student[8])
-                    except:
-                        pass
-                self._refresh_list()
+                # The list reloads itself from the change event
+                if self.on_refresh:
+                    self.on_refresh()
             else:
                 messagebox.showerror("Error", f"Failed to delete student: {message}")
         
+        def delete_confirmed():
+            """Execute deletion after confirmation"""
+            future = self.async_db.submit(delete_in_background)
+            deliver(
+                self.parent, future, on_deleted,
+                lambda error: messagebox.showerror("Error", f"Failed to delete student: {error}")
+            )
+        
         # Show custom confirmation dialog
         ConfirmDeleteDialog(
             self.parent,
@@ -82,8 +96,6 @@ class StudentProfilesView:
         if self.on_show_view:
             self.on_show_view("Student Certificates", student)
     
-    def _refresh_list(self):
-        """Refresh the student list"""
+    def refresh(self):
+        """Reload the student list"""
         self.list_component.refresh()
-        if self.on_refresh:
-            self.on_refresh()
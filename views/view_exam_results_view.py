@@ -1,12 +1,17 @@
 """View Exam Results view for Student Management System"""
 import customtkinter as ctk
 import tkinter.messagebox as messagebox
-from widgets import FilterWidget, EditDialog, ConfirmDeleteDialog, create_label_with_tooltip
+from widgets import FilterWidget, EditDialog, ConfirmDeleteDialog, VirtualTable
+from db_worker import AsyncDatabase, AsyncLoader
+from event_bus import UPDATED, DELETED
 
 
 class ViewExamResultsView:
     """View for displaying exam results with filtering options and pagination"""
     
+    # Applies change events itself (see _on_data_changed)
+    live_updates = True
+    
     def __init__(self, parent, db, items_per_page=20):
         self.parent = parent
         self.db = db
@@ -17,18 +22,32 @@ class ViewExamResultsView:
         self.current_page = 1
         self.total_pages = 1
         
+        # Keyset pagination: boundary keys of the page on screen, and the
+        # seek to use for the next render ("after"/"before"/"from", key) or None
+        self.page_first_key = None
+        self.page_last_key = None
+        self.pending_seek = None
+        
+        # Rows on screen: total matching results and index of the first row
+        self.total_results = 0
+        self.start_idx = 0
+        
         # Create main frame
         self.results_frame = ctk.CTkFrame(parent)
         self.results_frame.pack(fill="both", expand=True)
         
+        # Queries run on the background worker so the window never freezes
+        self.loader = AsyncLoader(self.results_frame, AsyncDatabase(db))
+        
         self._create_ui()
+        self._load_results()
+        
+        # Keep the grid up to date with writes made anywhere in the app
+        self.reload_pending = False
+        db.events.subscribe(self._on_data_changed, tables=["exam_results", "students"], widget=self.results_frame)
     
     def _create_ui(self):
-        """Create the results view UI"""
-        # Clear existing widgets
-        for widget in self.results_frame.winfo_children():
-            widget.destroy()
-        
+        """Create the filters, results grid and pagination controls (once)"""
         # Title
         title = ctk.CTkLabel(
             self.results_frame,
@@ -88,17 +107,14 @@ class ViewExamResultsView:
             font=ctk.CTkFont(size=13)
         ).grid(row=1, column=0, padx=5, pady=5, sticky="e")
         
-        # Get unique years from database
-        all_results = self.db.get_all_exam_results()
-        unique_years = ["All"] + sorted(list(set([str(r[4]) for r in all_results])), reverse=True)
-        
+        # Years are filled in once the background query returns
+        current_year = self.filters.get("exam_year") or "All"
         self.exam_year_dropdown = ctk.CTkOptionMenu(
             filter_container,
-            values=unique_years if len(unique_years) > 1 else ["All", "2025"],
+            values=["All"] if current_year == "All" else ["All", current_year],
             width=180
         )
         # Restore year selection
-        current_year = self.filters.get("exam_year") or "All"
         self.exam_year_dropdown.set(current_year)
         self.exam_year_dropdown.grid(row=1, column=1, padx=5, pady=5, sticky="w")
         
@@ -122,250 +138,311 @@ class ViewExamResultsView:
             command=self._clear_filters
         ).pack(side="left", padx=5)
         
-        # Get all filtered results (for pagination calculation)
-        student_name = self.filters.get("student_name")
-        exam_name = self.filters.get("exam_name")
-        exam_year = self.filters.get("exam_year")
+        # Info bar (showing results and pagination info)
+        info_frame = ctk.CTkFrame(self.results_frame, fg_color="transparent")
+        info_frame.pack(fill="x", padx=20, pady=(10, 5))
         
-        all_results = self.db.get_all_exam_results(student_name, exam_name, exam_year)
+        self.info_label = ctk.CTkLabel(
+            info_frame,
+            text="Loading results...",
+            font=ctk.CTkFont(size=12),
+            text_color="gray"
+        )
+        self.info_label.pack(side="left")
         
-        if not all_results:
-            no_results_msg = "No results match your filters." if any(self.filters.values()) else "No exam results found."
-            no_results_label = ctk.CTkLabel(
-                self.results_frame,
-                text=no_results_msg,
-                font=ctk.CTkFont(size=14)
-            )
-            no_results_label.pack(pady=50)
-            return
+        # Items per page selector (shown when there are more than 10 results)
+        self.items_label = ctk.CTkLabel(
+            info_frame,
+            text="Items per page:",
+            font=ctk.CTkFont(size=12)
+        )
+        items_options = ["10", "20", "50", "100", "All"]
+        self.items_dropdown = ctk.CTkOptionMenu(
+            info_frame,
+            values=items_options,
+            width=80,
+            command=self._change_items_per_page
+        )
         
-        # Calculate pagination
-        total_results = len(all_results)
-        self.total_pages = (total_results + self.items_per_page - 1) // self.items_per_page
+        # Results grid: a fixed pool of row widgets, updated in place
+        columns = [
+            # (header, width, max length before truncation)
+            ("ID", 50, 8),
+            ("Student", 200, 30),
+            ("Exam", 120, 15),
+            ("Year", 80, 8),
+            ("Marks", 100, 12),
+            ("Grade", 70, 8),
+        ]
+        actions = [
+            {
+                "text": "Edit",
+                "command": lambda result: self._edit_result(result[0]),
+                "fg_color": "#FF8C00",
+                "hover_color": "#FFA500"
+            },
+            {
+                "text": "Delete",
+                "command": lambda result: self._delete_result(result[0]),
+                "fg_color": "#DC143C",
+                "hover_color": "#B22222"
+            },
+        ]
+        self.table = VirtualTable(
+            self.results_frame,
+            columns,
+            row_values=lambda result: [
+                result[0],  # ID
+                result[2],  # Student name
+                result[3],  # Exam name
+                result[4],  # Exam year
+                result[5],  # Marks obtained
+                result[6].upper()   # Grade
+            ],
+            actions=actions,
+            empty_text="",
+            height=350
+        )
+        self.table.pack(fill="both", expand=True, padx=20, pady=(5, 10))
+        
+        self._create_pagination_controls()
+    
+    def refresh(self):
+        """Reload the current page (called when cached data went stale)"""
+        self._load_results()
+    
+    def _load_results(self):
+        """Load the current page in the background; the grid keeps its widgets"""
+        seek = self.pending_seek
+        self.pending_seek = None
+        self.loader.load(
+            self._query_results, dict(self.filters), self.current_page, self.items_per_page, seek,
+            on_loading=self._show_loading,
+            on_result=self._render_results,
+            on_error=self._show_load_error
+        )
+    
+    def _show_loading(self):
+        """Show the loading state while a page is being fetched"""
+        self.info_label.configure(text="Loading results...", text_color="gray")
+    
+    def _query_results(self, filters, page, items_per_page, seek):
+        """
+        Run every query the results view needs (on the worker thread)
+        
+        Returns:
+            Dict with years, total, page, start_idx and results
+        """
+        years = self.db.get_exam_years()
+        total_results = self.db.count_exam_results(filters)
         
         # Ensure current page is valid
-        if self.current_page > self.total_pages:
-            self.current_page = self.total_pages
-        if self.current_page < 1:
-            self.current_page = 1
+        total_pages = max(1, (total_results + items_per_page - 1) // items_per_page)
+        page = min(max(page, 1), total_pages)
+        start_idx = (page - 1) * items_per_page
+        
+        results = self._fetch_page(filters, items_per_page, start_idx, seek) if total_results else []
+        return {
+            "years": years,
+            "total": total_results,
+            "page": page,
+            "start_idx": start_idx,
+            "results": results,
+        }
+    
+    def _show_load_error(self, error):
+        """Replace the loading state with an error message"""
+        self.info_label.configure(text=f"Failed to load exam results: {error}", text_color="red")
+    
+    def _render_results(self, data):
+        """Show a page of results returned by _query_results"""
+        # Get unique years from database
+        unique_years = ["All"] + [str(year) for year in data["years"]]
+        self.exam_year_dropdown.configure(values=unique_years if len(unique_years) > 1 else ["All", "2025"])
         
-        # Get results for current page
-        start_idx = (self.current_page - 1) * self.items_per_page
-        end_idx = start_idx + self.items_per_page
-        results = all_results[start_idx:end_idx]
+        self.total_results = data["total"]
         
-        # Info bar (showing results and pagination info)
-        info_frame = ctk.CTkFrame(self.results_frame, fg_color="transparent")
-        info_frame.pack(fill="x", padx=20, pady=(10, 5))
+        # Calculate pagination
+        self.total_pages = max(1, (self.total_results + self.items_per_page - 1) // self.items_per_page)
+        self.current_page = data["page"]
+        self.start_idx = data["start_idx"]
+        
+        if self.total_results > 10:
+            if not self.items_label.winfo_manager():
+                self.items_label.pack(side="right", padx=(20, 5))
+                self.items_dropdown.pack(side="right")
+            self.items_dropdown.set(str(self.items_per_page) if self.items_per_page < 1000 else "All")
+        else:
+            self.items_label.pack_forget()
+            self.items_dropdown.pack_forget()
+        
+        no_results_msg = "No results match your filters." if any(self.filters.values()) else "No exam results found."
+        self.table.set_empty_text(no_results_msg)
+        self.table.set_rows(data["results"])
+        self._update_page_keys()
+        self._update_info()
+        self._update_pagination_controls()
+    
+    def _update_info(self):
+        """Update the "Showing x-y of z" text for the rows in the grid"""
+        if not self.total_results:
+            self.info_label.configure(text="", text_color="gray")
+            return
         
-        info_text = f"Showing {start_idx + 1}-{min(end_idx, total_results)} of {total_results} results"
+        end_idx = self.start_idx + len(self.table.rows)
+        info_text = f"Showing {self.start_idx + 1}-{end_idx} of {self.total_results} results"
         if self.total_pages > 1:
             info_text += f" | Page {self.current_page} of {self.total_pages}"
-        
-        ctk.CTkLabel(
-            info_frame,
-            text=info_text,
-            font=ctk.CTkFont(size=12),
-            text_color="gray"
-        ).pack(side="left")
-        
-        # Items per page selector
-        if total_results > 10:
-            ctk.CTkLabel(
-                info_frame,
-                text="Items per page:",
-                font=ctk.CTkFont(size=12)
-            ).pack(side="right", padx=(20, 5))
-            
-            items_options = ["10", "20", "50", "100", "All"]
-            items_dropdown = ctk.CTkOptionMenu(
-                info_frame,
-                values=items_options,
-                width=80,
-                command=self._change_items_per_page
-            )
-            items_dropdown.set(str(self.items_per_page) if self.items_per_page < 1000 else "All")
-            items_dropdown.pack(side="right")
-        
-        # Results display area
-        scroll_frame = ctk.CTkScrollableFrame(self.results_frame, height=350, fg_color="transparent")
-        scroll_frame.pack(fill="both", expand=True, padx=20, pady=(5, 10))
-        
-        # Header
-        header_frame = ctk.CTkFrame(scroll_frame, fg_color="transparent")
-        header_frame.pack(fill="x", padx=10, pady=5)
-        
-        headers = ["ID", "Student", "Exam", "Year", "Marks", "Grade"]
-        widths = [50, 200, 120, 80, 100, 70, 150]  # Last width for action buttons
-        
-        for i, (header, width) in enumerate(zip(headers, widths)):
-            ctk.CTkLabel(
-                header_frame,
-                text=header,
-                font=ctk.CTkFont(size=12, weight="bold"),
-                width=width,
-                anchor="w"
-            ).grid(row=0, column=i, padx=5, pady=5)
-        
-        # Result rows (only current page)
-        for result in results:
-            self._create_result_row(scroll_frame, result, widths)
-        
-        # Pagination controls (only show if more than one page)
-        if self.total_pages > 1:
-            self._create_pagination_controls()
-    
-    def _create_result_row(self, parent, result, widths):
-        """Create a single result row with truncated text and tooltips"""
-        result_frame = ctk.CTkFrame(parent, fg_color="#363535")
-        result_frame.pack(fill="x", padx=10, pady=2)
-        
-        values = [
-            result[0],  # ID
-            result[2],  # Student name
-            result[3],  # Exam name
-            result[4],  # Exam year
-            result[5],  # Marks obtained
-            result[6].upper()   # Grade
-        ]
-        
-        # Max lengths for truncation: ID (8), Student (30), Exam (15), Year (8), Marks (12), Grade (8)
-        max_lengths = [8, 30, 15, 8, 12, 8]
-        
-        for i, (value, width, max_len) in enumerate(zip(values, widths[:-1], max_lengths)):
-            label = create_label_with_tooltip(
-                result_frame,
-                str(value),
-                max_length=max_len,
-                font=ctk.CTkFont(size=11),
-                width=width,
-                anchor="w",
+        self.info_label.configure(text=info_text, text_color="gray")
+    
+    def _update_page_keys(self):
+        """Remember the keys of the first and last rows for keyset paging"""
+        results = self.table.rows
+        if results:
+            self.page_first_key = self.db.exam_result_page_key(results[0])
+            self.page_last_key = self.db.exam_result_page_key(results[-1])
+    
+    def _fetch_page(self, filters, items_per_page, start_idx, seek):
+        """Fetch a page, seeking from the previous page's keys when possible"""
+        results = []
+        
+        if seek:
+            direction, key = seek
+            if direction == "from":
+                # Start at the key itself: just after the ID before it
+                direction, key = "after", (key[0], key[1], key[2] - 1)
+            results = self.db.get_exam_results_page(
+                filters, items_per_page,
+                after_key=key if direction == "after" else None,
+                before_key=key if direction == "before" else None
             )
-            label.grid(row=0, column=i, padx=5, pady=5)
         
-        # Action buttons frame
-        action_frame = ctk.CTkFrame(result_frame, fg_color="transparent")
-        action_frame.grid(row=0, column=len(values), padx=5, pady=5)
+        if not results:
+            # First/last/jump (or a seek that ran off the end after a delete)
+            results = self.db.get_exam_results_page(filters, items_per_page, offset=start_idx)
         
-        # Edit button
-        ctk.CTkButton(
-            action_frame,
-            text="Edit",
-            width=60,
-            fg_color="#FF8C00",
-            hover_color="#FFA500",
-            command=lambda: self._edit_result(result[0])
-        ).pack(side="left", padx=2)
-        
-        # Delete button
-        ctk.CTkButton(
-            action_frame,
-            text="Delete",
-            width=60,
-            fg_color="#DC143C",
-            hover_color="#B22222",
-            command=lambda: self._delete_result(result[0])
-        ).pack(side="left", padx=2)
+        return results
     
     def _create_pagination_controls(self):
-        """Create pagination navigation controls"""
-        pagination_frame = ctk.CTkFrame(self.results_frame)
-        pagination_frame.pack(fill="x", padx=20, pady=10)
+        """Create pagination navigation controls (shown when there is more than one page)"""
+        self.pagination_frame = ctk.CTkFrame(self.results_frame)
         
         # Center the controls
-        controls_container = ctk.CTkFrame(pagination_frame, fg_color="transparent")
+        controls_container = ctk.CTkFrame(self.pagination_frame, fg_color="transparent")
         controls_container.pack(expand=True)
         
         # First page button
-        first_btn = ctk.CTkButton(
+        self.first_btn = ctk.CTkButton(
             controls_container,
             text="⏮ First",
             width=80,
-            command=self._go_to_first_page,
-            state="normal" if self.current_page > 1 else "disabled"
+            command=self._go_to_first_page
         )
-        first_btn.pack(side="left", padx=2)
+        self.first_btn.pack(side="left", padx=2)
         
         # Previous page button
-        prev_btn = ctk.CTkButton(
+        self.prev_btn = ctk.CTkButton(
             controls_container,
             text="◀ Previous",
             width=90,
-            command=self._go_to_previous_page,
-            state="normal" if self.current_page > 1 else "disabled"
+            command=self._go_to_previous_page
         )
-        prev_btn.pack(side="left", padx=2)
+        self.prev_btn.pack(side="left", padx=2)
         
         # Page indicator
-        page_label = ctk.CTkLabel(
+        self.page_label = ctk.CTkLabel(
             controls_container,
-            text=f"Page {self.current_page} of {self.total_pages}",
+            text="",
             font=ctk.CTkFont(size=13, weight="bold"),
             width=120
         )
-        page_label.pack(side="left", padx=10)
+        self.page_label.pack(side="left", padx=10)
         
         # Next page button
-        next_btn = ctk.CTkButton(
+        self.next_btn = ctk.CTkButton(
             controls_container,
             text="Next ▶",
             width=90,
-            command=self._go_to_next_page,
-            state="normal" if self.current_page < self.total_pages else "disabled"
+            command=self._go_to_next_page
         )
-        next_btn.pack(side="left", padx=2)
+        self.next_btn.pack(side="left", padx=2)
         
         # Last page button
-        last_btn = ctk.CTkButton(
+        self.last_btn = ctk.CTkButton(
             controls_container,
             text="Last ⏭",
             width=80,
-            command=self._go_to_last_page,
-            state="normal" if self.current_page < self.total_pages else "disabled"
+            command=self._go_to_last_page
         )
-        last_btn.pack(side="left", padx=2)
+        self.last_btn.pack(side="left", padx=2)
+        
+        # Quick jump to page (shown when there are more than 5 pages)
+        self.jump_frame = ctk.CTkFrame(controls_container, fg_color="transparent")
+        
+        ctk.CTkLabel(
+            self.jump_frame,
+            text="Go to:",
+            font=ctk.CTkFont(size=12)
+        ).pack(side="left", padx=(15, 5))
+        
+        page_entry = ctk.CTkEntry(self.jump_frame, width=50)
+        page_entry.pack(side="left", padx=2)
+        page_entry.bind("<Return>", lambda e: self._jump_to_page(page_entry.get()))
+        
+        jump_btn = ctk.CTkButton(
+            self.jump_frame,
+            text="Go",
+            width=50,
+            command=lambda: self._jump_to_page(page_entry.get())
+        )
+        jump_btn.pack(side="left", padx=2)
+    
+    def _update_pagination_controls(self):
+        """Show, hide and enable the pagination controls for the current page"""
+        if self.total_pages <= 1:
+            self.pagination_frame.pack_forget()
+            return
+        
+        if not self.pagination_frame.winfo_manager():
+            self.pagination_frame.pack(fill="x", padx=20, pady=10)
+        
+        back_state = "normal" if self.current_page > 1 else "disabled"
+        forward_state = "normal" if self.current_page < self.total_pages else "disabled"
+        self.first_btn.configure(state=back_state)
+        self.prev_btn.configure(state=back_state)
+        self.next_btn.configure(state=forward_state)
+        self.last_btn.configure(state=forward_state)
+        self.page_label.configure(text=f"Page {self.current_page} of {self.total_pages}")
         
-        # Quick jump to page
         if self.total_pages > 5:
-            ctk.CTkLabel(
-                controls_container,
-                text="Go to:",
-                font=ctk.CTkFont(size=12)
-            ).pack(side="left", padx=(15, 5))
-            
-            page_entry = ctk.CTkEntry(controls_container, width=50)
-            page_entry.pack(side="left", padx=2)
-            page_entry.bind("<Return>", lambda e: self._jump_to_page(page_entry.get()))
-            
-            jump_btn = ctk.CTkButton(
-                controls_container,
-                text="Go",
-                width=50,
-                command=lambda: self._jump_to_page(page_entry.get())
-            )
-            jump_btn.pack(side="left", padx=2)
+            if not self.jump_frame.winfo_manager():
+                self.jump_frame.pack(side="left")
+        else:
+            self.jump_frame.pack_forget()
     
     def _go_to_first_page(self):
         """Navigate to first page"""
         self.current_page = 1
-        self._create_ui()
+        self._load_results()
     
     def _go_to_previous_page(self):
         """Navigate to previous page"""
         if self.current_page > 1:
             self.current_page -= 1
-            self._create_ui()
+            self.pending_seek = ("before", self.page_first_key)
+            self._load_results()
     
     def _go_to_next_page(self):
         """Navigate to next page"""
         if self.current_page < self.total_pages:
             self.current_page += 1
-            self._create_ui()
+            self.pending_seek = ("after", self.page_last_key)
+            self._load_results()
     
     def _go_to_last_page(self):
         """Navigate to last page"""
         self.current_page = self.total_pages
-        self._create_ui()
+        self._load_results()
     
     def _jump_to_page(self, page_str):
         """Jump to specific page number"""
@@ -373,7 +450,7 @@ class ViewExamResultsView:
             page = int(page_str)
             if 1 <= page <= self.total_pages:
                 self.current_page = page
-                self._create_ui()
+                self._load_results()
         except ValueError:
             pass  # Invalid input, ignore
     
@@ -385,7 +462,7 @@ class ViewExamResultsView:
             self.items_per_page = int(value)
         
         self.current_page = 1  # Reset to first page
-        self._create_ui()
+        self._load_results()
     
     def _apply_filters_from_controls(self):
         """Apply filters from the control values and reset to first page"""
@@ -401,7 +478,7 @@ class ViewExamResultsView:
             "exam_year": exam_year
         }
         self.current_page = 1  # Reset to first page when filters change
-        self._create_ui()
+        self._load_results()
     
     def _apply_filters(self, filter_values):
         """Apply filters and refresh results"""
@@ -418,13 +495,18 @@ class ViewExamResultsView:
                 return
         
         self.filters = filter_values
-        self._create_ui()
+        self._load_results()
     
     def _clear_filters(self):
         """Clear all filters and show all results, reset to first page"""
         self.filters = {}
         self.current_page = 1  # Reset to first page when clearing filters
-        self._create_ui()
+        
+        # The filter controls are kept across loads, so reset them too
+        self.student_name_entry.delete(0, "end")
+        self.exam_name_dropdown.set("All")
+        self.exam_year_dropdown.set("All")
+        self._load_results()
     
     def _edit_result(self, result_id):
         """Edit exam result"""
@@ -540,8 +622,7 @@ class ViewExamResultsView:
             success, message = self.db.update_exam_result(result_id, result_data)
             
             if success:
-                dialog.destroy()
-                self._create_ui()  # Refresh the table
+                dialog.destroy()  # The change event patches the row
             else:
                 messagebox.showerror("Error", f"Failed to update result: {message}")
         
@@ -558,9 +639,7 @@ class ViewExamResultsView:
         def delete_confirmed():
             """Execute deletion after confirmation"""
             success, message = self.db.delete_exam_result(result_id)
-            if success:
-                self._create_ui()  # Refresh the table
-            else:
+            if not success:
                 messagebox.showerror("Error", f"Failed to delete result: {message}")
         
         # Show custom confirmation dialog
@@ -572,6 +651,95 @@ class ViewExamResultsView:
             on_confirm=delete_confirmed
         )
     
+    def _on_data_changed(self, event):
+        """
+        Apply a change event to the grid
+        
+        Edits and deletes of known results patch just their rows; anything
+        else (new results, student changes) reloads the page once.
+        """
+        if event.table == "exam_results" and event.ids and event.action == UPDATED:
+            for result_id in event.ids:
+                self._patch_result(result_id)
+        elif event.table == "exam_results" and event.ids and event.action == DELETED:
+            for result_id in event.ids:
+                self._remove_result(result_id)
+        else:
+            self._schedule_reload()
+    
+    def _schedule_reload(self):
+        """Reload the page once, however many changes arrive together"""
+        if not self.reload_pending:
+            self.reload_pending = True
+            # Reload the rows from where the page on screen starts, so rows
+            # moving elsewhere in the sort order do not shift the page
+            if self.page_first_key is not None and self.table.rows:
+                self.pending_seek = ("from", self.page_first_key)
+            self.results_frame.after(100, self._reload_now)
+    
+    def _reload_now(self):
+        """Run a scheduled reload"""
+        self.reload_pending = False
+        self._load_results()
+    
+    def _matches_filters(self, result):
+        """Check whether a result row still matches the current filters"""
+        student_name = self.filters.get("student_name")
+        exam_name = self.filters.get("exam_name")
+        exam_year = self.filters.get("exam_year")
+        
+        if student_name and student_name.lower() not in result[2].lower():
+            return False
+        if exam_name and exam_name.lower() not in result[3].lower():
+            return False
+        if exam_year and str(result[4]) != str(exam_year):
+            return False
+        return True
+    
+    def _patch_result(self, result_id):
+        """
+        Update one row of the grid after an edit
+        
+        The row is re-read and its cells updated in place. A row that no
+        longer matches the filters is removed instead. If the edit changed
+        the row's sort key (year or student name) it belongs somewhere else,
+        so the page is reloaded from its stored keys instead.
+        """
+        index = self.table.find_row(lambda row: row[0] == result_id)
+        if index is None:
+            return
+        
+        result = self.db.get_exam_result_by_id(result_id)
+        if result is None or not self._matches_filters(result):
+            self._remove_result(result_id)
+            return
+        
+        if self.db.exam_result_page_key(result) != self.db.exam_result_page_key(self.table.rows[index]):
+            self._schedule_reload()
+            return
+        
+        self.table.update_row(index, result)
+        self._update_page_keys()
+    
+    def _remove_result(self, result_id):
+        """Remove one row from the grid after a delete"""
+        index = self.table.find_row(lambda row: row[0] == result_id)
+        if index is None:
+            return
+        
+        self.table.remove_row(index)
+        self.total_results -= 1
+        
+        if not self.table.rows:
+            # The page is now empty: load the previous one (or the empty state)
+            self._load_results()
+            return
+        
+        self.total_pages = max(1, (self.total_results + self.items_per_page - 1) // self.items_per_page)
+        self._update_page_keys()
+        self._update_info()
+        self._update_pagination_controls()
+    
     def _view_student(self, student_id):
         """View student details from exam results"""
         student = self.db.get_student_by_id(student_id)
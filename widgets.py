@@ -1,9 +1,14 @@
 """Reusable UI widgets for the Student Management System"""
 import customtkinter as ctk
 from typing import Callable, Optional
-from PIL import Image, ImageTk
 import tkinter as tk
+from tkinter import filedialog
 import os
+from image_cache import ImageCache
+from db_worker import deliver
+
+
+IMPORT_PROGRESS_MS = 250  # How often a running CSV import updates its progress text
 
 
 class SearchWidget(ctk.CTkFrame):
@@ -12,11 +17,14 @@ class SearchWidget(ctk.CTkFrame):
     def __init__(self, parent, placeholder: str = "Search...", 
                  on_search: Optional[Callable] = None,
                  on_clear: Optional[Callable] = None,
+                 on_change: Optional[Callable] = None,
                  **kwargs):
         super().__init__(parent, fg_color="transparent", **kwargs)
         
         self.on_search = on_search
         self.on_clear = on_clear
+        self.on_change = on_change  # Called with the term whenever the text changes
+        self._last_term = ""
         
         # Label
         ctk.CTkLabel(
@@ -33,6 +41,7 @@ class SearchWidget(ctk.CTkFrame):
         )
         self.search_entry.pack(side="left", padx=5)
         self.search_entry.bind('<Return>', lambda e: self._handle_search())
+        self.search_entry.bind('<KeyRelease>', lambda e: self._handle_change())
         
         # Search button
         self.search_btn = ctk.CTkButton(
@@ -62,9 +71,18 @@ class SearchWidget(ctk.CTkFrame):
     def _handle_clear(self):
         """Handle clear button click"""
         self.search_entry.delete(0, 'end')
+        self._last_term = ""
         if self.on_clear:
             self.on_clear()
     
+    def _handle_change(self):
+        """Handle a key release; only edits that change the term are reported"""
+        term = self.get_search_term()
+        if term != self._last_term:
+            self._last_term = term
+            if self.on_change:
+                self.on_change(term)
+    
     def get_search_term(self) -> str:
         """Get the current search term"""
         return self.search_entry.get().strip()
@@ -73,6 +91,7 @@ class SearchWidget(ctk.CTkFrame):
         """Set the search term"""
         self.search_entry.delete(0, 'end')
         self.search_entry.insert(0, term)
+        self._last_term = term.strip()
 
 
 class FilterWidget(ctk.CTkFrame):
@@ -439,25 +458,8 @@ class WatermarkWidget(ctk.CTkLabel):
                 self.configure(text="Logo not found", text_color="gray")
                 return
             
-            # Load image with PIL
-            img = Image.open(resolved_path)
-            
-            # Resize if size is specified
-            if self.size:
-                img = img.resize(self.size, Image.Resampling.LANCZOS)
-            
-            # Convert to RGBA if not already
-            if img.mode != 'RGBA':
-                img = img.convert('RGBA')
-            
-            # Adjust opacity
-            alpha = img.split()[3]
-            alpha = alpha.point(lambda p: int(p * self.opacity))
-            img.putalpha(alpha)
-            
-            # Convert to CTkImage for customtkinter
-            self.photo = ctk.CTkImage(light_image=img, dark_image=img, 
-                                     size=self.size if self.size else img.size)
+            # Faded logo, rendered once per (path, size, opacity) for the process
+            self.photo = ImageCache.shared().get_watermark(resolved_path, self.size, self.opacity)
             self.configure(image=self.photo)
             
         except Exception as e:
@@ -515,6 +517,15 @@ class ToolTip:
             self.tooltip_window.destroy()
             self.tooltip_window = None
 
+    def set_text(self, text: str):
+        """
+        Change the tooltip text (an empty text disables the tooltip)
+        
+        Used when a widget is reused for different data.
+        """
+        self.hide_tooltip()
+        self.text = text
+
 
 def truncate_text(text: str, max_length: int = 25) -> str:
     """
@@ -560,3 +571,315 @@ def create_label_with_tooltip(parent, text: str, max_length: int = 25, **label_k
         ToolTip(label, full_text)
     
     return label
+
+
+class VirtualTable(ctk.CTkFrame):
+    """
+    Table that only creates widgets for the rows that are visible
+    
+    Rows are plain data (e.g. database tuples). The table keeps a pool of
+    row widgets just large enough to fill its height and rebinds them to
+    different rows as the user scrolls, so showing 100,000 rows costs the
+    same number of widgets as showing 10.
+    """
+    
+    ROW_HEIGHT = 38
+    ROW_PADDING = 2
+    
+    def __init__(self, parent, columns, row_values: Callable, actions=None,
+                 empty_text: str = "No rows to display.", height: int = 400, **kwargs):
+        """
+        Args:
+            parent: Parent widget
+            columns: List of (header, width, max_length) tuples
+            row_values: Callable(row) returning the column values of a row
+            actions: Optional list of button options dicts; each needs "text"
+                and "command" (called with the row), other keys go to CTkButton
+            empty_text: Message shown when there are no rows
+            height: Initial height of the row area
+        """
+        super().__init__(parent, fg_color="transparent", **kwargs)
+        
+        self.columns = columns
+        self.row_values = row_values
+        self.actions = actions or []
+        self.rows = []
+        self.top_index = 0
+        self._slots = []
+        self._visible_rows = 1
+        
+        # Header
+        header_frame = ctk.CTkFrame(self)
+        header_frame.pack(fill="x", padx=(10, 26), pady=5)
+        for i, (header, width, _) in enumerate(columns):
+            ctk.CTkLabel(
+                header_frame,
+                text=header,
+                font=ctk.CTkFont(size=12, weight="bold"),
+                width=width,
+                anchor="w"
+            ).grid(row=0, column=i, padx=5, pady=5, sticky="w")
+        
+        # Row area and scrollbar
+        container = ctk.CTkFrame(self, fg_color="transparent")
+        container.pack(fill="both", expand=True)
+        
+        self.scrollbar = ctk.CTkScrollbar(container, command=self._on_scrollbar)
+        self.scrollbar.pack(side="right", fill="y")
+        
+        self.body = ctk.CTkFrame(container, fg_color="transparent", height=height)
+        self.body.pack(side="left", fill="both", expand=True, padx=10)
+        self.body.pack_propagate(False)
+        self.body.bind("<Configure>", lambda e: self._fit_to_height(e.height))
+        self._bind_wheel(self.body)
+        
+        self.empty_label = ctk.CTkLabel(self.body, text=empty_text, font=ctk.CTkFont(size=14))
+        
+        self._fit_to_height(height)
+    
+    @property
+    def row_pitch(self):
+        """Vertical space taken by one row"""
+        return self.ROW_HEIGHT + 2 * self.ROW_PADDING
+    
+    @property
+    def visible_count(self):
+        """Number of rows that fit in the row area"""
+        return self._visible_rows
+    
+    def set_rows(self, rows, keep_position: bool = False):
+        """
+        Show a new list of rows
+        
+        Args:
+            rows: Row data
+            keep_position: Keep the scroll position instead of going back to the top
+        """
+        self.rows = rows
+        if not keep_position:
+            self.top_index = 0
+        self._render()
+    
+    def set_empty_text(self, text: str):
+        """Change the message shown when there are no rows"""
+        self.empty_label.configure(text=text)
+    
+    def update_row(self, index: int, row):
+        """Replace one row; only its widgets are updated"""
+        self.rows[index] = row
+        slot_index = index - self.top_index
+        if 0 <= slot_index < self._visible_rows:
+            self._bind_slot(self._slots[slot_index], row)
+    
+    def remove_row(self, index: int):
+        """Remove one row and shift the rows below it up"""
+        del self.rows[index]
+        self._render()
+    
+    def find_row(self, predicate: Callable) -> Optional[int]:
+        """Index of the first row matching predicate(row), or None"""
+        for index, row in enumerate(self.rows):
+            if predicate(row):
+                return index
+        return None
+    
+    def scroll_to(self, index: int):
+        """Scroll so that the row at index is the first visible row"""
+        self.top_index = index
+        self._render()
+    
+    def _fit_to_height(self, height):
+        """Size the widget pool to the row area (surplus rows are hidden, not destroyed)"""
+        needed = max(1, height // self.row_pitch)
+        if needed == self._visible_rows and len(self._slots) >= needed:
+            return
+        
+        self._visible_rows = needed
+        while len(self._slots) < needed:
+            self._slots.append(self._create_slot())
+        self._render()
+    
+    def _create_slot(self):
+        """Create the widgets of one row"""
+        frame = ctk.CTkFrame(self.body, fg_color="#363535", height=self.ROW_HEIGHT)
+        frame.grid_propagate(False)
+        frame.row = None
+        frame.cells = []
+        frame.tooltips = []
+        
+        for i, (_, width, _) in enumerate(self.columns):
+            label = ctk.CTkLabel(frame, text="", font=ctk.CTkFont(size=11), width=width, anchor="w")
+            label.grid(row=0, column=i, padx=5, pady=5, sticky="w")
+            frame.cells.append(label)
+            frame.tooltips.append(ToolTip(label, ""))
+            self._bind_wheel(label)
+        
+        for i, options in enumerate(self.actions):
+            options = dict(options)
+            command = options.pop("command")
+            options.setdefault("width", 60)
+            button = ctk.CTkButton(
+                frame,
+                command=lambda frame=frame, command=command: self._run_action(frame, command),
+                **options
+            )
+            button.grid(row=0, column=len(self.columns) + i, padx=5)
+            self._bind_wheel(button)
+        
+        self._bind_wheel(frame)
+        return frame
+    
+    def _run_action(self, slot, command):
+        """Call an action button's command with the row currently in its slot"""
+        if slot.row is not None:
+            command(slot.row)
+    
+    def _bind_slot(self, slot, row):
+        """Show a row's data in a slot's widgets"""
+        slot.row = row
+        for label, tooltip, value, (_, _, max_length) in zip(
+            slot.cells, slot.tooltips, self.row_values(row), self.columns
+        ):
+            full_text = str(value) if value is not None else ""
+            display_text = truncate_text(full_text, max_length)
+            if label.cget("text") != display_text:
+                label.configure(text=display_text)
+            tooltip.set_text(full_text if len(full_text) > max_length else "")
+    
+    def _render(self):
+        """Bind the visible rows to the widget pool"""
+        count = self._visible_rows
+        max_top = max(0, len(self.rows) - count)
+        self.top_index = max(0, min(self.top_index, max_top))
+        
+        if self.rows:
+            self.empty_label.place_forget()
+        else:
+            self.empty_label.place(relx=0.5, y=50, anchor="n")
+        
+        for i, slot in enumerate(self._slots):
+            index = self.top_index + i
+            if i < count and index < len(self.rows):
+                self._bind_slot(slot, self.rows[index])
+                slot.place(x=0, y=i * self.row_pitch + self.ROW_PADDING, relwidth=1.0)
+            else:
+                slot.row = None
+                slot.place_forget()
+        
+        if self.rows:
+            first = self.top_index / len(self.rows)
+            last = min(1.0, (self.top_index + count) / len(self.rows))
+            self.scrollbar.set(first, last)
+        else:
+            self.scrollbar.set(0.0, 1.0)
+    
+    def _scroll_by(self, delta):
+        """Scroll by a number of rows"""
+        if len(self.rows) > self.visible_count:
+            self.top_index += delta
+            self._render()
+    
+    def _on_scrollbar(self, action, value, unit=None):
+        """Handle scrollbar drags and clicks"""
+        if action == "moveto":
+            self.top_index = int(float(value) * len(self.rows))
+            self._render()
+        elif action == "scroll":
+            step = self.visible_count if unit == "pages" else 1
+            self._scroll_by(int(float(value)) * step)
+    
+    def _on_mousewheel(self, event):
+        """Scroll three rows per wheel step"""
+        if getattr(event, "num", None) == 4 or event.delta > 0:
+            self._scroll_by(-3)
+        else:
+            self._scroll_by(3)
+        return "break"
+    
+    def _bind_wheel(self, widget):
+        """Scroll the table when the mouse wheel turns over a widget"""
+        widget.bind("<MouseWheel>", self._on_mousewheel)
+        widget.bind("<Button-4>", self._on_mousewheel)
+        widget.bind("<Button-5>", self._on_mousewheel)
+
+
+def run_csv_import(message_label, button, async_db, import_func, csv_path, *args, **kwargs):
+    """
+    Run a bulk_import CSV import on the database worker
+    
+    The label shows the number of rows processed while the import runs,
+    then its report (see show_import_report). The button is disabled
+    until the import has finished.
+    
+    Args:
+        message_label: CTkLabel for progress and the outcome
+        button: Button that started the import
+        async_db: AsyncDatabase of the view
+        import_func: bulk_import function, called as
+            import_func(db, csv_path, *args, progress_callback=..., **kwargs)
+        csv_path: CSV file to import
+    
+    Returns:
+        Future for the import report
+    """
+    # The import only records its progress on the worker thread; the label
+    # is updated from the Tk thread
+    progress = {"rows": 0}
+    
+    def record_progress(rows):
+        progress["rows"] = rows
+    
+    future = async_db.submit(import_func, async_db.db, csv_path, *args,
+                             progress_callback=record_progress, **kwargs)
+    button.configure(state="disabled")
+    
+    def show_progress():
+        if future.done() or not message_label.winfo_exists():
+            return
+        message_label.configure(text=f"Importing... {progress['rows']} row(s) processed", text_color="gray")
+        message_label.after(IMPORT_PROGRESS_MS, show_progress)
+    
+    def on_error(error):
+        button.configure(state="normal")
+        if isinstance(error, (OSError, UnicodeDecodeError)):
+            message_label.configure(text=f"Error reading file: {error}", text_color="red")
+        else:
+            message_label.configure(text=f"Import failed: {error}", text_color="red")
+    
+    def on_imported(report):
+        button.configure(state="normal")
+        show_import_report(message_label, report, csv_path)
+    
+    show_progress()
+    deliver(message_label, future, on_imported, on_error)
+    return future
+
+
+def show_import_report(message_label, report, csv_path: str):
+    """
+    Show the outcome of a CSV import and offer to save its errors
+    
+    Args:
+        message_label: CTkLabel for the summary and the first few errors
+        report: bulk_import ImportReport
+        csv_path: Imported file; the error report is named after it
+    """
+    if not report.errors:
+        message_label.configure(text=report.summary(), text_color="green")
+        return
+    
+    # Show the first few problems and offer to save the full report
+    lines = [report.summary()]
+    lines += [f"Line {line}: {message}" for line, message in report.errors[:5]]
+    if report.rejected > 5:
+        lines.append(f"... and {report.rejected - 5} more")
+    message_label.configure(text="\n".join(lines), text_color="orange")
+    
+    errors_path = filedialog.asksaveasfilename(
+        title="Save Error Report",
+        defaultextension=".csv",
+        initialfile=os.path.splitext(os.path.basename(csv_path))[0] + "_errors.csv",
+        filetypes=[("CSV files", "*.csv")]
+    )
+    if errors_path:
+        report.write_errors_csv(errors_path)